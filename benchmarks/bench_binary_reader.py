@@ -0,0 +1,74 @@
+"""
+Microbenchmark: 'LD_BinaryReader' (stream) against 'LD_MappedBinaryReader' (mapped buffer + integer cursor).
+
+The access pattern copies what 'read_ism2' does: jump to an offset, read a few values, jump again.
+Followed by a long run of vertex-like reads (3 floats, 3 half floats, ...) without any jumps.
+
+Run from the repository root:
+    python benchmarks/bench_binary_reader.py
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nep_tools.utils import binary_file
+
+FILE_SIZE = 8 * 1024 * 1024
+JUMPS = 200000
+VERTICES = 200000
+
+
+def run_jumps(R, offsets):
+    for offset in offsets:
+        R.goto(offset)
+        R.read_long_unsigned()
+        R.seek(4)
+        R.read_long_unsigned()
+        R.read_short_unsigned()
+
+
+def run_vertices(R):
+    R.goto(0)
+    for _ in range(VERTICES):
+        R.read_float(), R.read_float(), R.read_float()
+        R.read_half_float(), R.read_half_float(), R.read_half_float()
+        R.read_half_float()
+        R.seek(6)
+        R.read_half_float()
+        R.read_byte_as_float(), R.read_byte_as_float(), R.read_byte_as_float(), R.read_byte_as_float()
+
+
+def bench(reader_class, path, offsets):
+    f = open(path, 'rb')
+    R = reader_class(f, False)
+    time_start = time.perf_counter()
+    run_jumps(R, offsets)
+    time_jumps = time.perf_counter() - time_start
+    time_start = time.perf_counter()
+    run_vertices(R)
+    time_vertices = time.perf_counter() - time_start
+    R.close()
+    return time_jumps, time_vertices
+
+
+def main():
+    r = random.Random(0)
+    fd, path = tempfile.mkstemp(suffix=".bin")
+    with os.fdopen(fd, 'wb') as f:
+        f.write(os.urandom(FILE_SIZE))
+    offsets = [r.randrange(0, FILE_SIZE - 16) for _ in range(JUMPS)]
+    try:
+        for reader_class in (binary_file.LD_BinaryReader, binary_file.LD_MappedBinaryReader):
+            time_jumps, time_vertices = bench(reader_class, path, offsets)
+            print("%s  %i jumps: %.3fs   %i vertices: %.3fs" % (reader_class.__name__.ljust(22), JUMPS, time_jumps, VERTICES, time_vertices))
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
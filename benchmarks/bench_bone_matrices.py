@@ -0,0 +1,82 @@
+"""
+Benchmark: world matrices of an armature.
+
+'scalar'  What the parser did before. Up to six 'Matrix4f.multiply_right()' per bone and one more for the parent.
+'batched' 'Matrix4f.compose_many()' for every local matrix at once, then 'evaluate_hierarchy()' one level at a time.
+
+Run from the repository root:
+    python benchmarks/bench_bone_matrices.py [bone count]
+"""
+
+import math
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nep_tools.utils.matrix4f import Matrix4f, evaluate_hierarchy
+
+ROOT = Matrix4f.create_rotation_x(math.pi * .5)
+
+
+def create_armature(count: int):
+    rng = np.random.default_rng(0)
+    parent_indices = np.array([-1] + [rng.integers(max(0, i - 8), i) for i in range(1, count)])  # Chains like real skeletons
+    return parent_indices, rng.random((count, 3)), rng.random((count, 3)) * math.pi, rng.random((count, 3)) * math.pi
+
+
+def scalar(parent_indices, translations, rotations, joint_orients):
+    transforms = []
+    for i in range(len(parent_indices)):
+        t = Matrix4f()
+        t = t.multiply_right(Matrix4f.create_rotation_z(rotations[i, 2]))
+        t = t.multiply_right(Matrix4f.create_rotation_y(rotations[i, 1]))
+        t = t.multiply_right(Matrix4f.create_rotation_x(rotations[i, 0]))
+        t = t.multiply_right(Matrix4f.create_rotation_z(joint_orients[i, 2]))
+        t = t.multiply_right(Matrix4f.create_rotation_y(joint_orients[i, 1]))
+        t = t.multiply_right(Matrix4f.create_rotation_x(joint_orients[i, 0]))
+        t.m03, t.m13, t.m23 = translations[i]
+        transforms.append(transforms[parent_indices[i]].multiply_right(t) if parent_indices[i] >= 0 else ROOT.multiply_right(t))
+    return transforms
+
+
+def batched(parent_indices, translations, rotations, joint_orients):
+    local_matrices = Matrix4f.compose_many(
+        Matrix4f.create_translations(translations),
+        Matrix4f.create_rotations_z(rotations[:, 2]),
+        Matrix4f.create_rotations_y(rotations[:, 1]),
+        Matrix4f.create_rotations_x(rotations[:, 0]),
+        Matrix4f.create_rotations_z(joint_orients[:, 2]),
+        Matrix4f.create_rotations_y(joint_orients[:, 1]),
+        Matrix4f.create_rotations_x(joint_orients[:, 0]))
+    return evaluate_hierarchy(parent_indices, local_matrices, ROOT.to_array())
+
+
+def timed(function, armature, repeat: int = 5):
+    best, result = None, None
+    for _ in range(repeat):
+        time_start = time.perf_counter()
+        result = function(*armature)
+        elapsed = time.perf_counter() - time_start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    args = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    count = int(args[0]) if args else 300
+    armature = create_armature(count)
+    print("%i bones" % count)
+
+    scalar_time, scalar_matrices = timed(scalar, armature)
+    batched_time, batched_matrices = timed(batched, armature)
+    print("scalar  %.4fs" % scalar_time)
+    print("batched %.4fs  (%.1fx)" % (batched_time, scalar_time / batched_time))
+    assert np.allclose([m.to_array() for m in scalar_matrices], batched_matrices)
+
+
+if __name__ == "__main__":
+    main()
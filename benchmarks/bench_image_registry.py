@@ -0,0 +1,43 @@
+"""
+Benchmark: how many Blender Images a multi-costume import needs, and how long it takes to decide that.
+
+'by path'    What the importer did before. One Blender Image per texture path.
+'registry'   ImageRegistry.resolve() - Identical files in different texture folders become one Image.
+
+Point it at a folder that holds the texture folders of a character (or any folder of PNG files).
+Run from the repository root:
+    python benchmarks/bench_image_registry.py <folder>
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nep_tools.utils.image_registry import ImageRegistry, get_png_size
+
+
+def find_pngs(folder: str):
+    for directory, _, filenames in os.walk(folder):
+        for filename in filenames:
+            if filename.lower().endswith(".png"):
+                yield os.path.join(directory, filename)
+
+
+def main():
+    args = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    paths = sorted(find_pngs(args[0]))
+    pixel_bytes = sum(width * height * 4 for width, height in map(get_png_size, paths))
+    print("by path   %i images  %8.1f MiB of pixels" % (len(paths), pixel_bytes / (1024 * 1024)))
+
+    time_start = time.perf_counter()
+    image_registry = ImageRegistry()
+    resolved_paths = {image_registry.resolve(path) for path in paths}
+    elapsed = time.perf_counter() - time_start
+    print("registry  %i images  %8.1f MiB of pixels  (%.4fs, %i files hashed)" % (
+        len(resolved_paths), (pixel_bytes - image_registry.duplicate_pixel_bytes) / (1024 * 1024), elapsed, len(image_registry.digests)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark: welding a mesh of disconnected triangles back together.
+
+'pairwise' The commented-out merge that used to be in 'to_blender()'. Every vertex is compared with every vertex kept so far.
+'sorted'   PreBlender_Model.merge_vertices() - Every vertex is packed into one key and the keys are sorted once.
+
+The mesh is built like most ISM2 meshes: a connected mesh where every triangle was given its own 3 vertices.
+Some triangles also get a back face with the same vertices, which must survive the merge.
+Run from the repository root:
+    python benchmarks/bench_merge_vertices.py [triangle count]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nep_tools import model_types
+
+PAIRWISE_TRIANGLE_LIMIT = 2000  # The pairwise merge is O(n²) - Only a slice of the mesh is timed with it
+
+
+def create_model(triangle_count: int) -> model_types.PreBlender_Model:
+    rng = np.random.default_rng(0)
+    welded_vertex_count = triangle_count // 2
+    positions = rng.random((welded_vertex_count, 3), dtype=np.float32)
+    normals = rng.random((welded_vertex_count, 3), dtype=np.float32)
+    uvs = rng.random((welded_vertex_count, 2), dtype=np.float32)
+    faces = rng.integers(0, welded_vertex_count, (triangle_count, 3))
+    faces = faces[~model_types.find_duplicate_faces(faces)]
+    faces = np.concatenate((faces, faces[:len(faces) // 50, ::-1]))  # Back faces
+
+    corners = faces.ravel()
+    model = model_types.PreBlender_Model("benchmark")
+    model.add_vertices(positions[corners], normals[corners], uvs[corners], np.ones((len(corners), 4), dtype=np.float32))
+    model.set_faces(np.arange(len(corners)).reshape(-1, 3), np.zeros(len(faces), dtype=np.int32))
+    return model
+
+
+def merge_pairwise(model: model_types.PreBlender_Model, triangle_count: int) -> int:
+    vertices = [(tuple(p), tuple(n), tuple(uv)) for p, n, uv in zip(model.positions.tolist(), model.normals.tolist(), model.uvs.tolist())]
+    vertices_merged = []
+    for face in model.face_indices[:triangle_count].tolist():
+        for vertex_index_old in face:
+            if vertices[vertex_index_old] not in vertices_merged:  # Linear search, like the original
+                vertices_merged.append(vertices[vertex_index_old])
+    return len(vertices_merged)
+
+
+def main():
+    args = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    triangle_count = int(args[0]) if args else 200000
+    model = create_model(triangle_count)
+    vertex_count = model.get_vertex_count()
+    print("%i triangles, %i vertices" % (model.get_face_count(), vertex_count))
+
+    time_start = time.perf_counter()
+    merge_pairwise(model, PAIRWISE_TRIANGLE_LIMIT)
+    pairwise_time = time.perf_counter() - time_start
+    print("pairwise %.4fs for the first %i triangles" % (pairwise_time, PAIRWISE_TRIANGLE_LIMIT))
+
+    time_start = time.perf_counter()
+    model.merge_vertices()
+    sorted_time = time.perf_counter() - time_start
+    print("sorted   %.4fs for all of them  %i -> %i vertices" % (sorted_time, vertex_count, model.get_vertex_count()))
+    assert not model_types.find_duplicate_faces(model.face_indices).any()  # Back faces kept their own vertices
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark: peak memory of reading every Mesh of an ISM2 file.
+
+'model'     read_ism2() - Every vertex and face of the file is held in one 'PreBlender_Model'.
+'streaming' iter_mesh_sections() - One Mesh at a time. Each Mesh is dropped before the next one is read.
+
+Peak memory is measured with 'tracemalloc'. Point it at a map file with many Meshes to see the difference.
+Run from the repository root:
+    python benchmarks/bench_mesh_streaming.py <ism2 file>
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nep_tools import parse_ism2
+
+
+def read_model(filepath: str):
+    model = parse_ism2.read_ism2(*os.path.split(filepath))
+    return model.get_vertex_count(), model.get_face_count()
+
+
+def read_streaming(filepath: str):
+    vertex_count, face_count = 0, 0
+    for mesh_section in parse_ism2.iter_mesh_sections(filepath):
+        vertex_count += mesh_section.get_vertex_count()
+        face_count += mesh_section.get_face_count()
+    return vertex_count, face_count
+
+
+def measure(label: str, function, filepath: str):
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = function(filepath)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print("%-9s peak %8.1f MiB" % (label, peak / (1024 * 1024)))
+    return result
+
+
+def main():
+    args = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    filepath = args[0]
+    model_counts = measure("model", read_model, filepath)
+    streaming_counts = measure("streaming", read_streaming, filepath)
+    print("%i vertices, %i triangles" % model_counts)
+    assert model_counts == streaming_counts
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark: peak memory of a 500k vertex model while it is being built.
+
+'objects'  The old representation. One 'Vertex' (4 tuples and a list of 'BoneWeight') per vertex
+           and one 'Face' per triangle, all without '__slots__'.
+'columnar' PreBlender_Model buffers. Contiguous arrays for every vertex attribute, faces and skin weights.
+
+Peak memory is measured with 'tracemalloc', so only Python allocations are counted (NumPy reports its buffers to it).
+
+Run from the repository root:
+    python benchmarks/bench_model_memory.py
+"""
+
+import os
+import sys
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nep_tools import model_types
+
+VERTICES = 500000
+TRIANGLES = VERTICES // 3 * 2
+WEIGHTS_PER_VERTEX = 2
+
+
+class LegacyBoneWeight:
+    def __init__(self, bone_id: int, bone_weight: float) -> None:
+        super().__init__()
+        self.bone_id = bone_id
+        self.bone_weight = bone_weight
+
+
+class LegacyVertex:
+    def __init__(self, x, y, z, u, v, r, g, b, a, nx, ny, nz) -> None:
+        super().__init__()
+        self.position = (x, y, z)
+        self.uv = (u, v)
+        self.rgba = (r, g, b, a)
+        self.normal = (nx, ny, nz)
+        self.boneWeights = []
+
+
+class LegacyFace:
+    def __init__(self, indices, surface_index: int) -> None:
+        super().__init__()
+        self.indices = indices
+        self.surface_index = surface_index
+
+
+def create_source_data():
+    rng = np.random.default_rng(0)
+    positions = rng.random((VERTICES, 3), dtype=np.float32)
+    normals = rng.random((VERTICES, 3), dtype=np.float32)
+    uvs = rng.random((VERTICES, 2), dtype=np.float32)
+    colors = np.ones((VERTICES, 4), dtype=np.float32)
+    bone_ids = rng.integers(0, 64, (VERTICES, WEIGHTS_PER_VERTEX)).astype(np.int32)
+    weights = np.full((VERTICES, WEIGHTS_PER_VERTEX), 1.0 / WEIGHTS_PER_VERTEX, dtype=np.float32)
+    faces = rng.integers(0, VERTICES, (TRIANGLES, 3)).astype(np.int32)
+    return positions, normals, uvs, colors, bone_ids, weights, faces
+
+
+def build_objects(positions, normals, uvs, colors, bone_ids, weights, faces):
+    vertices = []
+    for p, n, uv, c, ids, ws in zip(positions.tolist(), normals.tolist(), uvs.tolist(), colors.tolist(),
+                                    bone_ids.tolist(), weights.tolist()):
+        vertex = LegacyVertex(*p, *uv, *c, *n)
+        for bone_id, bone_weight in zip(ids, ws):
+            vertex.boneWeights.append(LegacyBoneWeight(bone_id, bone_weight))
+        vertices.append(vertex)
+    face_list = [LegacyFace(tuple(f), 0) for f in faces.tolist()]
+    return vertices, face_list
+
+
+def build_columnar(positions, normals, uvs, colors, bone_ids, weights, faces):
+    model = model_types.PreBlender_Model("benchmark")
+    model.add_vertices(positions, normals, uvs, colors)
+    model.set_skin_weights(0, model_types.SkinWeights.from_dense(bone_ids, weights))
+    model.set_faces(faces, np.zeros(len(faces), dtype=np.int32))
+    return model
+
+
+def measure(label: str, function, source):
+    tracemalloc.start()
+    result = function(*source)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print("%-9s peak %8.1f MiB" % (label, peak / (1024 * 1024)))
+    return result, peak
+
+
+def main():
+    source = create_source_data()
+    print("%i vertices, %i triangles, %i weights per vertex" % (VERTICES, TRIANGLES, WEIGHTS_PER_VERTEX))
+    _, peak_objects = measure("objects", build_objects, source)
+    model, peak_columnar = measure("columnar", build_columnar, source)
+    print("difference %.1f MiB (%.1fx)" % ((peak_objects - peak_columnar) / (1024 * 1024), peak_objects / peak_columnar))
+    # The compatibility views still build the old objects on demand
+    assert model.vertices[0].position == tuple(model.positions[0].tolist())
+    assert model.faces[-1].indices == tuple(model.face_indices[-1].tolist())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark: the name lookups done while reading a map file with a lot of surfaces.
+
+'linear'  What the parser did before. Every surface searches the materials for its material
+          and every mesh searches the surfaces for its surface, so reading a file costs O(n²) comparisons.
+'indexed' 'PreBlender_Model.getMaterialByName()' / 'getSurfaceByName()' backed by a 'NameIndex'.
+
+Run from the repository root:
+    python benchmarks/bench_name_lookup.py [surface count]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nep_tools import model_types
+
+
+def linear_lookup(items, name: str) -> int:
+    for i, item in enumerate(items):
+        if item.name == name:
+            return i
+    return -1
+
+
+def read_linear(names):
+    model = model_types.PreBlender_Model("linear")
+    for name in names:
+        model.materials.append(model_types.Material(name))
+    for name in names:
+        model.surfaces.append(model_types.Surface(name, linear_lookup(model.materials, name)))
+    return [linear_lookup(model.surfaces, name) for name in names]
+
+
+def read_indexed(names):
+    model = model_types.PreBlender_Model("indexed")
+    for name in names:
+        model.materials.append(model_types.Material(name))
+    for name in names:
+        model.surfaces.append(model_types.Surface(name, model.getMaterialByName(name)))
+    return [model.getSurfaceByName(name) for name in names]
+
+
+def timed(function, names, repeat: int = 5) -> float:
+    best = None
+    for _ in range(repeat):
+        time_start = time.perf_counter()
+        result = function(names)
+        elapsed = time.perf_counter() - time_start
+        best = elapsed if best is None else min(best, elapsed)
+    assert result == list(range(len(names)))
+    return best
+
+
+def main():
+    args = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    count = int(args[0]) if args else 2000
+    names = ["surface_%04i" % i for i in range(count)]
+    print("%i materials, %i surfaces, %i meshes" % (count, count, count))
+
+    linear_time = timed(read_linear, names)
+    indexed_time = timed(read_indexed, names)
+    print("linear  %.4fs" % linear_time)
+    print("indexed %.4fs  (%.1fx)" % (indexed_time, linear_time / indexed_time))
+
+
+if __name__ == "__main__":
+    main()
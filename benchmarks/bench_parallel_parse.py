@@ -0,0 +1,49 @@
+"""
+Benchmark: reading a whole folder of ISM2 files one after another against a process pool.
+
+'serial'   read_ism2_files(parallel=False) - What the importer did before. One core.
+'parallel' read_ism2_files(parallel=True)  - One worker process per core.
+
+Point it at a folder with a lot of ISM2 files (a character folder or a map set works well).
+Run from the repository root:
+    python benchmarks/bench_parallel_parse.py <folder with ism2 files> [workers]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nep_tools import parse_ism2
+
+
+def timed(filedirectory, filenames, parallel: bool, max_workers: int = None):
+    time_start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):  # Workers print to the console directly, only this process is silenced
+        models = parse_ism2.read_ism2_files(filedirectory, filenames, parallel=parallel, max_workers=max_workers)
+    return time.perf_counter() - time_start, models
+
+
+def main():
+    args = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    filedirectory = args[0]
+    max_workers = int(args[1]) if len(args) > 1 else None
+    filenames = sorted(name for name in os.listdir(filedirectory) if name.lower().endswith(".ism2"))
+    print("%i files, %i cores" % (len(filenames), os.cpu_count()))
+
+    serial_time, serial_models = timed(filedirectory, filenames, False)
+    parallel_time, parallel_models = timed(filedirectory, filenames, True, max_workers)
+    print("serial   %.3fs" % serial_time)
+    print("parallel %.3fs  (%.2fx)" % (parallel_time, serial_time / parallel_time))
+
+    for a, b in zip(serial_models, parallel_models):
+        assert (a is None) == (b is None)
+        if a is not None:
+            assert a.name == b.name and a.get_vertex_count() == b.get_vertex_count() and a.get_face_count() == b.get_face_count()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark: resolving texture references against a texture directory.
+
+'os.path'    What 'read_ism2' did before. Up to 4 'os.path.exists()' calls per texture reference (mapped / unmapped PNG, then TID).
+'FileIndex'  The directory is listed once with 'os.scandir()'. Every check is a set lookup.
+
+Local disks hide most of the difference - On network drives every filesystem call is a round trip.
+Run from the repository root:
+    python benchmarks/bench_texture_lookup.py [texture directory]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nep_tools.utils.file_index import FileIndex
+
+TEXTURE_FILES = 2000
+TEXTURE_REFERENCES = 5000
+
+
+class CountingPath:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def exists(self, path: str) -> bool:
+        self.calls += 1
+        return os.path.exists(path)
+
+
+def resolve(exists, directory: str, names):
+    found = 0
+    for name in names:
+        mapped = name + "_c"
+        if exists(os.path.join(directory, "%s.png" % mapped)) or exists(os.path.join(directory, "%s.png" % name)):
+            found += 1
+        elif exists(os.path.join(directory, "%s.tid" % name)) or exists(os.path.join(directory, "%s.tid" % mapped)):
+            pass
+    return found
+
+
+def main():
+    directory = sys.argv[1] if len(sys.argv) > 1 else None
+    temporary = directory is None
+    if temporary:
+        directory = tempfile.mkdtemp()
+        for i in range(TEXTURE_FILES):
+            open(os.path.join(directory, "tex%i_c.%s" % (i, "png" if i % 2 else "tid")), 'wb').close()
+    names = ["tex%i" % (i % (TEXTURE_FILES * 2)) for i in range(TEXTURE_REFERENCES)]
+
+    counter = CountingPath()
+    time_start = time.perf_counter()
+    found_a = resolve(counter.exists, directory, names)
+    time_a = time.perf_counter() - time_start
+
+    file_index = FileIndex()
+    time_start = time.perf_counter()
+    found_b = resolve(file_index.isfile, directory, names)
+    time_b = time.perf_counter() - time_start
+
+    assert found_a == found_b
+    print("%i texture references" % len(names))
+    print("os.path    %.4fs  %6i filesystem calls" % (time_a, counter.calls))
+    print("FileIndex  %.4fs  %6i filesystem calls  (%.1fx)" % (time_b, file_index.fs_calls, time_a / time_b))
+    if temporary:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
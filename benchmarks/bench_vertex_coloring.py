@@ -0,0 +1,73 @@
+"""
+Benchmark: detecting which materials need vertex coloring on a 200k triangle map.
+
+'per face'   The old check from the 0x45 branch. Every corner of every triangle runs 'any(VC != 1 for VC in rgba)'.
+'vectorized' PreBlender_Model.detect_vertex_coloring(). One pass over the color buffer.
+
+Run from the repository root:
+    python benchmarks/bench_vertex_coloring.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nep_tools import model_types
+
+TRIANGLES = 200000
+SURFACES = 300
+COLORED_VERTEX_RATIO = 0.0002
+
+
+def create_model() -> model_types.PreBlender_Model:
+    rng = np.random.default_rng(0)
+    vertex_count = TRIANGLES * 3  # Most ISM2 maps do not reuse vertices
+    model = model_types.PreBlender_Model("benchmark")
+    for i in range(SURFACES):
+        model.materials.append(model_types.Material("material_%i" % i))
+        model.surfaces.append(model_types.Surface("surface_%i" % i, i))
+    colors = np.ones((vertex_count, 4), dtype=np.float32)
+    colors[rng.random(vertex_count) < COLORED_VERTEX_RATIO, 0] = 0.5
+    model.add_vertices(np.zeros((vertex_count, 3)), np.zeros((vertex_count, 3)), np.zeros((vertex_count, 2)), colors)
+    model.set_faces(np.arange(vertex_count).reshape(-1, 3), np.sort(rng.integers(0, SURFACES, TRIANGLES)))
+    return model
+
+
+def detect_per_face(model: model_types.PreBlender_Model):
+    rgba = [tuple(c) for c in model.colors.tolist()]  # The old 'Vertex.rgba' tuples
+    for face_indicies, surface_index in zip(model.face_indices.tolist(), model.face_surface_indices.tolist()):
+        material_index_local = model.surfaces[surface_index].material_index
+        if 0 <= material_index_local < len(model.materials):
+            for VI in face_indicies:
+                if any(VC != 1 for VC in rgba[VI]):
+                    model.materials[material_index_local].enable_vertex_coloring = True
+
+
+def main():
+    model = create_model()
+
+    time_start = time.perf_counter()
+    detect_per_face(model)
+    time_per_face = time.perf_counter() - time_start
+    flags_per_face = [M.enable_vertex_coloring for M in model.materials]
+
+    for M in model.materials:
+        M.enable_vertex_coloring = False
+    time_start = time.perf_counter()
+    model.detect_vertex_coloring()
+    time_vectorized = time.perf_counter() - time_start
+    flags_vectorized = [M.enable_vertex_coloring for M in model.materials]
+
+    print("%i triangles, %i surfaces, %i materials with vertex coloring" % (TRIANGLES, SURFACES, sum(flags_vectorized)))
+    print("per face    %.4fs" % time_per_face)
+    print("vectorized  %.4fs  (%.0fx)" % (time_vectorized, time_per_face / time_vectorized))
+    if flags_per_face != flags_vectorized:
+        print("ERROR: results do not match")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: how many 'VertexGroup.add()' calls a skinned model needs, and how long it takes to prepare them.
+
+'per influence' What the importer did before. One assignment per (vertex, bone).
+'grouped'       SkinWeights.get_weight_groups() - One call per (bone, weight) pair.
+
+Blender is not needed - A stand-in Vertex Group only counts the calls. Inside Blender each call has a fixed cost
+on top of the vertices it is given, so the call count is what matters.
+Run from the repository root:
+    python benchmarks/bench_vertex_weights.py [vertex count]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nep_tools import model_types
+
+BONES = 80
+WEIGHTS_PER_VERTEX = 4
+
+
+class CountingVertexGroup:
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    def add(self, index, weight, type):
+        self.calls += 1
+
+
+def create_skin_weights(vertex_count: int) -> model_types.SkinWeights:
+    rng = np.random.default_rng(0)
+    bone_ids = rng.integers(0, BONES, (vertex_count, WEIGHTS_PER_VERTEX))
+    # Exported weights are usually quantized - 8 bits per weight is typical
+    weights = np.round(rng.random((vertex_count, WEIGHTS_PER_VERTEX)) * 255) / 255
+    weights[:, -1] = 0
+    return model_types.SkinWeights.from_dense(bone_ids, weights.astype(np.float32))
+
+
+def per_influence(skin_weights: model_types.SkinWeights, vertex_groups):
+    offsets = skin_weights.offsets.tolist()
+    bone_ids = skin_weights.bone_ids.tolist()
+    weights = skin_weights.weights.tolist()
+    for vertex_index in range(len(skin_weights)):
+        for influence_index in range(offsets[vertex_index], offsets[vertex_index + 1]):
+            vertex_groups[bone_ids[influence_index]].add((vertex_index,), weights[influence_index], 'REPLACE')
+
+
+def grouped(skin_weights: model_types.SkinWeights, vertex_groups):
+    for bone_id, weight, vertex_indices in skin_weights.get_weight_groups():
+        vertex_groups[bone_id].add(vertex_indices.tolist(), weight, 'REPLACE')
+
+
+def measure(label: str, function, skin_weights):
+    vertex_groups = [CountingVertexGroup() for _ in range(BONES)]
+    time_start = time.perf_counter()
+    function(skin_weights, vertex_groups)
+    elapsed = time.perf_counter() - time_start
+    print("%-13s %8i calls  %.4fs" % (label, sum(g.calls for g in vertex_groups), elapsed))
+
+
+def main():
+    args = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    vertex_count = int(args[0]) if args else 50000
+    skin_weights = create_skin_weights(vertex_count)
+    print("%i vertices, %i influences, %i bones" % (vertex_count, len(skin_weights.bone_ids), BONES))
+    measure("per influence", per_influence, skin_weights)
+    measure("grouped", grouped, skin_weights)
+
+
+if __name__ == "__main__":
+    main()
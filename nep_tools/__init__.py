@@ -19,48 +19,61 @@ bl_info = {
 debug = False
 serious_error_notify = False
 
-if "bpy" in locals():
+# The parsing core ('model_types', 'parse_ism2', 'parse_cache', 'utils') does not need Blender.
+# Outside of Blender (worker processes, benchmarks, batch tools) only the parsing core is loaded.
+try:
+    import bpy
+except ImportError:
+    bpy = None
+
+if bpy is not None and "file_ism2" in locals():
     import importlib
     import nep_tools
 
     importlib.reload(nep_tools.utils.binary_file)
+    importlib.reload(nep_tools.utils.file_index)
+    importlib.reload(nep_tools.utils.image_registry)
     importlib.reload(nep_tools.utils.matrix4f)
+    importlib.reload(nep_tools.model_types)
+    importlib.reload(nep_tools.parse_ism2)
+    importlib.reload(nep_tools.parse_cache)
     importlib.reload(nep_tools.import_to_blender)
     importlib.reload(nep_tools.file_ism2)
     importlib.reload(nep_tools.extract_arc_vii_dlc)
-else:
+elif bpy is not None:
     from nep_tools.utils import matrix4f
+    from nep_tools import model_types
+    from nep_tools import parse_ism2
+    from nep_tools import parse_cache
     from nep_tools import import_to_blender
     from nep_tools import file_ism2
     from nep_tools import extract_arc_vii_dlc
 
-import bpy
-
-
-def menu_func_import(self, context):
-    self.layout.operator(file_ism2.BlenderOperator_ISM2_import.bl_idname, text="Neptunia Models (.ism2)")
-
-
-class TOPBAR_MT_NepTools(bpy.types.Menu):
-    bl_idname = "TOPBAR_MT_NepTools"
-    bl_label = "NepTools"
-
-    def menu_draw(self, context):
-        self.layout.menu("TOPBAR_MT_NepTools")
-
-    def draw(self, context):
-        self.layout.operator(file_ism2.BlenderOperator_ISM2_import.bl_idname)
-        self.layout.separator()
-        self.layout.operator(extract_arc_vii_dlc.BlenderOperator_ARC_Descriptor.bl_idname)
-        self.layout.operator(extract_arc_vii_dlc.BlenderOperator_ARC_Extractor.bl_idname)
-
-
-_classes = (
-    file_ism2.BlenderOperator_ISM2_import,
-    extract_arc_vii_dlc.BlenderOperator_ARC_Descriptor,
-    extract_arc_vii_dlc.BlenderOperator_ARC_Extractor,
-    TOPBAR_MT_NepTools,
-)
+if bpy is not None:
+    def menu_func_import(self, context):
+        self.layout.operator(file_ism2.BlenderOperator_ISM2_import.bl_idname, text="Neptunia Models (.ism2)")
+
+    class TOPBAR_MT_NepTools(bpy.types.Menu):
+        bl_idname = "TOPBAR_MT_NepTools"
+        bl_label = "NepTools"
+
+        def menu_draw(self, context):
+            self.layout.menu("TOPBAR_MT_NepTools")
+
+        def draw(self, context):
+            self.layout.operator(file_ism2.BlenderOperator_ISM2_import.bl_idname)
+            self.layout.operator(file_ism2.BlenderOperator_ISM2_switch_texture_variant.bl_idname)
+            self.layout.separator()
+            self.layout.operator(extract_arc_vii_dlc.BlenderOperator_ARC_Descriptor.bl_idname)
+            self.layout.operator(extract_arc_vii_dlc.BlenderOperator_ARC_Extractor.bl_idname)
+
+    _classes = (
+        file_ism2.BlenderOperator_ISM2_import,
+        file_ism2.BlenderOperator_ISM2_switch_texture_variant,
+        extract_arc_vii_dlc.BlenderOperator_ARC_Descriptor,
+        extract_arc_vii_dlc.BlenderOperator_ARC_Extractor,
+        TOPBAR_MT_NepTools,
+    )
 
 
 def register():
@@ -175,16 +175,17 @@ CREDIT: This section of code is based on a Quick BMS Script found here:  https:/
 
 def extract_arc_file(path: str):
     f = open(path, 'rb')
-    R = binary_file.LD_BinaryReader(f, True)
-    if not f.read(4) == b'ARC\x02':
+    R = binary_file.LD_MappedBinaryReader(f, True)
+    if not R.read_bytes(4) == b'ARC\x02':
         print("INCORRECT FILE FORMAT  %s" % path)
+        R.close()
         return
 
     file_count = R.read_long_unsigned()  # File Count
     description_table_size = R.read_long_unsigned()  # Length of all the File Descriptions
     description_table_entry_size = int(description_table_size / file_count)  # Length of the File Descriptions
     file_name_list_size = R.read_long_unsigned()  # Full length
-    offset_file_descriptions = f.tell()  # Location that File Descriptions begin
+    offset_file_descriptions = R.tell()  # Location that File Descriptions begin
     offset_file_names = offset_file_descriptions + description_table_size  # Location that File Names begin
     offset_files = offset_file_names + file_name_list_size  # Location that File Data begins
 
@@ -223,10 +224,10 @@ def extract_arc_file(path: str):
                         raise
             R.goto(offset_files + af.offset)
             out = open(out_path, 'wb')  # Starts from a fresh empty file
-            out.write(f.read(af.size))
+            out.write(R.read_bytes(af.size))
             # out.flush()  # Closing probably ensures that it is flushed anyway
             out.close()
-    f.close()
+    R.close()
 
 
 if __name__ == "__main__":
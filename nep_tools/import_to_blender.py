@@ -2,563 +2,487 @@
 IMPORT TO BLENDER
 
 This file serves as a connection between 'any Neptunia 3D Model file type' and 'Blender'.
-No matter the file format, the file should be able to be decoded into a 'PreBlender_Model' object.
+No matter the file format, the file should be able to be decoded into a 'PreBlender_Model' object. (See 'model_types.py')
 The 'PreBlender_Model' object is primarily to make the code very readable and easy to debug.
 After a 'PreBlender_Model' is built, it can be imported with the 'to_blender()' function.
 """
 
-from typing import List
+from typing import List, Tuple
 
+import json
 import os
 import random
+import time
 
 import bpy
 import bmesh
+import numpy as np
 
 import nep_tools
-from nep_tools.utils.matrix4f import Matrix4f
-
-
-class BoundingBox:
-    def __init__(self, min_x: float, min_y: float, min_z: float, max_x: float, max_y: float, max_z: float) -> None:
-        super().__init__()
-        self.min_x, self.min_y, self.min_z = min_x, min_y, min_z
-        self.max_x, self.max_y, self.max_z = max_x, max_y, max_z
-
-    def get_verts(self):
-        return ((self.min_x, self.min_y, self.max_z),
-                (self.min_x, self.min_y, self.min_z),
-                (self.max_x, self.min_y, self.min_z),
-                (self.max_x, self.min_y, self.max_z),
-                (self.min_x, self.max_y, self.max_z),
-                (self.min_x, self.max_y, self.min_z),
-                (self.max_x, self.max_y, self.min_z),
-                (self.max_x, self.max_y, self.max_z))
-
-    def get_quads(self):
-        return ((0, 1, 2, 3),
-                (3, 2, 6, 7),
-                (7, 6, 5, 4),
-                (4, 5, 1, 0),
-                (4, 0, 3, 7),
-                (1, 5, 6, 2))
-
-
-class Bone:
-    def __init__(self, name: str, bone_id: int, bone_index) -> None:
-        super().__init__()
-        self.name = name
-        self.bone_id = bone_id
-        self.bone_index = bone_index
-        self.parentid: int = -1
-        self.transform: Matrix4f = None
-
-    def __str__(self) -> str:
-        return "Index:%s ID:%s, PID:%s Name: %s" % (str(self.bone_index).rjust(3), str(self.bone_id).rjust(3), str(self.parentid).rjust(3), self.name)
-
-
-class Bones(List[Bone]):
-    def __init__(self, count: int) -> None:
+# The model types used to live in this file. They are imported here so 'import_to_blender.PreBlender_Model' etc. keep working.
+from nep_tools.model_types import (BoundingBox, Bone, Bones, BoneWeight, SkinWeights, TextureDirectory, Material, Surface,
+                                   Vertex, Face, FaceAnm, MotionFrame, MotionType, MotionBone, Motion, BufferView, PreBlender_Model)
+from nep_tools.utils.file_index import FileIndex
+from nep_tools.utils.image_registry import ImageRegistry
+from nep_tools.utils.matrix4f import bone_matrices_to_heads_tails_rolls
+
+
+def build_mesh(blender_mesh: bpy.types.Mesh, model: PreBlender_Model) -> int:  # returns how many faces Blender discarded
+    """
+    Fills an empty Mesh straight from the model's buffers with 'foreach_set()'. No Python code runs per vertex or per face.
+    Every triangle gets its own 3 loops. UVs and Vertex Colors are stored per loop, so they are gathered through the face indices.
+    """
+    vertex_count = model.get_vertex_count()
+    face_count = model.get_face_count()
+    loop_vertex_indices = model.face_indices.ravel()
+
+    blender_mesh.vertices.add(vertex_count)
+    blender_mesh.vertices.foreach_set("co", model.positions.ravel())
+    blender_mesh.loops.add(face_count * 3)
+    blender_mesh.loops.foreach_set("vertex_index", loop_vertex_indices)
+    blender_mesh.polygons.add(face_count)
+    blender_mesh.polygons.foreach_set("loop_start", np.arange(0, face_count * 3, 3, dtype=np.int32))
+    blender_mesh.polygons.foreach_set("loop_total", np.full(face_count, 3, dtype=np.int32))
+    blender_mesh.polygons.foreach_set("material_index", model.face_surface_indices)
+
+    blender_mesh.uv_layers.new().data.foreach_set("uv", model.uvs[loop_vertex_indices].ravel())
+    blender_mesh.vertex_colors.new().data.foreach_set("color", model.colors[loop_vertex_indices].ravel())
+
+    blender_mesh.update(calc_edges=True)
+    # Removes anything Blender can not handle (a triangle that uses a vertex twice, the same triangle twice, ...)
+    if blender_mesh.validate(clean_customdata=False):
+        blender_mesh.update()
+    return face_count - len(blender_mesh.polygons)
+
+
+def assign_vertex_weights(blender_object: bpy.types.Object, model: PreBlender_Model):
+    """
+    Creates a Vertex Group for every bone that has weights, named after the bone. Bones without weights get no group.
+    The weights are grouped by (bone, weight) so each group is a single 'VertexGroup.add()' call instead of one per vertex.
+    """
+    bones_by_id = model.bones.bones_by_id
+    if bones_by_id is None:
+        return
+    vertex_groups: dict = {}  # Bone ID -> Vertex Group
+    for bone_id, weight, vertex_indices in model.skin_weights.get_weight_groups(model.get_vertex_count()):
+        vertex_group = vertex_groups.get(bone_id)
+        if vertex_group is None:
+            if not 0 <= bone_id < len(bones_by_id) or bones_by_id[bone_id] < 0:  # No bone has this ID
+                continue
+            vertex_group = vertex_groups[bone_id] = blender_object.vertex_groups.new(name=model.bones[bones_by_id[bone_id]].name)
+        vertex_group.add(vertex_indices.tolist(), weight, 'REPLACE')
+
+
+BONE_LENGTH = 0.02
+
+
+def build_armatures(models: List[PreBlender_Model], target_collection: bpy.types.Collection) -> List[bpy.types.Object]:  # returns None for models without bones
+    """
+    Creates the Armature Object of every model with bones, in the same order as 'models'.
+    Models with the same skeleton (See 'Bones.compute_skeleton_hash()') share one Armature Object. Its bones are only created once.
+    All of them are built in one Edit Mode session - 'bpy.ops.object.mode_set()' updates the whole scene, so it is not called per model.
+    Bone heads, tails and rolls are computed for all bones of an armature at once and set with 'foreach_set()'.
+    """
+    blender_object_armatures: List[bpy.types.Object] = [None] * len(models)
+    armatures_by_skeleton: dict = {}  # Skeleton hash -> (model, Armature Object)
+    for model_index, model in enumerate(models):
+        if model.bones is None:
+            continue
+        skeleton_hash = model.bones.skeleton_hash if model.bones.skeleton_hash is not None else model.bones.compute_skeleton_hash()
+        if skeleton_hash in armatures_by_skeleton:
+            blender_object_armatures[model_index] = armatures_by_skeleton[skeleton_hash][1]
+            continue
+        blender_armature: bpy.types.Armature = bpy.data.armatures.new(model.getName())
+        blender_armature.display_type = 'STICK'
+        blender_armature.show_names = False  # True
+        blender_armature.show_axes = True
+        blender_object_armature: bpy.types.Object = bpy.data.objects.new(model.getName() + " Armature", blender_armature)
+        blender_object_armature.show_in_front = True
+        target_collection.objects.link(blender_object_armature)
+        blender_object_armatures[model_index] = blender_object_armature
+        armatures_by_skeleton[skeleton_hash] = (model, blender_object_armature)
+    if len(armatures_by_skeleton) == 0:
+        return blender_object_armatures
+    print("    Armatures: %i for %i models with bones" % (len(armatures_by_skeleton), sum(model.bones is not None for model in models)))
+
+    # Every selected Armature enters Edit Mode together with the active one - Only select the new ones
+    for blender_object in bpy.context.view_layer.objects.selected:
+        blender_object.select_set(False)
+    for model, blender_object_armature in armatures_by_skeleton.values():
+        blender_object_armature.select_set(True)
+        bpy.context.view_layer.objects.active = blender_object_armature
+    bpy.ops.object.mode_set(mode='EDIT', toggle=False)
+
+    for model, blender_object_armature in armatures_by_skeleton.values():
+        eb: bpy.types.ArmatureEditBones = blender_object_armature.data.edit_bones
+        blender_bones: List[bpy.types.EditBone] = [eb.new(B.name) for B in model.bones]  # Need this to reference bones added to Blender
+        for B, blender_bone in zip(model.bones, blender_bones):
+            if 0 <= B.parentid < len(blender_bones):
+                blender_bone.parent = blender_bones[B.parentid]
+        heads, tails, rolls = bone_matrices_to_heads_tails_rolls(model.bones.matrices, BONE_LENGTH)
+        eb.foreach_set("head", heads.astype(np.float32).ravel())
+        eb.foreach_set("tail", tails.astype(np.float32).ravel())
+        eb.foreach_set("roll", rolls.astype(np.float32))
+
+    bpy.ops.object.mode_set()
+    return blender_object_armatures
+
+
+TEXTURE_MAP_NODE_NAMES = ("Diffuse Map", "Specular Map", "Emission Map", "Normal Map", "M Map")  # Same order as 'Material.get_texture_filenames()'
+
+
+SURFACE_NODE_GROUP_NAME = "ISM2 Surface"
+# Group inputs each map is plugged into - The 'M' Map is not plugged in (I dont know what it is)
+SURFACE_NODE_GROUP_INPUTS = ("Diffuse", "Specular", "Emission", "Normal", None)  # Same order as 'TEXTURE_MAP_NODE_NAMES'
+
+
+def get_surface_node_group() -> bpy.types.ShaderNodeTree:
+    """
+    The shading shared by every ISM2 Material. It is built once per .blend file. Editing it in Blender changes every imported Material.
+    Materials only hold their Image Texture nodes and an instance of this group.
+    """
+    node_group: bpy.types.ShaderNodeTree = bpy.data.node_groups.get(SURFACE_NODE_GROUP_NAME)
+    if node_group is not None and node_group.bl_idname == 'ShaderNodeTree':
+        return node_group
+
+    node_group = bpy.data.node_groups.new(SURFACE_NODE_GROUP_NAME, 'ShaderNodeTree')
+    node_group.inputs.new('NodeSocketColor', "Diffuse").default_value = (0.8, 0.8, 0.8, 1.0)
+    node_group.inputs.new('NodeSocketFloatFactor', "Specular").default_value = 0.5
+    node_group.inputs.new('NodeSocketColor', "Emission").default_value = (0.0, 0.0, 0.0, 1.0)
+    node_group.inputs.new('NodeSocketVector', "Normal")
+    node_group.inputs.new('NodeSocketFloatFactor', "Use Normal Map").default_value = 0.0
+    node_group.inputs.new('NodeSocketFloatFactor', "Use Vertex Color").default_value = 0.0
+    node_group.inputs.new('NodeSocketFloatFactor', "Alpha").default_value = 1.0  # Not connected on import - See README
+    node_group.outputs.new('NodeSocketShader', "BSDF")
+
+    nodes: bpy.types.Nodes = node_group.nodes
+    links: bpy.types.NodeLinks = node_group.links
+
+    node_input: bpy.types.Node = nodes.new('NodeGroupInput')
+    node_input.location = (-900, 0)
+    node_output: bpy.types.Node = nodes.new('NodeGroupOutput')
+    node_output.location = (300, 0)
+    node_bsdf: bpy.types.Node = nodes.new('ShaderNodeBsdfPrincipled')
+    node_bsdf.location = (0, 0)
+    links.new(node_bsdf.outputs['BSDF'], node_output.inputs['BSDF'])
+
+    # Vertex Color - Multiplied with the diffuse when 'Use Vertex Color' is 1
+    nodes_mix_vertex_color: bpy.types.Node = nodes.new('ShaderNodeMixRGB')
+    nodes_mix_vertex_color.name = "Vertex Shading"
+    nodes_mix_vertex_color.label = "Vertex Shading"
+    nodes_mix_vertex_color.blend_type = 'MULTIPLY'
+    nodes_mix_vertex_color.location = (-300, 140)
+    nodes_vertex_color: bpy.types.Node = nodes.new('ShaderNodeVertexColor')
+    nodes_vertex_color.name = "Vertex Color"
+    nodes_vertex_color.label = "Vertex Color"
+    nodes_vertex_color.location = (-600, 140)
+    links.new(node_input.outputs['Use Vertex Color'], nodes_mix_vertex_color.inputs['Fac'])
+    links.new(node_input.outputs['Diffuse'], nodes_mix_vertex_color.inputs['Color1'])
+    links.new(nodes_vertex_color.outputs['Color'], nodes_mix_vertex_color.inputs['Color2'])
+    links.new(nodes_mix_vertex_color.outputs['Color'], node_bsdf.inputs['Base Color'])
+
+    # Normal - An unconnected group input is (0, 0, 0), so the geometry normal is used unless 'Use Normal Map' is 1
+    nodes_geometry: bpy.types.Node = nodes.new('ShaderNodeNewGeometry')
+    nodes_geometry.location = (-600, -400)
+    nodes_mix_normal: bpy.types.Node = nodes.new('ShaderNodeMixRGB')
+    nodes_mix_normal.name = "Normal Select"
+    nodes_mix_normal.label = "Normal Select"
+    nodes_mix_normal.location = (-300, -400)
+    links.new(node_input.outputs['Use Normal Map'], nodes_mix_normal.inputs['Fac'])
+    links.new(nodes_geometry.outputs['Normal'], nodes_mix_normal.inputs['Color1'])
+    links.new(node_input.outputs['Normal'], nodes_mix_normal.inputs['Color2'])
+    links.new(nodes_mix_normal.outputs['Color'], node_bsdf.inputs['Normal'])
+
+    links.new(node_input.outputs['Specular'], node_bsdf.inputs['Specular'])
+    links.new(node_input.outputs['Emission'], node_bsdf.inputs['Emission'])
+    links.new(node_input.outputs['Alpha'], node_bsdf.inputs['Alpha'])
+    return node_group
+
+
+def create_material_template(enable_vertex_coloring: bool, texture_maps: tuple) -> bpy.types.Material:
+    """
+    Builds the nodes shared by every Material with this layout - 'texture_maps' says which of the 'TEXTURE_MAP_NODE_NAMES' are used.
+    The Image Texture nodes are left empty. 'MaterialCache' copies this Material and assigns the images.
+    """
+    blender_material: bpy.types.Material = bpy.data.materials.new(".ISM2 Template")
+    blender_material.use_nodes = True
+
+    nodes: bpy.types.Nodes = blender_material.node_tree.nodes
+    links: bpy.types.NodeLinks = blender_material.node_tree.links
+    nodes.remove(nodes['Principled BSDF'])
+    node_output: bpy.types.Node = nodes['Material Output']
+
+    node_surface: bpy.types.Node = nodes.new('ShaderNodeGroup')
+    node_surface.node_tree = get_surface_node_group()
+    node_surface.name = SURFACE_NODE_GROUP_NAME
+    node_surface.label = SURFACE_NODE_GROUP_NAME
+    node_surface.location = (node_output.location[0] - 300, node_output.location[1])
+    node_surface.inputs['Use Vertex Color'].default_value = 1.0 if enable_vertex_coloring else 0.0
+    node_surface.inputs['Use Normal Map'].default_value = 1.0 if texture_maps[3] else 0.0
+    links.new(node_surface.outputs['BSDF'], node_output.inputs['Surface'])
+
+    baseNodeX: int = int(node_surface.location[0] - 400)
+    baseNodeY: int = int(node_surface.location[1] + 200)
+    for i, (node_name, group_input, used) in enumerate(zip(TEXTURE_MAP_NODE_NAMES, SURFACE_NODE_GROUP_INPUTS, texture_maps)):
+        if not used:
+            continue
+        nodes_texture: bpy.types.Node = nodes.new('ShaderNodeTexImage')  # Without a 'Vector' link it uses the active UV Map
+        nodes_texture.name = node_name
+        nodes_texture.label = node_name
+        nodes_texture.location = (baseNodeX, baseNodeY - 300 * i)
+        if group_input is not None:
+            links.new(nodes_texture.outputs['Color'], node_surface.inputs[group_input])
+
+    return blender_material
+
+
+class MaterialCache:
+    """
+    The Blender Materials of one import, found by what they are made of (See 'get_signature()') instead of by walking their node trees.
+    A new Material is a copy of a template with the same node layout, so each layout is only built once per import.
+    Textures go through one 'ImageRegistry', so a file (or an identical copy of it in another folder) becomes one Blender Image.
+    """
+
+    def __init__(self, file_index: FileIndex, option_cull_back_facing: bool = True) -> None:
         super().__init__()
-        self.bones_by_id: [int] = [-1] * count
-
-    def __str__(self) -> str:
-        return "Count: %i" % len(self.bones_by_id)
-
-    def __len__(self) -> int:
-        return len(self.bones_by_id)
-
-    def append(self, b: Bone) -> None:
-        super().append(b)
-        if b.bone_id >= 0:
-            self.bones_by_id[b.bone_id] = b.bone_index
-
-    def trim(self):
-        i = len(self.bones_by_id) - 1
-        while self.bones_by_id[i] < 0:
-            i -= 1
-            if i < 0:  # no bones have any IDs
-                self.bones_by_id = None
-                return
-        self.bones_by_id = self.bones_by_id[0:i + 1]
-
-    def get_by_id(self, bone_id: int) -> Bone:
-        if bone_id == None:
-            print("BoneID's don't exist")
+        self.file_index: FileIndex = file_index
+        self.option_cull_back_facing: bool = option_cull_back_facing
+        self.materials: dict = {}  # Signature -> Blender Material
+        self.templates: dict = {}  # Layout -> Blender Material
+        self.image_registry: ImageRegistry = ImageRegistry(file_index)
+        self.images: dict = {}  # Resolved path -> Blender Image
+        self.image_request_count: int = 0
+        self.random = random.Random()
+        self.created_count: int = 0
+        self.reused_count: int = 0
+        self.time_spent: float = 0.0  # Seconds spent in 'get()'
+
+    @staticmethod
+    def get_signature(material: Material, texture_directory: TextureDirectory) -> tuple:
+        return (material.name, texture_directory.name, texture_directory.path, material.enable_vertex_coloring) + material.get_texture_filenames()
+
+    @staticmethod
+    def get_blender_material_name(material: Material, texture_directory: TextureDirectory) -> str:
+        if texture_directory.name is not None:
+            return "%s__%s" % (material.name, texture_directory.name)  # Material name followed by Location name
+        return "%s" % material.name  # Material name
+
+    def get(self, material: Material, texture_directory: TextureDirectory) -> bpy.types.Material:
+        signature = self.get_signature(material, texture_directory)
+        blender_material: bpy.types.Material = self.materials.get(signature)
+        if blender_material is not None:
+            self.reused_count += 1
+            return blender_material
+
+        time_start = time.perf_counter()
+        # IF an earlier import made this Material THEN use it ELSE create a new one
+        blender_material_name = self.get_blender_material_name(material, texture_directory)
+        blender_material = self.find_existing(material, texture_directory, blender_material_name)
+        if blender_material is None:
+            blender_material = self.create(material, texture_directory, blender_material_name)
+        else:
+            self.reused_count += 1
+        self.materials[signature] = blender_material
+        self.time_spent += time.perf_counter() - time_start
+        return blender_material
+
+    def find_existing(self, material: Material, texture_directory: TextureDirectory, blender_material_name: str) -> bpy.types.Material:  # returns None if there is no match
+        """Only done once per signature - Materials made by an earlier import are checked by their nodes."""
+        blender_material: bpy.types.Material = bpy.data.materials.get(blender_material_name)
+        # IF any of these conditions fails THEN it is not a match
+        if blender_material is None or not blender_material.use_nodes:
             return None
-        if bone_id < 0 or bone_id >= len(self.bones_by_id):
-            print("BoneID Out Of Range: %s" % bone_id)
+        nodes: bpy.types.Nodes = blender_material.node_tree.nodes
+        for node_name, image_filename in zip(TEXTURE_MAP_NODE_NAMES, material.get_texture_filenames()):
+            N = nodes.get(node_name)
+            if N is None:  # Node does not exist
+                if image_filename is not None: return None  # Node should exist - Fail
+            else:  # Node does exist
+                if N.image is None: return None  # Node has no image assigned - Fail
+                F = os.path.join(texture_directory.path, "%s.png" % image_filename)
+                if N.image.filepath not in (F, self.image_registry.resolve(F)): return None  # Node lists a different file - Fail
+        return blender_material
+
+    def create(self, material: Material, texture_directory: TextureDirectory, blender_material_name: str) -> bpy.types.Material:
+        texture_filenames = material.get_texture_filenames()
+        layout = (material.enable_vertex_coloring, tuple(filename is not None for filename in texture_filenames))
+        template: bpy.types.Material = self.templates.get(layout)
+        if template is None:
+            template = self.templates[layout] = create_material_template(*layout)
+
+        blender_material: bpy.types.Material = template.copy()  # Copies the node tree as well
+        blender_material.name = blender_material_name
+        blender_material.diffuse_color = (self.random.random(), self.random.random(), self.random.random(), 1.0)
+        blender_material.use_backface_culling = self.option_cull_back_facing
+
+        nodes: bpy.types.Nodes = blender_material.node_tree.nodes
+        for node_name, image_filename in zip(TEXTURE_MAP_NODE_NAMES, texture_filenames):
+            if image_filename is None:
+                continue
+            nodes[node_name].image = self.get_image(os.path.join(texture_directory.path, "%s.png" % image_filename))
+        self.created_count += 1
+        return blender_material
+
+    def get_image(self, filepath: str) -> bpy.types.Image:  # returns None if the file does not exist
+        self.image_request_count += 1
+        resolved_path = self.image_registry.resolve(filepath)
+        if resolved_path is None:
             return None
-        return self[self.bones_by_id[bone_id]]
-
-
-class BoneWeight:
-    def __init__(self, bone_id: int, bone_weight: float) -> None:
-        super().__init__()
-        self.bone_id = bone_id
-        self.bone_weight = bone_weight
-
-    def __str__(self) -> str:
-        return "%i, %.3f" % (self.bone_id, self.bone_weight)
-
-
-class TextureDirectory:
-    def __init__(self, name: str, path: str):
-        super().__init__()
-        # This name should match the folder it was found in. For Maps it should be 'None'.
-        self.name: str = name
-        # This is the absolute path to the location that the textures are found in.
-        self.path: str = path
-
-    def __str__(self) -> str:
-        return "Texture Directory '%s'  < %s >" % (self.name, self.path)
-
-
-class Material:
-    def __init__(self, name: str) -> None:
-        super().__init__()
-        self.name: str = name
-        self.enable_vertex_coloring: bool = False
-        # Diffuse Texture - C <-- Letter in the file name
-        self.texture_diffuse_filename: str = None
-        # Diffuse Texture - S
-        self.texture_specular_filename: str = None
-        # Diffuse Texture - N
-        self.texture_normal_filename: str = None
-        # Diffuse Texture - I
-        self.texture_emission_filename: str = None
-        # Diffuse Texture - M
-        self.texture_cyangreen_filename: str = None
-
-    def __str__(self) -> str:
-        return "Material(%s, vertex_coloring: %s)" % (self.name, self.enable_vertex_coloring)
-
-
-class Surface:
-    def __init__(self, name: str, material_index: int) -> None:
-        super().__init__()
-        self.name: str = name
-        self.material_index: int = material_index
-        self.bounding_box: BoundingBox = None
-
-    def __str__(self) -> str:
-        return "Surface(%s,  %s)" % (self.name, self.material_index)
-
-
-class Vertex:
-    def __init__(self, x: float, y: float, z: float, u: float, v: float, r: float, g: float, b: float, a: float, nx: float, ny: float, nz: float) -> None:
-        # This is able to have a second set of Normals - though, I do not know for what purpose
-        super().__init__()
-        self.position: (float, float, float) = (x, y, z)
-        self.uv: (float, float) = (u, v)
-        self.rgba: (float, float, float, float) = (r, g, b, a)
-        self.normal: (float, float, float) = (nx, ny, nz)
-        self.boneWeights: list[BoneWeight,] = []
-
-
-class Face:
-    def __init__(self, indices: (), surface_index: int) -> None:
-        super().__init__()
-        self.indices: (int,) = indices  # indices
-        self.surface_index: int = surface_index
-
-    def __str__(self) -> str:
-        return "(%04i, %04i, %04i)  %i" % (self.indices[0], self.indices[1], self.indices[2], self.surface_index)
-
-
-class FaceAnm:
-    def __init__(self, face_anm: str) -> None:
-        super().__init__()
-        self.face_anm: str = face_anm  # Todo: for now just a simple long string
-
-
-class MotionFrame:
-    def __init__(self, frame_position: float, data: List[float]) -> None:
-        super().__init__()
-        self.frame_position = frame_position
-        self.data = data
-
-    def __str__(self) -> str:
-        return "%s: (%s)" % (str(self.frame_position).rjust(6), ", ".join("%.4f" % a for a in self.data))
-
-
-class MotionType:
-    def __init__(self) -> None:
-        super().__init__()
-        self.motion_data: List[MotionFrame] = []
-
-    def __str__(self) -> str:
-        return "MF"
-
-
-class MotionBone:
-    def __init__(self, bone_name: str) -> None:
-        super().__init__()
-        self.bone_name = bone_name
-        self.motion_types: List[MotionType] = []
-
-    def __str__(self) -> str:
-        return self.bone_name
-
-
-class Motion:
-    def __init__(self, name: str, duration: float) -> None:
-        super().__init__()
-        self.name = name
-        self.duration = duration
-        self.motion_bones: List[MotionBone] = []
-
-    def __str__(self) -> str:
-        return "%s :: %s :: #bones:%s" % (self.name, self.duration, len(self.motion_bones))
-
-
-class PreBlender_Model:
-    def __init__(self, name: str) -> None:
-        super().__init__()
-        self.name: str = name
-
-        # Buffers
-        self.strings: List[str] = []
-        self.texture_directories: List[TextureDirectory] = []
-        self.textures: dict = {}
-        self.materials: List[Material] = []
-        self.surfaces: List[Surface] = []
-        self.vertices: List[Vertex] = []
-        self.faces: List[Face] = []
-        self.bounding_box: BoundingBox = None
-        self.bones: Bones = None
-        self.motions: List[Motion] = []
-        self.face_anm: FaceAnm = None
-
-    def getName(self):
-        return self.name
-
-    def getMaterialByName(self, name: str) -> int:
-        for material_index, material in enumerate(self.materials):
-            if material.name == name:
-                return material_index
-        return -1
+        image: bpy.types.Image = self.images.get(resolved_path)
+        if image is None:
+            # Only the header is read here. Blender loads the pixels the first time the image is displayed.
+            #   Do not touch 'image.size' or 'image.pixels' - Either one loads the pixels right away.
+            image = self.images[resolved_path] = bpy.data.images.load(filepath=resolved_path, check_existing=True)
+        return image
+
+    def remove_templates(self):
+        for template in self.templates.values():
+            bpy.data.materials.remove(template)
+        self.templates.clear()
+
+
+TEXTURE_VARIANTS_PROPERTY = "ism2_texture_variants"
+
+
+def set_texture_variants(blender_object: bpy.types.Object, slot_materials: List[Material], texture_directories: List[TextureDirectory],
+                         active_texture_directory_index: int, option_cull_back_facing: bool):
+    """
+    Remembers every texture set (texture directory) of a model on its Blender Object, so the Materials of another set can be created later.
+    Stored as JSON in a custom property - It is saved with the .blend file.
+    """
+    blender_object[TEXTURE_VARIANTS_PROPERTY] = json.dumps({
+        "active": active_texture_directory_index,
+        "cull_back_facing": option_cull_back_facing,
+        "texture_directories": [(D.name, D.path) for D in texture_directories],
+        "materials": [(M.name, M.enable_vertex_coloring, M.get_texture_filenames()) for M in slot_materials]})
+
+
+def get_texture_variants(blender_object: bpy.types.Object) -> dict:  # returns None if the Object was not imported with texture sets
+    texture_variants = blender_object.get(TEXTURE_VARIANTS_PROPERTY) if blender_object is not None else None
+    if not isinstance(texture_variants, str):
+        return None
+    return json.loads(texture_variants)
+
+
+def switch_texture_variant(blender_object: bpy.types.Object, texture_directory_name: str, material_cache: MaterialCache = None) -> bool:  # returns False if the Object has no texture set by this name
+    """
+    Points every Material slot of 'blender_object' to the Materials of another texture set. Missing Materials are created.
+    When switching several Objects, pass one 'material_cache' for all of them, so their Materials and Images are only created once.
+    """
+    texture_variants = get_texture_variants(blender_object)
+    if texture_variants is None:
+        return False
+    texture_directory_names = [name for name, path in texture_variants["texture_directories"]]
+    if texture_directory_name not in texture_directory_names:
+        return False
+    texture_directory_index = texture_directory_names.index(texture_directory_name)
+    texture_directory = TextureDirectory(*texture_variants["texture_directories"][texture_directory_index])
+
+    owns_material_cache = material_cache is None
+    if owns_material_cache:
+        material_cache = MaterialCache(FileIndex(), texture_variants["cull_back_facing"])
+    for slot_index, (name, enable_vertex_coloring, texture_filenames) in enumerate(texture_variants["materials"]):
+        if slot_index >= len(blender_object.material_slots):  # Slots removed by the user
+            break
+        material = Material(name)
+        material.enable_vertex_coloring = enable_vertex_coloring
+        material.texture_diffuse_filename, material.texture_specular_filename, material.texture_emission_filename, \
+            material.texture_normal_filename, material.texture_cyangreen_filename = texture_filenames
+        blender_object.material_slots[slot_index].material = material_cache.get(material, texture_directory)
+    if owns_material_cache:
+        material_cache.remove_templates()
+
+    texture_variants["active"] = texture_directory_index
+    blender_object[TEXTURE_VARIANTS_PROPERTY] = json.dumps(texture_variants)
+    return True
 
 
 def to_blender(models: List[PreBlender_Model],
                option_cull_back_facing: bool = True,
                option_merge_vertices: bool = False,
-               option_import_location=(0, 0, 0)):
+               option_import_location=(0, 0, 0),
+               file_index: FileIndex = None) -> Tuple[int, int, float]:  # returns (0, 0, 0.0) if vertices were not merged
+    """Returns the vertex count of all models before and after merging vertices, and how many seconds merging took."""
+    if file_index is None:
+        file_index = FileIndex()
     target_collection: bpy.types.Collection = bpy.data.collections.new("ISM2 Import.000")
     bpy.context.scene.collection.children.link(target_collection)
 
     print("Importing %i models" % len(models))
+    material_cache = MaterialCache(file_index, option_cull_back_facing)
+    merge_vertex_count_before = 0
+    merge_vertex_count_after = 0
+    merge_time = 0.0
+
+    blender_object_armatures: List[bpy.types.Object] = build_armatures(models, target_collection)
 
-    for model in models:
-        # Todo: Merge Vertices if option is enabled - Process Heavy
-        #     Maybe this should move to the 'PreBlender_Model' class.
-        #     Maybe this should be done after imported into Blender to take advantage of it's effieciency.
+    for model_index, model in enumerate(models):
+        # Merge Vertices
         #   The goal here is to merge as much as possible while saving the double sided geometry.
-        #   A method I use in Blender is to select UV-islands then perform a merge on those vertices.
         #   Blender does not actually support double sided geometry so if you merge with all vertices
-        #     selected then you will lose all the double sided geometry.
-        #
-        # Todo: Try to make more efficient
-        #
-        # model.vertices_merged: List[model_types.Vertex] = []
-        # model.faces_merged_verts: List[model_types.Face] = []
-        # face_counter = 0
-        # face_counter_last_report = 0
-        # for face in model.faces:
-        #     new_face_poly = []
-        #     for vert_index_old in face.poly:
-        #         vert = model.vertices[vert_index_old]
-        #         # check if duplicate exists
-        #         vert_duplicate_found = -1
-        #         for vert_index_new in range(len(model.vertices_merged)):
-        #             if vert == model.vertices_merged[vert_index_new]:
-        #                 vert_duplicate_found = vert_index_new
-        #                 break
-        #         if vert_duplicate_found >= 0:
-        #             # Use existing Vertex
-        #             new_face_poly.append(vert_duplicate_found)
-        #         else:
-        #             # Create a new Vertex
-        #             new_face_poly.append(len(model.vertices_merged))
-        #             model.vertices_merged.append(model.vertices[vert_index_old])
-        #     new_face: model_types.Face = model_types.Face(new_face_poly, face.surface_index)
-        #     model.faces_merged_verts.append(new_face)
-        #     face_counter += 1
-        #     if face_counter - face_counter_last_report > len(model.faces) / 100:
-        #         print("Merging Verts: %i" % (face_counter / len(model.faces) * 100))
-        #         face_counter_last_report = face_counter
-        #
-        # model.vertices = model.vertices_merged
-        # model.faces = model.faces_merged_verts
+        #     selected then you will lose all the double sided geometry. (See 'PreBlender_Model.merge_vertices()')
+        if option_merge_vertices:
+            merge_time_start = time.time()
+            vertex_count = model.get_vertex_count()
+            model.merge_vertices()
+            merge_vertex_count_before += vertex_count
+            merge_vertex_count_after += model.get_vertex_count()
+            merge_time_model = time.time() - merge_time_start
+            merge_time += merge_time_model
+            print("    Merged Vertices: %i -> %i (%.1f%% fewer) in %.4f seconds" % (
+                vertex_count, model.get_vertex_count(), 100 - model.get_vertex_count() * 100 / max(vertex_count, 1), merge_time_model))
 
         # CREATE BLENDER STUFF
         blender_mesh: bpy.types.Mesh = bpy.data.meshes.new(model.getName())
         blender_object: bpy.types.Object = bpy.data.objects.new(model.getName(), blender_mesh)
 
-        # Armature
-        hasArmature: bool = model.bones is not None
-        if hasArmature:
-            blender_armature: bpy.types.Armature = bpy.data.armatures.new(model.getName())
-            blender_object_armature: bpy.types.Object = bpy.data.objects.new(model.getName() + " Armature", blender_armature)
-            target_collection.objects.link(blender_object_armature)
-            bpy.context.view_layer.objects.active = blender_object_armature
-            bpy.ops.object.mode_set(mode='EDIT', toggle=False)
-            eb: bpy.types.ArmatureEditBones = blender_armature.edit_bones
-
-            blender_bones = []  # Need this to reference bones added to Blender
-            for B in model.bones:
-                blender_bone: bpy.types.EditBone = eb.new(B.name)
-                blender_bones.append(blender_bone)
-                blender_bone.parent = blender_bones[B.parentid] if B.parentid >= 0 else None
-
-                m: Matrix4f = B.transform
-                blender_bone.head = (0.0, 0.0, 0.0)
-                blender_bone.tail = (0.0, 0.02, 0.0)
-                blender_bone.transform(m.toBlenderMatrix())
-
-            bpy.ops.object.mode_set()
-            blender_armature.display_type = 'STICK'
-
-            blender_armature.show_names = False  # True
-            blender_object_armature.show_in_front = True
-            blender_armature.show_axes = True
-
-        blender_bMesh: bmesh.types.BMesh = bmesh.new()
-        blender_bMesh.from_mesh(blender_mesh)
-
-        # Add Data to Face Loops (UV, Color)
-        blender_bMesh_uvLayer = blender_bMesh.loops.layers.uv.new()
-        blender_bMesh_colorLayer = blender_bMesh.loops.layers.color.new()
-        if hasArmature:
-            blender_bmesh_weight_layer = blender_bMesh.verts.layers.deform.new()
-
-        # Create Vertices
-        blender_bMesh_verts = []  # Need to access this to create faces
-        for vertex_index in range(len(model.vertices)):
-            blender_bMesh_verts.append(blender_bMesh.verts.new(model.vertices[vertex_index].position))
-        blender_bMesh.verts.index_update()
-
-        # Create Vertex Groups
-        if model.bones.bones_by_id is not None:
-            for current_bone_id in model.bones.bones_by_id:
-                blender_object.vertex_groups.new(name=model.bones[current_bone_id].name)
+        # Armature - Built before this loop (See 'build_armatures()')
+        blender_object_armature: bpy.types.Object = blender_object_armatures[model_index]
+        hasArmature: bool = blender_object_armature is not None
 
-        # Set Vertex Weights
-        if hasArmature:
-            for vert in blender_bMesh.verts:
-                # print("Vertex: %s    Vertex Bone ID: %s   BoneWeight: %s" % (i, model.vertex_bones[i], model.vertex_bone_weights[i]))
-                dvert = vert[blender_bmesh_weight_layer]
-                for bone_weight_link in model.vertices[vert.index].boneWeights:
-                    dvert[bone_weight_link.bone_id] = bone_weight_link.bone_weight
-
-        # Create Faces
-        # You can send any tuple size greater than 2
-        # 3 makes a triangle, 4 makes a quad, 5+ makes n-gons
+        # Create Vertices, Faces, UVs and Vertex Colors
         # Although it seems that ISM2 files (so far) only use triangles
         # MOST do not reuse Vertices which is quite annoying. Every triangle will be disconnected.
         # Some DO reuse vertices which can produce a new problem. Double sided geometry causes an error in blender.
-        error_faces: int = 0
-        for face in model.faces:
-            blender_face_loop = []
-            for vertex_index in face.indices:  # Loops through the vertices in this Face Loop
-                blender_face_loop.append(blender_bMesh_verts[vertex_index])  # Converts to Blender format
-            # TODO This sometimes causes an error. I assume it is because the mesh contains double sided geometry. Blender doesn't like that.
-            #  I have no good solution right now. For now the problem faces are ignored. Which also causes the custom normals to be discarded.
-            try:
-                blender_bMesh_face: bmesh.types.BMFace = blender_bMesh.faces.new(blender_face_loop)
-            except:
-                error_faces += 1
-                nep_tools.serious_error_notify = True
-                continue
-            blender_bMesh_face.material_index = face.surface_index
-            # Assign UV coords, Vertex Color, Materials, and Bone Weights
-            for vertex_index, loop_vertex in enumerate(blender_bMesh_face.loops):  # Loops through the vertices in this Face Loop
-                VI = face.indices[vertex_index]
-                # UV coordinates
-                loop_vertex[blender_bMesh_uvLayer].uv = model.vertices[VI].uv
-                # Vertex Colors
-                loop_vertex[blender_bMesh_colorLayer] = model.vertices[VI].rgba
-
-        # Push BMesh to Mesh
-        blender_bMesh.to_mesh(blender_mesh)
-        blender_bMesh.free()
+        #   Those faces get their own vertices first, so Blender accepts every face.
+        separated_faces: int = model.separate_problem_faces()
+        if separated_faces and nep_tools.debug:
+            print("    Double sided or degenerate faces given their own vertices: %i" % separated_faces)
+        error_faces: int = build_mesh(blender_mesh, model)
 
-        if error_faces:
-            print("\n:: SERIOUS ERROR :: Model '%s' had Geometry Error(s) - To save the model: %i faces AND all normals were discarded.\n" % (model.getName(), error_faces))
-        else:
-            # Some Mesh Data must be added after conversion from BMesh to Mesh
+        # Create Vertex Groups & Set Vertex Weights
+        if hasArmature and model.skin_weights is not None:
+            assign_vertex_weights(blender_object, model)
 
-            # Assign Normals
-            blender_mesh.use_auto_smooth = True
-            # Set normal vectors to (0, 0, 0) to keep auto normal - Maybe implement this
+        if error_faces:
+            nep_tools.serious_error_notify = True
+            print("\n:: SERIOUS ERROR :: Model '%s' had Geometry Error(s) - To save the model: %i faces were discarded.\n" % (model.getName(), error_faces))
 
-            blender_normals: List[float] = []
-            for face in model.faces:
-                for vertex_index in face.indices:
-                    n = model.vertices[vertex_index].normal
-                    blender_normals.append(n)
-            blender_mesh.normals_split_custom_set(blender_normals)
-            # blender_mesh.normals_split_custom_set([c.normal for c in model.vertices])  # Old way - works with models that do not reuse vertices
+        # Assign Normals - They are per vertex, so faces that were discarded do not matter
+        blender_mesh.use_auto_smooth = True
+        blender_mesh.normals_split_custom_set_from_vertices(model.normals)
 
         # Assign Materials (Use the surfaces to create Blender Materials)
         r = random.Random()
 
-        def addMaterialToObject(material: Material, texture_directory: TextureDirectory, activate: bool):
-            def isMaterialEqual(material: Material, texture_directory: TextureDirectory, blender_material_name: str) -> bool:
-                if bpy.data.materials.find(blender_material_name) == -1: return False  # A Material by this name does not exist
-                blender_material: bpy.types.Material = bpy.data.materials[blender_material_name]
-                # IF any of these conditions fails THEN it is not a match
-                if not blender_material.use_nodes: return False
-                nodes: bpy.types.Nodes = blender_material.node_tree.nodes
-
-                def isTextureMapEqual(node_name: str, image_filename: str) -> bool:
-                    if nodes.find(node_name) == -1:  # Node does not exist
-                        if image_filename is not None: return False  # Node should exist - Fail
-                    else:  # Node does exist
-                        N = nodes[node_name]
-                        if N.image is None: return False  # Node has no image assigned - Fail
-                        if N.image.filepath != os.path.join(texture_directory.path, "%s.png" % image_filename): return False  # Node lists a different file - Fail
-                    return True
-
-                if isTextureMapEqual("Diffuse Map", material.texture_diffuse_filename) \
-                        and isTextureMapEqual("Specular Map", material.texture_specular_filename) \
-                        and isTextureMapEqual("Emission Map", material.texture_emission_filename) \
-                        and isTextureMapEqual("Normal Map", material.texture_normal_filename) \
-                        and isTextureMapEqual("M Map", material.texture_cyangreen_filename):
-                    return True
-
-            # Determine the name to be used in Blender for this Material
-            if texture_directory.name is not None:
-                blender_material_name = "%s__%s" % (material.name, texture_directory.name)  # Material name followed by Location name
-            else:
-                blender_material_name = "%s" % material.name  # Material name
-
-            blender_material: bpy.types.Material
-            # IF a match is found THEN use existing material ELSE create new material
-            if isMaterialEqual(material, texture_directory, blender_material_name):
-                blender_material = bpy.data.materials[blender_material_name]
-            else:
-                blender_material = bpy.data.materials.new(blender_material_name)
-                # blender_material.use_fake_user = True
-                blender_material.diffuse_color = (r.random(), r.random(), r.random(), 1.0)
-                blender_material.use_backface_culling = option_cull_back_facing
-                blender_material.use_nodes = True
-
-                nodes: bpy.types.Nodes = blender_material.node_tree.nodes
-                node_bsdf: bpy.types.Node = nodes['Principled BSDF']
-                links: bpy.types.NodeLinks = blender_material.node_tree.links
-
-                baseNodeX: int = int(node_bsdf.location[0] - (700 if material.enable_vertex_coloring else 400))
-                baseNodeY: int = int(node_bsdf.location[1] + 200)
-
-                # UVMap
-                nodes_uvmap: bpy.types.Node = nodes.new('ShaderNodeUVMap')
-                nodes_uvmap.name = "UV Map"
-                nodes_uvmap.label = "UV Map"
-                # nodes_uvmap.uv_map = blender_bMesh_uvLayer
-                nodes_uvmap.location = (node_bsdf.location[0] - (1000 if material.enable_vertex_coloring else 700), node_bsdf.location[1])
-
-                # Vertex Color
-                if material.enable_vertex_coloring:
-                    nodes_mix_vertex_color: bpy.types.Node = nodes.new('ShaderNodeMixRGB')
-                    nodes_mix_vertex_color.name = "Vertex Shading"
-                    nodes_mix_vertex_color.label = "Vertex Shading"
-                    nodes_mix_vertex_color.blend_type = 'MULTIPLY'
-                    nodes_mix_vertex_color.inputs['Fac'].default_value = 1.0
-                    nodes_mix_vertex_color.inputs['Color1'].default_value = (1.0, 1.0, 1.0, 1.0)
-                    nodes_mix_vertex_color.inputs['Color2'].default_value = (1.0, 1.0, 1.0, 1.0)
-                    nodes_mix_vertex_color.location = (node_bsdf.location[0] - 200, node_bsdf.location[1] + 140)
-                    links.new(nodes_mix_vertex_color.outputs['Color'], node_bsdf.inputs['Base Color'])
-
-                    nodes_vertex_color: bpy.types.Node = nodes.new('ShaderNodeVertexColor')
-                    nodes_vertex_color.name = "Vertex Color"
-                    nodes_vertex_color.label = "Vertex Color"
-                    nodes_vertex_color.location = (node_bsdf.location[0] - 400, node_bsdf.location[1] - 5)
-                    links.new(nodes_vertex_color.outputs['Color'], nodes_mix_vertex_color.inputs['Color2'])
-
-                # Diffuse Map
-                if material.texture_diffuse_filename is not None:
-                    nodes_texture_diffuse: bpy.types.Node = nodes.new('ShaderNodeTexImage')
-                    nodes_texture_diffuse.name = "Diffuse Map"  # Diffuse Texture Name
-                    nodes_texture_diffuse.label = "Diffuse Map"  # Diffuse Texture Name
-                    nodes_texture_diffuse.location = (baseNodeX, baseNodeY)
-                    F = os.path.join(texture_directory.path, "%s.png" % material.texture_diffuse_filename)  # Filepath of image to add to blender
-                    if os.path.isfile(F):
-                        nodes_texture_diffuse.image = bpy.data.images.load(filepath=F, check_existing=True)
-                    if material.enable_vertex_coloring:
-                        links.new(nodes_texture_diffuse.outputs['Color'], nodes_mix_vertex_color.inputs['Color1'])
-                    else:
-                        links.new(nodes_texture_diffuse.outputs[0], node_bsdf.inputs['Base Color'])
-                    links.new(nodes_uvmap.outputs['UV'], nodes_texture_diffuse.inputs['Vector'])
-
-                # Specular Map
-                if material.texture_specular_filename is not None:
-                    nodes_texture_specular: bpy.types.Node = nodes.new('ShaderNodeTexImage')
-                    nodes_texture_specular.name = "Specular Map"  # Diffuse Texture Name
-                    nodes_texture_specular.label = "Specular Map"  # Diffuse Texture Name
-                    nodes_texture_specular.location = (baseNodeX, baseNodeY - 300)
-                    F = os.path.join(texture_directory.path, "%s.png" % material.texture_diffuse_filename)  # Filepath of image to add to blender
-                    if os.path.isfile(F):
-                        nodes_texture_specular.image = bpy.data.images.load(filepath=F, check_existing=True)
-                    links.new(nodes_texture_specular.outputs[0], node_bsdf.inputs['Specular'])
-                    links.new(nodes_uvmap.outputs['UV'], nodes_texture_specular.inputs['Vector'])
-
-                # Emission Map
-                if material.texture_emission_filename is not None:
-                    nodes_texture_emission: bpy.types.Node = nodes.new('ShaderNodeTexImage')
-                    nodes_texture_emission.name = "Emission Map"  # Diffuse Texture Name
-                    nodes_texture_emission.label = "Emission Map"  # Diffuse Texture Name
-                    nodes_texture_emission.location = (baseNodeX, baseNodeY - 600)
-                    F = os.path.join(texture_directory.path, "%s.png" % material.texture_emission_filename)  # Filepath of image to add to blender
-                    if os.path.isfile(F):
-                        nodes_texture_emission.image = bpy.data.images.load(filepath=F, check_existing=True)
-                    links.new(nodes_texture_emission.outputs[0], node_bsdf.inputs['Emission'])
-                    links.new(nodes_uvmap.outputs['UV'], nodes_texture_emission.inputs['Vector'])
-
-                # Normal Map
-                if material.texture_normal_filename is not None:
-                    nodes_texture_normal: bpy.types.Node = nodes.new('ShaderNodeTexImage')
-                    nodes_texture_normal.name = "Normal Map"  # Diffuse Texture Name
-                    nodes_texture_normal.label = "Normal Map"  # Diffuse Texture Name
-                    nodes_texture_normal.location = (baseNodeX, baseNodeY - 900)
-                    F = os.path.join(texture_directory.path, "%s.png" % material.texture_normal_filename)  # Filepath of image to add to blender
-                    if os.path.isfile(F):
-                        nodes_texture_normal.image = bpy.data.images.load(filepath=F, check_existing=True)
-                    links.new(nodes_texture_normal.outputs[0], node_bsdf.inputs['Normal'])
-                    links.new(nodes_uvmap.outputs['UV'], nodes_texture_normal.inputs['Vector'])
-
-                # # 'M' Map (I dont know what this is)
-                if material.texture_cyangreen_filename is not None:
-                    nodes_texture_cyangreen: bpy.types.Node = nodes.new('ShaderNodeTexImage')
-                    nodes_texture_cyangreen.name = "M Map"  # Diffuse Texture Name
-                    nodes_texture_cyangreen.label = "M Map"  # Diffuse Texture Name
-                    nodes_texture_cyangreen.location = (baseNodeX, baseNodeY - 1200)
-                    F = os.path.join(texture_directory.path, "%s.png" % material.texture_cyangreen_filename)  # Filepath of image to add to blender
-                    if os.path.isfile(F):
-                        nodes_texture_cyangreen.image = bpy.data.images.load(filepath=F, check_existing=True)
-                    # links.new(nodes_texture_cyangreen.outputs[0], node_bsdf.inputs['I_DONT_KNOW'])
-                    links.new(nodes_uvmap.outputs['UV'], nodes_texture_cyangreen.inputs['Vector'])
-
-            if activate:
-                blender_mesh.materials.append(blender_material)
-
         # IF surfaces exist THEN add materials by surface. - More complex models rely on the surface to point to the correct material.
         # The order that surfaces are added are always correct whereas materials are not. Luckily each surface points the correct material.
-        active_texture_directory_index: int = int(r.random() * len(model.texture_directories))
-        for texture_directory_index, texture_directory in enumerate(model.texture_directories):  # There should always be at least one location
-            if len(model.surfaces) > 0:
-                for S in model.surfaces:
-                    if 0 <= S.material_index < len(model.materials):  # IF surface pointer points outside of the range of materials THEN do not add material (pointer is -1 when no material should be used)
-                        addMaterialToObject(model.materials[S.material_index], texture_directory, active_texture_directory_index == texture_directory_index)
-            else:
-                for M in model.materials:  # TODO handle a zero material count (I get an IndexOutOfRange for 'active_mat_location_index' sometimes)
-                    addMaterialToObject(M, texture_directory, active_texture_directory_index == texture_directory_index)
+        if len(model.surfaces) > 0:
+            # IF surface pointer points outside of the range of materials THEN do not add material (pointer is -1 when no material should be used)
+            slot_materials: List[Material] = [model.materials[S.material_index] for S in model.surfaces if 0 <= S.material_index < len(model.materials)]
+        else:
+            slot_materials: List[Material] = list(model.materials)
+        # Only the active texture set is created - The others are created by 'switch_texture_variant()' the first time they are used
+        if len(model.texture_directories) > 0:  # There should always be at least one location
+            active_texture_directory_index: int = int(r.random() * len(model.texture_directories))
+            for M in slot_materials:
+                blender_mesh.materials.append(material_cache.get(M, model.texture_directories[active_texture_directory_index]))
+            set_texture_variants(blender_object, slot_materials, model.texture_directories, active_texture_directory_index, option_cull_back_facing)
 
         # Place in Scene
         if hasArmature:
             blender_object_armature.location = option_import_location
         target_collection.objects.link(blender_object)
-        bpy.ops.object.mode_set()
         if hasArmature:
             blender_object.parent = blender_object_armature
             blender_object.modifiers.new(name="Armature", type='ARMATURE').object = blender_object_armature
@@ -614,3 +538,10 @@ def to_blender(models: List[PreBlender_Model],
         #             kp: bpy.types.Keyframe
         #             # fcx.keyframe_points.add()
         #     pass
+
+    material_cache.remove_templates()
+    print("    Materials: %i created, %i reused in %.4f seconds" % (material_cache.created_count, material_cache.reused_count, material_cache.time_spent))
+    print("    Images: %i for %i textures - %i identical copies shared, saving %.1f MiB of pixels" % (
+        len(material_cache.images), material_cache.image_request_count, material_cache.image_registry.duplicate_count,
+        material_cache.image_registry.duplicate_pixel_bytes / (1024 * 1024)))
+    return merge_vertex_count_before, merge_vertex_count_after, merge_time
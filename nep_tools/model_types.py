@@ -0,0 +1,724 @@
+"""
+MODEL TYPES
+
+The 'PreBlender_Model' and everything it is made of.
+No matter the file format, the file should be able to be decoded into a 'PreBlender_Model' object.
+Nothing in here depends on Blender, so models can be built (and pickled) outside of Blender.
+"""
+
+import hashlib
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from nep_tools.utils.matrix4f import Matrix4f
+
+
+class StringTable:
+    """
+    The Strings (0x21) File Section. Behaves like a read-only 'List[str]'.
+    Only the raw bytes and the offsets are kept - Each string is decoded the first time it is used.
+    Most files have far more strings than a model ever looks at (shader parameters, unused bone names, ...).
+    """
+    __slots__ = ('data', 'offsets', 'decoded')
+
+    def __init__(self, data: bytes = b"", offsets: Sequence[int] = ()) -> None:
+        super().__init__()
+        self.data: bytes = data  # Every string, null terminated
+        self.offsets: List[int] = list(offsets)  # Start of each string in 'data'
+        self.decoded: List[str] = [None] * len(self.offsets)
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, index: int) -> str:
+        s = self.decoded[index]
+        if s is None:
+            start = self.offsets[index]
+            end = self.data.find(b'\x00', start)
+            if end < 0:  # The last string ran into the end of the file
+                end = len(self.data)
+            s = self.decoded[index] = self.data[start:end].decode('utf8', 'replace')
+        return s
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(len(self.offsets)):
+            yield self[index]
+
+    def append(self, s: str):
+        """For models that are not read from a file."""
+        self.offsets.append(len(self.data))
+        self.data += s.encode('utf8') + b'\x00'
+        self.decoded.append(s)
+
+
+class NameIndex:
+    """
+    'name -> index' of the first item with that name in 'items' (a list of anything with a '.name').
+    Items appended to the list are indexed on the next lookup, so code that appends to the list directly still works.
+    Items must not be renamed, removed or reordered.
+    """
+    __slots__ = ('items', 'indices', 'indexed_count')
+
+    def __init__(self, items: list) -> None:
+        super().__init__()
+        self.items: list = items
+        self.indices: Dict[str, int] = {}
+        self.indexed_count: int = 0
+
+    def get(self, name: str, default: int = -1) -> int:
+        items = self.items
+        if self.indexed_count != len(items):
+            for i in range(self.indexed_count, len(items)):
+                self.indices.setdefault(items[i].name, i)  # IF a name is used twice THEN the first one wins, like a linear search
+            self.indexed_count = len(items)
+        return self.indices.get(name, default)
+
+
+class BoundingBox:
+    __slots__ = ('min_x', 'min_y', 'min_z', 'max_x', 'max_y', 'max_z')
+
+    def __init__(self, min_x: float, min_y: float, min_z: float, max_x: float, max_y: float, max_z: float) -> None:
+        super().__init__()
+        self.min_x, self.min_y, self.min_z = min_x, min_y, min_z
+        self.max_x, self.max_y, self.max_z = max_x, max_y, max_z
+
+    def get_verts(self):
+        return ((self.min_x, self.min_y, self.max_z),
+                (self.min_x, self.min_y, self.min_z),
+                (self.max_x, self.min_y, self.min_z),
+                (self.max_x, self.min_y, self.max_z),
+                (self.min_x, self.max_y, self.max_z),
+                (self.min_x, self.max_y, self.min_z),
+                (self.max_x, self.max_y, self.min_z),
+                (self.max_x, self.max_y, self.max_z))
+
+    def get_quads(self):
+        return ((0, 1, 2, 3),
+                (3, 2, 6, 7),
+                (7, 6, 5, 4),
+                (4, 5, 1, 0),
+                (4, 0, 3, 7),
+                (1, 5, 6, 2))
+
+
+class Bone:
+    __slots__ = ('name', 'bone_id', 'bone_index', 'parentid', 'transform')
+
+    def __init__(self, name: str, bone_id: int, bone_index) -> None:
+        super().__init__()
+        self.name = name
+        self.bone_id = bone_id
+        self.bone_index = bone_index
+        self.parentid: int = -1
+        self.transform: Matrix4f = None
+
+    def __str__(self) -> str:
+        return "Index:%s ID:%s, PID:%s Name: %s" % (str(self.bone_index).rjust(3), str(self.bone_id).rjust(3), str(self.parentid).rjust(3), self.name)
+
+
+class Bones(List[Bone]):
+    def __init__(self, count: int) -> None:
+        super().__init__()
+        self.bones_by_id: [int] = [-1] * count
+        self.bones_by_name: Dict[str, int] = {}
+        self.matrices: np.ndarray = None  # (N, 4, 4) world matrix of every bone - Row 'i' belongs to 'self[i]'
+        self.skeleton_hash: str = None  # Same for models with identical bone names, parents and matrices (See 'compute_skeleton_hash()')
+
+    def __str__(self) -> str:
+        return "Count: %i" % len(self.bones_by_id)
+
+    def __len__(self) -> int:
+        return len(self.bones_by_id)
+
+    def append(self, b: Bone) -> None:
+        super().append(b)
+        self.bones_by_name.setdefault(b.name, b.bone_index)
+        if b.bone_id >= 0:
+            self.bones_by_id[b.bone_id] = b.bone_index
+
+    def trim(self):
+        i = len(self.bones_by_id) - 1
+        while self.bones_by_id[i] < 0:
+            i -= 1
+            if i < 0:  # no bones have any IDs
+                self.bones_by_id = None
+                return
+        self.bones_by_id = self.bones_by_id[0:i + 1]
+
+    def get_by_id(self, bone_id: int) -> Bone:
+        if bone_id == None:
+            print("BoneID's don't exist")
+            return None
+        if bone_id < 0 or bone_id >= len(self.bones_by_id):
+            print("BoneID Out Of Range: %s" % bone_id)
+            return None
+        return self[self.bones_by_id[bone_id]]
+
+    def get_by_name(self, name: str) -> Bone:  # returns None if there is no bone with that name
+        bone_index = self.bones_by_name.get(name)
+        return None if bone_index is None else self[bone_index]
+
+    def compute_skeleton_hash(self) -> str:
+        """
+        Costume, weapon and accessory files of one character usually carry the same skeleton. Those can share one armature.
+        Matrices are rounded first, so the tiny differences float math leaves between files do not count.
+        """
+        h = hashlib.blake2b(digest_size=16)
+        h.update("\0".join(B.name for B in self).encode('utf-8'))
+        h.update(np.array([B.parentid for B in self], dtype=np.int32).tobytes())
+        if self.matrices is not None:
+            h.update((np.round(self.matrices, 4) + 0.).astype(np.float64).tobytes())  # '+ 0.' turns -0.0 into 0.0
+        self.skeleton_hash = h.hexdigest()
+        return self.skeleton_hash
+
+
+class BoneWeight:
+    __slots__ = ('bone_id', 'bone_weight')
+
+    def __init__(self, bone_id: int, bone_weight: float) -> None:
+        super().__init__()
+        self.bone_id = bone_id
+        self.bone_weight = bone_weight
+
+    def __str__(self) -> str:
+        return "%i, %.3f" % (self.bone_id, self.bone_weight)
+
+
+class SkinWeights:
+    """
+    Bone weights of every vertex, stored as 'compressed sparse rows' instead of a list of 'BoneWeight' objects per vertex.
+    The influences of vertex 'i' are 'bone_ids[offsets[i]:offsets[i + 1]]' and 'weights[offsets[i]:offsets[i + 1]]'.
+    """
+
+    def __init__(self, offsets: np.ndarray, bone_ids: np.ndarray, weights: np.ndarray) -> None:
+        super().__init__()
+        self.offsets: np.ndarray = offsets  # int32 (vertex_count + 1)
+        self.bone_ids: np.ndarray = bone_ids  # int32 (influence_count)
+        self.weights: np.ndarray = weights  # float32 (influence_count)
+
+    def __str__(self) -> str:
+        return "SkinWeights(vertices: %i, influences: %i)" % (len(self), len(self.bone_ids))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, vertex_index: int) -> (np.ndarray, np.ndarray):
+        start, end = self.offsets[vertex_index], self.offsets[vertex_index + 1]
+        return self.bone_ids[start:end], self.weights[start:end]
+
+    @staticmethod
+    def empty(vertex_count: int = 0):
+        return SkinWeights(np.zeros(vertex_count + 1, dtype=np.int32), np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32))
+
+    @staticmethod
+    def from_dense(bone_ids: np.ndarray, weights: np.ndarray):
+        """
+        'bone_ids' and 'weights' are (vertex_count, K) arrays - one slot per possible influence.
+        Once a zero weight is found the rest will also be zero, so that slot and every slot after it is dropped.
+        """
+        mask = np.logical_and.accumulate(weights > 0, axis=1)
+        offsets = np.zeros(len(weights) + 1, dtype=np.int32)
+        np.cumsum(mask.sum(axis=1), out=offsets[1:])
+        return SkinWeights(offsets, bone_ids[mask].astype(np.int32), weights[mask].astype(np.float32))
+
+    def splice(self, start: int, other):
+        """Returns new 'SkinWeights' where the vertices from 'start' onward are replaced by 'other'. Missing vertices have no weights."""
+        if start > len(self):
+            self = self.splice(len(self), SkinWeights.empty(start - len(self)))
+        end = min(start + len(other), len(self))
+        # Rows are rebuilt from the influence count of each vertex
+        counts = np.concatenate((np.diff(self.offsets[:start + 1]), np.diff(other.offsets), np.diff(self.offsets[end:])))
+        offsets = np.zeros(len(counts) + 1, dtype=np.int32)
+        np.cumsum(counts, out=offsets[1:])
+        head, tail = self.offsets[start], self.offsets[end]
+        return SkinWeights(offsets,
+                           np.concatenate((self.bone_ids[:head], other.bone_ids, self.bone_ids[tail:])),
+                           np.concatenate((self.weights[:head], other.weights, self.weights[tail:])))
+
+    def to_dense(self, vertex_count: int = None) -> (np.ndarray, np.ndarray):
+        """
+        Opposite of 'from_dense()'. Returns '(bone_ids, weights)' as (vertex_count, K) arrays, where K is the most influences any vertex has.
+        Unused slots have bone ID -1 and weight 0. Vertices past the end of these weights have no influences.
+        """
+        if vertex_count is None:
+            vertex_count = len(self)
+        counts = np.zeros(vertex_count, dtype=np.int32)
+        known = min(vertex_count, len(self))
+        counts[:known] = np.diff(self.offsets[:known + 1])
+        k = int(counts.max()) if vertex_count else 0
+        bone_ids = np.full((vertex_count, k), -1, dtype=np.int32)
+        weights = np.zeros((vertex_count, k), dtype=np.float32)
+        rows = np.repeat(np.arange(vertex_count), counts)
+        influences = np.arange(len(rows)) + self.offsets[0]
+        columns = influences - self.offsets[rows]
+        bone_ids[rows, columns] = self.bone_ids[influences]
+        weights[rows, columns] = self.weights[influences]
+        return bone_ids, weights
+
+    @staticmethod
+    def concatenate(skin_weights: Sequence, vertex_counts: Sequence[int]):
+        """
+        One 'SkinWeights' for blocks of vertices that follow each other. Block 'i' has 'vertex_counts[i]' vertices and the weights 'skin_weights[i]'.
+        A block can be None (no weights) or have weights for fewer vertices - Those vertices have no influences. Extra weights are dropped.
+        """
+        counts = np.zeros(sum(vertex_counts), dtype=np.int32)
+        bone_ids, weights = [np.empty(0, dtype=np.int32)], [np.empty(0, dtype=np.float32)]
+        start = 0
+        for block, vertex_count in zip(skin_weights, vertex_counts):
+            if block is not None:
+                known = min(vertex_count, len(block))
+                counts[start:start + known] = np.diff(block.offsets[:known + 1])
+                bone_ids.append(block.bone_ids[block.offsets[0]:block.offsets[known]])
+                weights.append(block.weights[block.offsets[0]:block.offsets[known]])
+            start += vertex_count
+        offsets = np.zeros(len(counts) + 1, dtype=np.int32)
+        np.cumsum(counts, out=offsets[1:])
+        return SkinWeights(offsets, np.concatenate(bone_ids), np.concatenate(weights))
+
+    def take(self, vertex_indices: np.ndarray):
+        """New 'SkinWeights' with the rows of 'vertex_indices', in that order. Indices past the end have no influences."""
+        vertex_indices = np.asarray(vertex_indices, dtype=np.int64)
+        known = vertex_indices < len(self)
+        starts = np.where(known, self.offsets[np.minimum(vertex_indices, len(self))], 0)
+        counts = np.where(known, self.offsets[np.minimum(vertex_indices + 1, len(self))] - starts, 0)
+        offsets = np.zeros(len(vertex_indices) + 1, dtype=np.int32)
+        np.cumsum(counts, out=offsets[1:])
+        influences = np.repeat(starts - offsets[:-1], counts) + np.arange(offsets[-1])
+        return SkinWeights(offsets, self.bone_ids[influences], self.weights[influences])
+
+    def get_weight_groups(self, vertex_count: int = None) -> Iterator[Tuple[int, float, np.ndarray]]:
+        """
+        Every influence grouped by (bone_id, weight). Yields '(bone_id, weight, vertex_indices)', sorted by bone ID.
+        Meant for 'VertexGroup.add(vertex_indices, weight, ...)' - One call per group instead of one per influence.
+        Only the first 'vertex_count' vertices are included (all of them if None).
+        """
+        if vertex_count is None or vertex_count > len(self):
+            vertex_count = len(self)
+        influence_count = int(self.offsets[vertex_count])
+        if influence_count == 0:
+            return
+        vertex_indices = np.repeat(np.arange(vertex_count, dtype=np.int32), np.diff(self.offsets[:vertex_count + 1]))
+        bone_ids = self.bone_ids[:influence_count]
+        weights = self.weights[:influence_count]
+        # IF a vertex lists the same bone twice THEN the last one wins, like assigning the weights one after another would
+        order = np.lexsort((np.arange(influence_count), vertex_indices, bone_ids))
+        last = np.ones(influence_count, dtype=bool)
+        last[:-1] = (bone_ids[order][1:] != bone_ids[order][:-1]) | (vertex_indices[order][1:] != vertex_indices[order][:-1])
+        keep = order[last]
+        bone_ids, weights, vertex_indices = bone_ids[keep], weights[keep], vertex_indices[keep]
+
+        order = np.lexsort((vertex_indices, weights, bone_ids))
+        bone_ids, weights, vertex_indices = bone_ids[order], weights[order], vertex_indices[order]
+        group_starts = np.flatnonzero(np.concatenate(((True,), (bone_ids[1:] != bone_ids[:-1]) | (weights[1:] != weights[:-1]))))
+        group_ends = np.append(group_starts[1:], len(bone_ids))
+        for start, end in zip(group_starts.tolist(), group_ends.tolist()):
+            yield int(bone_ids[start]), float(weights[start]), vertex_indices[start:end]
+
+    def get_bone_weights(self, vertex_index: int) -> List[BoneWeight]:
+        bone_ids, weights = self[vertex_index]
+        return [BoneWeight(bone_id, weight) for bone_id, weight in zip(bone_ids.tolist(), weights.tolist())]
+
+
+class TextureDirectory:
+    __slots__ = ('name', 'path')
+
+    def __init__(self, name: str, path: str):
+        super().__init__()
+        # This name should match the folder it was found in. For Maps it should be 'None'.
+        self.name: str = name
+        # This is the absolute path to the location that the textures are found in.
+        self.path: str = path
+
+    def __str__(self) -> str:
+        return "Texture Directory '%s'  < %s >" % (self.name, self.path)
+
+
+class Material:
+    __slots__ = ('name', 'enable_vertex_coloring', 'texture_diffuse_filename', 'texture_specular_filename',
+                 'texture_normal_filename', 'texture_emission_filename', 'texture_cyangreen_filename')
+
+    def __init__(self, name: str) -> None:
+        super().__init__()
+        self.name: str = name
+        self.enable_vertex_coloring: bool = False
+        # Diffuse Texture - C <-- Letter in the file name
+        self.texture_diffuse_filename: str = None
+        # Diffuse Texture - S
+        self.texture_specular_filename: str = None
+        # Diffuse Texture - N
+        self.texture_normal_filename: str = None
+        # Diffuse Texture - I
+        self.texture_emission_filename: str = None
+        # Diffuse Texture - M
+        self.texture_cyangreen_filename: str = None
+
+    def __str__(self) -> str:
+        return "Material(%s, vertex_coloring: %s)" % (self.name, self.enable_vertex_coloring)
+
+    def get_texture_filenames(self) -> Tuple[str, str, str, str, str]:
+        """Diffuse, Specular, Emission, Normal, M - Filenames are None for maps this Material does not use."""
+        return (self.texture_diffuse_filename, self.texture_specular_filename, self.texture_emission_filename,
+                self.texture_normal_filename, self.texture_cyangreen_filename)
+
+
+class Surface:
+    __slots__ = ('name', 'material_index', 'bounding_box')
+
+    def __init__(self, name: str, material_index: int) -> None:
+        super().__init__()
+        self.name: str = name
+        self.material_index: int = material_index
+        self.bounding_box: BoundingBox = None
+
+    def __str__(self) -> str:
+        return "Surface(%s,  %s)" % (self.name, self.material_index)
+
+
+class Vertex:
+    """A single vertex. The model keeps vertices in buffers - This is only built by 'PreBlender_Model.get_vertex()' for debugging."""
+    __slots__ = ('position', 'uv', 'rgba', 'normal', 'boneWeights')
+
+    def __init__(self, x: float, y: float, z: float, u: float, v: float, r: float, g: float, b: float, a: float, nx: float, ny: float, nz: float) -> None:
+        # This is able to have a second set of Normals - though, I do not know for what purpose
+        super().__init__()
+        self.position: (float, float, float) = (x, y, z)
+        self.uv: (float, float) = (u, v)
+        self.rgba: (float, float, float, float) = (r, g, b, a)
+        self.normal: (float, float, float) = (nx, ny, nz)
+        self.boneWeights: list[BoneWeight,] = []
+
+
+class Face:
+    """A single triangle. The model keeps faces in buffers - This is only built by 'PreBlender_Model.get_face()' for debugging."""
+    __slots__ = ('indices', 'surface_index')
+
+    def __init__(self, indices: (), surface_index: int) -> None:
+        super().__init__()
+        self.indices: (int,) = indices  # indices
+        self.surface_index: int = surface_index
+
+    def __str__(self) -> str:
+        return "(%04i, %04i, %04i)  %i" % (self.indices[0], self.indices[1], self.indices[2], self.surface_index)
+
+
+class FaceAnm:
+    def __init__(self, face_anm: str) -> None:
+        super().__init__()
+        self.face_anm: str = face_anm  # Todo: for now just a simple long string
+
+
+class MotionFrame:
+    def __init__(self, frame_position: float, data: List[float]) -> None:
+        super().__init__()
+        self.frame_position = frame_position
+        self.data = data
+
+    def __str__(self) -> str:
+        return "%s: (%s)" % (str(self.frame_position).rjust(6), ", ".join("%.4f" % a for a in self.data))
+
+
+class MotionType:
+    def __init__(self) -> None:
+        super().__init__()
+        self.motion_data: List[MotionFrame] = []
+
+    def __str__(self) -> str:
+        return "MF"
+
+
+class MotionBone:
+    def __init__(self, bone_name: str) -> None:
+        super().__init__()
+        self.bone_name = bone_name
+        self.motion_types: List[MotionType] = []
+
+    def __str__(self) -> str:
+        return self.bone_name
+
+
+class Motion:
+    def __init__(self, name: str, duration: float) -> None:
+        super().__init__()
+        self.name = name
+        self.duration = duration
+        self.motion_bones: List[MotionBone] = []
+
+    def __str__(self) -> str:
+        return "%s :: %s :: #bones:%s" % (self.name, self.duration, len(self.motion_bones))
+
+
+class BufferView:
+    """Read-only list-like view that builds an object for a buffer row when it is accessed. Only meant for debugging."""
+    __slots__ = ('_get_count', '_get_item')
+
+    def __init__(self, get_count, get_item) -> None:
+        super().__init__()
+        self._get_count = get_count
+        self._get_item = get_item
+
+    def __len__(self) -> int:
+        return self._get_count()
+
+    def __getitem__(self, index):
+        count = self._get_count()
+        if isinstance(index, slice):
+            return [self._get_item(i) for i in range(*index.indices(count))]
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("index out of range: %i" % index)
+        return self._get_item(index)
+
+
+class MeshSection:
+    """
+    One Mesh of a model, on its own. Yielded by 'parse_ism2.iter_mesh_sections()' so huge files can be handled one Mesh at a time.
+    'face_indices' and 'skin_weights' index into the buffers of this section, not into the whole model.
+    'base_vertex' is where the first vertex of this section is (or would be) in the whole model.
+    """
+    __slots__ = ('base_vertex', 'positions', 'normals', 'uvs', 'colors', 'skin_weights', 'face_indices', 'face_surface_indices', 'bounding_box')
+
+    def __init__(self, base_vertex: int) -> None:
+        super().__init__()
+        self.base_vertex: int = base_vertex
+        self.positions: np.ndarray = np.empty((0, 3), dtype=np.float32)
+        self.normals: np.ndarray = np.empty((0, 3), dtype=np.float32)
+        self.uvs: np.ndarray = np.empty((0, 2), dtype=np.float32)
+        self.colors: np.ndarray = np.empty((0, 4), dtype=np.float32)
+        self.skin_weights: SkinWeights = None
+        self.face_indices: np.ndarray = np.empty((0, 3), dtype=np.int32)
+        self.face_surface_indices: np.ndarray = np.empty(0, dtype=np.int32)
+        self.bounding_box: BoundingBox = None
+
+    def __str__(self) -> str:
+        return "Base Vertex: %i  Vertices: %i  Faces: %i" % (self.base_vertex, self.get_vertex_count(), self.get_face_count())
+
+    def get_vertex_count(self) -> int:
+        return len(self.positions)
+
+    def get_face_count(self) -> int:
+        return len(self.face_indices)
+
+    def add_vertices(self, positions: np.ndarray, normals: np.ndarray, uvs: np.ndarray, colors: np.ndarray):
+        self.positions = np.concatenate((self.positions, np.asarray(positions, dtype=np.float32)))
+        self.normals = np.concatenate((self.normals, np.asarray(normals, dtype=np.float32)))
+        self.uvs = np.concatenate((self.uvs, np.asarray(uvs, dtype=np.float32)))
+        self.colors = np.concatenate((self.colors, np.asarray(colors, dtype=np.float32)))
+
+    def set_faces(self, face_indices: np.ndarray, face_surface_indices: np.ndarray):
+        self.face_indices = np.asarray(face_indices, dtype=np.int32).reshape(-1, 3)
+        self.face_surface_indices = np.asarray(face_surface_indices, dtype=np.int32)
+
+
+def find_duplicate_faces(face_indices: np.ndarray) -> np.ndarray:
+    """
+    True for every triangle that uses the same 3 vertices as an earlier triangle, in any order (double sided geometry).
+    Blender can not have both, so one of them needs its own vertices.
+    """
+    if len(face_indices) == 0:
+        return np.zeros(0, dtype=bool)
+    face_keys = np.sort(face_indices, axis=1).astype(np.int64)
+    vertex_limit = int(face_keys.max()) + 1
+    if vertex_limit < 1 << 21:  # All 3 indices fit into one 64 bit key, which sorts much faster than rows
+        face_keys = (face_keys[:, 0] * vertex_limit + face_keys[:, 1]) * vertex_limit + face_keys[:, 2]
+    else:
+        face_keys = face_keys.view(np.dtype((np.void, face_keys.itemsize * 3))).ravel()
+    order = np.argsort(face_keys, kind='stable')  # Stable, so the earliest face of each key comes first
+    sorted_keys = face_keys[order]
+    duplicate = np.empty(len(face_keys), dtype=bool)
+    duplicate[order[0]] = False
+    duplicate[order[1:]] = sorted_keys[1:] == sorted_keys[:-1]
+    return duplicate
+
+
+class PreBlender_Model:
+    def __init__(self, name: str) -> None:
+        super().__init__()
+        self.name: str = name
+
+        # Buffers
+        self.strings: StringTable = StringTable()
+        self.texture_directories: List[TextureDirectory] = []
+        self.textures: dict = {}
+        self.materials: List[Material] = []
+        self.surfaces: List[Surface] = []
+        # Symbol Tables - Name lookups without searching the lists
+        self.materials_by_name: NameIndex = NameIndex(self.materials)
+        self.surfaces_by_name: NameIndex = NameIndex(self.surfaces)
+        # Vertex Buffers - Row 'i' of every buffer belongs to vertex 'i'
+        self.positions: np.ndarray = np.empty((0, 3), dtype=np.float32)
+        self.normals: np.ndarray = np.empty((0, 3), dtype=np.float32)
+        self.uvs: np.ndarray = np.empty((0, 2), dtype=np.float32)
+        self.colors: np.ndarray = np.empty((0, 4), dtype=np.float32)
+        self.skin_weights: SkinWeights = None
+        # Face Buffers - Row 'i' of every buffer belongs to triangle 'i'
+        self.face_indices: np.ndarray = np.empty((0, 3), dtype=np.int32)
+        self.face_surface_indices: np.ndarray = np.empty(0, dtype=np.int32)
+        self.bounding_box: BoundingBox = None
+        self.bones: Bones = None
+        self.motions: List[Motion] = []
+        self.face_anm: FaceAnm = None
+
+    def getName(self):
+        return self.name
+
+    @property
+    def vertices(self) -> BufferView:
+        """Compatibility view - 'model.vertices[i]' is a 'Vertex'. Use the buffers for anything that is not debugging."""
+        return BufferView(self.get_vertex_count, self.get_vertex)
+
+    @property
+    def faces(self) -> BufferView:
+        """Compatibility view - 'model.faces[i]' is a 'Face'. Use the buffers for anything that is not debugging."""
+        return BufferView(self.get_face_count, self.get_face)
+
+    def get_vertex_count(self) -> int:
+        return len(self.positions)
+
+    def add_vertices(self, positions: np.ndarray, normals: np.ndarray, uvs: np.ndarray, colors: np.ndarray):
+        self.positions = np.concatenate((self.positions, np.asarray(positions, dtype=np.float32)))
+        self.normals = np.concatenate((self.normals, np.asarray(normals, dtype=np.float32)))
+        self.uvs = np.concatenate((self.uvs, np.asarray(uvs, dtype=np.float32)))
+        self.colors = np.concatenate((self.colors, np.asarray(colors, dtype=np.float32)))
+
+    def set_skin_weights(self, start_vertex_index: int, skin_weights: SkinWeights):
+        """Bone weights for the vertices from 'start_vertex_index' onward. Replaces any that were already set."""
+        if self.skin_weights is None:
+            self.skin_weights = SkinWeights.empty()
+        self.skin_weights = self.skin_weights.splice(start_vertex_index, skin_weights)
+
+    def set_faces(self, face_indices: np.ndarray, face_surface_indices: np.ndarray):
+        self.face_indices = np.asarray(face_indices, dtype=np.int32).reshape(-1, 3)
+        self.face_surface_indices = np.asarray(face_surface_indices, dtype=np.int32)
+
+    def add_mesh_section_vertices(self, mesh_section: MeshSection):
+        """
+        Appends the vertices and bone weights of 'mesh_section'. Its 'base_vertex' must be the current vertex count.
+        The faces are not added - They must be shifted by 'base_vertex' and are set all at once with 'set_faces()'.
+        """
+        self.add_mesh_sections([mesh_section])
+
+    def add_mesh_sections(self, mesh_sections: List[MeshSection]):
+        """
+        Appends the vertices and bone weights of every Mesh in 'mesh_sections', which must follow each other from the current vertex count.
+        Each buffer is copied once for all of them - Adding them one at a time copies the whole model again for every Mesh.
+        The faces are not added, like 'add_mesh_section_vertices()'.
+        """
+        if len(mesh_sections) == 0:
+            return
+        vertex_count = self.get_vertex_count()
+        self.positions = np.concatenate([self.positions] + [np.asarray(m.positions, dtype=np.float32) for m in mesh_sections])
+        self.normals = np.concatenate([self.normals] + [np.asarray(m.normals, dtype=np.float32) for m in mesh_sections])
+        self.uvs = np.concatenate([self.uvs] + [np.asarray(m.uvs, dtype=np.float32) for m in mesh_sections])
+        self.colors = np.concatenate([self.colors] + [np.asarray(m.colors, dtype=np.float32) for m in mesh_sections])
+        # IF any Mesh has bone weights THEN every vertex gets a row, even the ones without weights
+        if self.skin_weights is not None or any(m.skin_weights is not None for m in mesh_sections):
+            self.skin_weights = SkinWeights.concatenate([self.skin_weights] + [m.skin_weights for m in mesh_sections],
+                                                        [vertex_count] + [m.get_vertex_count() for m in mesh_sections])
+
+    def merge_vertices(self) -> int:  # returns how many vertices were removed
+        """
+        Welds vertices that are identical in every attribute: position, normal, UV, color and bone weights.
+        MOST ISM2 meshes are disconnected triangles, so this usually removes about two thirds of the vertices.
+        Every vertex is packed into one key and the keys are sorted once, instead of comparing every pair of vertices.
+        Double sided geometry survives:
+          IF welding makes a triangle use the same 3 vertices as an earlier one THEN it keeps copies of its own vertices.
+        """
+        vertex_count = self.get_vertex_count()
+        if vertex_count == 0:
+            return 0
+
+        # Keys are compared bit for bit. Adding 0 turns -0.0 into 0.0 so they match.
+        float_columns = [self.positions, self.normals, self.uvs, self.colors]
+        if self.skin_weights is not None:
+            bone_ids, weights = self.skin_weights.to_dense(vertex_count)
+            float_columns.append(weights)
+        keys = [(np.concatenate(float_columns, axis=1).astype(np.float32) + np.float32(0)).view(np.uint32)]
+        if self.skin_weights is not None:
+            keys.append(bone_ids.view(np.uint32))
+        keys = np.ascontiguousarray(np.concatenate(keys, axis=1))
+        _, first_vertices, vertex_keys = np.unique(keys.view(np.dtype((np.void, keys.itemsize * keys.shape[1]))).ravel(),
+                                                   return_index=True, return_inverse=True)
+
+        # Keep the vertices in the order they were first used
+        order = np.argsort(first_vertices)
+        new_index_of_key = np.empty(len(order), dtype=np.int32)
+        new_index_of_key[order] = np.arange(len(order), dtype=np.int32)
+        kept_vertices = first_vertices[order]
+        face_indices = new_index_of_key[vertex_keys.ravel()][self.face_indices]
+
+        self.positions = self.positions[kept_vertices]
+        self.normals = self.normals[kept_vertices]
+        self.uvs = self.uvs[kept_vertices]
+        self.colors = self.colors[kept_vertices]
+        if self.skin_weights is not None:
+            self.skin_weights = self.skin_weights.take(kept_vertices)
+        self.face_indices = face_indices
+
+        # Double sided geometry - Faces that collapsed onto an earlier face get their own vertices back
+        self.separate_faces(find_duplicate_faces(face_indices))
+        return vertex_count - self.get_vertex_count()
+
+    def separate_faces(self, faces: np.ndarray):
+        """Gives every face in 'faces' (a mask or a list of face indices) its own copies of its 3 vertices."""
+        copied_vertices = self.face_indices[faces].ravel()
+        if len(copied_vertices) == 0:
+            return
+        vertex_count = self.get_vertex_count()
+        face_indices = self.face_indices.copy()
+        face_indices[faces] = (vertex_count + np.arange(len(copied_vertices), dtype=np.int32)).reshape(-1, 3)
+        self.face_indices = face_indices
+        self.add_vertices(self.positions[copied_vertices], self.normals[copied_vertices], self.uvs[copied_vertices], self.colors[copied_vertices])
+        if self.skin_weights is not None:
+            self.skin_weights = self.skin_weights.splice(vertex_count, self.skin_weights.take(copied_vertices))
+
+    def separate_problem_faces(self) -> int:  # returns how many faces were given their own vertices
+        """
+        Blender rejects a triangle that uses a vertex twice (degenerate) or the same 3 vertices as another triangle (double sided geometry).
+        Instead of dropping those triangles, they get their own copies of their vertices. Every face is kept and so are the normals.
+        Checked for all faces at once, so the mesh can be built without trying each face.
+        """
+        if len(self.face_indices) == 0:
+            return 0
+        f = self.face_indices
+        problem_faces = (f[:, 0] == f[:, 1]) | (f[:, 1] == f[:, 2]) | (f[:, 2] == f[:, 0]) | find_duplicate_faces(f)
+        self.separate_faces(problem_faces)
+        return int(np.count_nonzero(problem_faces))
+
+    def detect_vertex_coloring(self):
+        """
+        IF any vertex-color-value of a surface's triangles is not 1 THEN vertex coloring should be enabled in Blender for that surface's material.
+        One pass over the whole color buffer instead of a check per triangle corner.
+        """
+        if len(self.face_indices) == 0:
+            return
+        vertex_has_color = (self.colors != 1).any(axis=1)
+        face_has_color = vertex_has_color[self.face_indices].any(axis=1)
+        for surface_index in np.unique(self.face_surface_indices[face_has_color]).tolist():
+            if not 0 <= surface_index < len(self.surfaces):  # No surfaces, or the face points past them - There is no material to enable it on
+                continue
+            material_index = self.surfaces[surface_index].material_index
+            if 0 <= material_index < len(self.materials):  # Some surface have no material assigned SO the material_index will be -1
+                self.materials[material_index].enable_vertex_coloring = True
+
+    def get_face_count(self) -> int:
+        return len(self.face_indices)
+
+    def get_face(self, face_index: int) -> Face:
+        """A 'Face' object built from the buffers. Only meant for debugging."""
+        return Face(tuple(self.face_indices[face_index].tolist()), int(self.face_surface_indices[face_index]))
+
+    def get_vertex(self, vertex_index: int) -> Vertex:
+        """A 'Vertex' object built from the buffers. Only meant for debugging."""
+        vertex = Vertex(*self.positions[vertex_index].tolist(), *self.uvs[vertex_index].tolist(),
+                        *self.colors[vertex_index].tolist(), *self.normals[vertex_index].tolist())
+        if self.skin_weights is not None and vertex_index < len(self.skin_weights):
+            vertex.boneWeights = self.skin_weights.get_bone_weights(vertex_index)
+        return vertex
+
+    def getMaterialByName(self, name: str) -> int:  # returns -1 if there is no material with that name
+        return self.materials_by_name.get(name)
+
+    def getSurfaceByName(self, name: str) -> int:  # returns -1 if there is no surface with that name
+        return self.surfaces_by_name.get(name)
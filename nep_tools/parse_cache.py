@@ -0,0 +1,299 @@
+"""
+PARSE CACHE
+
+Keeps decoded 'PreBlender_Model's on disk so re-importing the same file does not parse it again.
+
+Every entry is a single NumPy file ('.npz'):
+  • The vertex, face and skin weight buffers, the string table and the bone matrices are stored as arrays.
+    Entries are compressed with a fast zlib level ('compress') - About half the size. Turn it off to trade disk space for load time.
+  • Everything else (names, materials, surfaces, bones, ...) is small and is stored as one JSON 'metadata' array.
+    Nothing is pickled - Other Blender instances (or anyone) can write to the cache directory, and loading an entry must not run code.
+
+An entry is found by a key made from:
+  • The file path, size and modification time (and optionally a hash of the whole file)
+  • The options it was parsed with
+  • The modification times of the texture directories and 'face.anm' - The parser looks at which textures exist, so adding a PNG must miss
+  • CACHE_FORMAT_VERSION - Bump it whenever the parser or 'PreBlender_Model' changes what a model looks like
+
+Multiple Blender instances can share a cache directory:
+  • Entries are written to a temporary file and moved into place with 'os.replace()', so a reader never sees half an entry.
+  • Anything that cannot be read is treated as a miss.
+  • Loading an entry touches its modification time. When the cache is over 'max_bytes', the least recently used entries are deleted first.
+"""
+
+import hashlib
+import io
+import json
+import os
+import sys
+import tempfile
+import zipfile
+from typing import List, Tuple
+
+import numpy as np
+
+import nep_tools
+from nep_tools import model_types
+from nep_tools.parse_ism2 import get_texture_directory_candidates
+from nep_tools.utils.matrix4f import Matrix4f
+
+CACHE_FORMAT_VERSION = 6
+CACHE_FILE_EXTENSION = ".npz"
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1 GiB
+CACHE_COMPRESS_LEVEL = 1  # zlib level - Higher levels barely shrink float data but are many times slower
+
+# Buffers of 'PreBlender_Model' that are stored as arrays (the rest is JSON - See '_model_to_metadata()')
+MODEL_ARRAY_NAMES = ('positions', 'normals', 'uvs', 'colors', 'face_indices', 'face_surface_indices')
+SKIN_WEIGHT_ARRAY_NAMES = ('offsets', 'bone_ids', 'weights')
+
+
+def get_default_cache_directory() -> str:
+    if sys.platform == "win32":
+        root = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+    elif sys.platform == "darwin":
+        root = os.path.join(os.path.expanduser("~"), "Library", "Caches")
+    else:
+        root = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(root, "nep_tools", "ism2")
+
+
+def _stat_key(path: str) -> Tuple:  # (size, mtime) or None if the path does not exist
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+def _option_key(value):
+    if hasattr(value, "getDataAsFloatArray"):  # Matrix4f
+        return tuple(value.getDataAsFloatArray())
+    return value
+
+
+def _hash_file(path: str) -> str:
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _bounding_box_to_metadata(bounding_box: model_types.BoundingBox) -> list:
+    if bounding_box is None:
+        return None
+    return [float(getattr(bounding_box, name)) for name in model_types.BoundingBox.__slots__]
+
+
+def _bounding_box_from_metadata(values: list) -> model_types.BoundingBox:
+    return model_types.BoundingBox(*values) if values is not None else None
+
+
+def _model_to_metadata(model: model_types.PreBlender_Model) -> dict:
+    """Everything that is not stored as an array, as plain JSON types. Opposite of '_model_from_metadata()'."""
+    metadata = {
+        "name": model.name,
+        "texture_directories": [[D.name, D.path] for D in model.texture_directories],
+        "textures": model.textures,
+        "materials": [[M.name, M.enable_vertex_coloring, M.texture_diffuse_filename, M.texture_specular_filename,
+                       M.texture_normal_filename, M.texture_emission_filename, M.texture_cyangreen_filename] for M in model.materials],
+        "surfaces": [[S.name, S.material_index, _bounding_box_to_metadata(S.bounding_box)] for S in model.surfaces],
+        "bounding_box": _bounding_box_to_metadata(model.bounding_box),
+        "motions": [[motion.name, motion.duration,
+                     [[motion_bone.bone_name,
+                       [[[float(frame.frame_position), [float(a) for a in frame.data]] for frame in motion_type.motion_data] for motion_type in motion_bone.motion_types]]
+                      for motion_bone in motion.motion_bones]] for motion in model.motions],
+        "face_anm": model.face_anm.face_anm if model.face_anm is not None else None,
+        "bones": None,
+    }
+    if model.bones is not None:
+        metadata["bones"] = {
+            "bones": [[B.name, B.bone_id, B.bone_index, B.parentid] for B in model.bones],
+            "bones_by_id": model.bones.bones_by_id,
+            "skeleton_hash": model.bones.skeleton_hash,
+        }
+    return metadata
+
+
+def _model_from_metadata(metadata: dict, data) -> model_types.PreBlender_Model:
+    """'data' holds the arrays of the entry. Any missing or malformed value raises, which 'ParseCache.load()' treats as a miss."""
+    model = model_types.PreBlender_Model(str(metadata["name"]))
+    model.strings = model_types.StringTable(data['string_data'].tobytes(), data['string_offsets'].tolist())
+    model.texture_directories.extend(model_types.TextureDirectory(name, path) for name, path in metadata["texture_directories"])
+    model.textures.update(metadata["textures"])
+    for name, enable_vertex_coloring, diffuse, specular, normal, emission, cyangreen in metadata["materials"]:
+        M = model_types.Material(name)
+        M.enable_vertex_coloring = bool(enable_vertex_coloring)
+        M.texture_diffuse_filename, M.texture_specular_filename = diffuse, specular
+        M.texture_normal_filename, M.texture_emission_filename, M.texture_cyangreen_filename = normal, emission, cyangreen
+        model.materials.append(M)
+    for name, material_index, bounding_box in metadata["surfaces"]:
+        S = model_types.Surface(name, int(material_index))
+        S.bounding_box = _bounding_box_from_metadata(bounding_box)
+        model.surfaces.append(S)
+    model.bounding_box = _bounding_box_from_metadata(metadata["bounding_box"])
+    for name, duration, motion_bones in metadata["motions"]:
+        motion = model_types.Motion(name, duration)
+        for bone_name, motion_types in motion_bones:
+            motion_bone = model_types.MotionBone(bone_name)
+            for frames in motion_types:
+                motion_type = model_types.MotionType()
+                motion_type.motion_data.extend(model_types.MotionFrame(frame_position, frame_data) for frame_position, frame_data in frames)
+                motion_bone.motion_types.append(motion_type)
+            motion.motion_bones.append(motion_bone)
+        model.motions.append(motion)
+    if metadata["face_anm"] is not None:
+        model.face_anm = model_types.FaceAnm(metadata["face_anm"])
+
+    bones_metadata = metadata["bones"]
+    if bones_metadata is not None:
+        bones_by_id = bones_metadata["bones_by_id"]
+        model.bones = model_types.Bones(len(bones_by_id) if bones_by_id is not None else 0)
+        matrices = data['bone_matrices'] if 'bone_matrices' in data else None
+        for row, (name, bone_id, bone_index, parentid) in enumerate(bones_metadata["bones"]):
+            B = model_types.Bone(name, int(bone_id), int(bone_index))
+            B.parentid = int(parentid)
+            if matrices is not None:
+                B.transform = Matrix4f.from_array(matrices[row])  # Row 'i' belongs to the i-th bone
+            model.bones.append(B)
+        model.bones.bones_by_id = bones_by_id  # Already trimmed
+        model.bones.matrices = matrices
+        model.bones.skeleton_hash = bones_metadata["skeleton_hash"]
+
+    for name in MODEL_ARRAY_NAMES:
+        setattr(model, name, data[name])
+    if 'skin_offsets' in data:
+        model.skin_weights = model_types.SkinWeights(*(data['skin_' + name] for name in SKIN_WEIGHT_ARRAY_NAMES))
+    return model
+
+
+class ParseCache:
+    def __init__(self, directory: str = None, max_bytes: int = DEFAULT_MAX_BYTES, use_content_hash: bool = False, compress: bool = True) -> None:
+        super().__init__()
+        self.directory: str = directory or get_default_cache_directory()
+        self.max_bytes: int = max_bytes
+        self.compress: bool = compress
+        self.use_content_hash: bool = use_content_hash  # Slower keys, but survives files being copied around with new modification times
+
+    def get_key(self, filedirectory: str, filename: str, **read_ism2_options) -> str:  # returns None if the file does not exist
+        filedirectory = filedirectory.rstrip('\\')  # Same as 'open_ism2()'
+        filepath = os.path.normcase(os.path.abspath(os.path.join(filedirectory, filename)))
+        file_stat = _stat_key(filepath)
+        if file_stat is None:
+            return None
+
+        texture_stats = []
+        for texture_directory in get_texture_directory_candidates(filedirectory):
+            texture_stats.append(_stat_key(texture_directory))
+            if texture_stats[-1] is not None:
+                try:
+                    with os.scandir(texture_directory) as scanner:
+                        entries = sorted(scanner, key=lambda e: e.name)
+                    texture_stats.extend((entry.name, _stat_key(entry.path)) for entry in entries if entry.is_dir())
+                except OSError:  # Not a directory, or cannot be listed - Keep looking like the parser does, a miss is better than an error
+                    continue
+                break  # Only the first existing directory is used by the parser
+
+        key = [CACHE_FORMAT_VERSION, filepath, file_stat, texture_stats,
+               sorted((name, _option_key(value)) for name, value in read_ism2_options.items())]
+        if read_ism2_options.get("option_parse_face_anm"):
+            key.append(_stat_key(os.path.join(filedirectory, "face.anm")))
+        if self.use_content_hash:
+            key.append(_hash_file(filepath))
+        return hashlib.sha256(repr(key).encode('utf8')).hexdigest()
+
+    def get_entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + CACHE_FILE_EXTENSION)
+
+    def load(self, key: str) -> model_types.PreBlender_Model:  # returns None on a miss
+        if key is None:
+            return None
+        path = self.get_entry_path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                model: model_types.PreBlender_Model = _model_from_metadata(json.loads(data['metadata'].tobytes().decode('utf8')), data)
+        except FileNotFoundError:
+            return None
+        except Exception:  # Partly written by an old version, damaged, ... - Just parse the file again
+            if nep_tools.debug:
+                print("Parse Cache: Unreadable entry < %s >" % path)
+            return None
+        try:
+            os.utime(path)  # Most recently used
+        except OSError:
+            pass
+        print("ISM2 (cached) < %s >" % model.name)
+        return model
+
+    def store(self, key: str, model: model_types.PreBlender_Model):
+        if key is None:
+            return
+        arrays = {name: getattr(model, name) for name in MODEL_ARRAY_NAMES}
+        if model.skin_weights is not None:
+            arrays.update(('skin_' + name, getattr(model.skin_weights, name)) for name in SKIN_WEIGHT_ARRAY_NAMES)
+        arrays['string_data'] = np.frombuffer(model.strings.data, dtype=np.uint8)
+        arrays['string_offsets'] = np.array(model.strings.offsets, dtype=np.int64)
+        if model.bones is not None and model.bones.matrices is not None:
+            arrays['bone_matrices'] = model.bones.matrices
+        arrays['metadata'] = np.frombuffer(json.dumps(_model_to_metadata(model)).encode('utf8'), dtype=np.uint8)
+
+        # Same layout as 'np.savez()' / 'np.savez_compressed()', but with a fast compression level - Storing must not cost more than parsing
+        buffer = io.BytesIO()
+        compression = zipfile.ZIP_DEFLATED if self.compress else zipfile.ZIP_STORED
+        with zipfile.ZipFile(buffer, 'w', compression=compression, compresslevel=CACHE_COMPRESS_LEVEL if self.compress else None) as archive:
+            for name, array in arrays.items():
+                with archive.open(name + ".npy", 'w', force_zip64=True) as f:
+                    np.lib.format.write_array(f, np.asanyarray(array), allow_pickle=False)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(buffer.getbuffer())
+                os.replace(temp_path, self.get_entry_path(key))  # Atomic - Readers see the old entry or the new one
+            except OSError:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+                raise
+        except OSError:  # Read-only, full, another instance holds the entry open, ... - The cache is optional
+            if nep_tools.debug:
+                print("Parse Cache: Could not store < %s >" % model.name)
+
+    def get_entries(self) -> List[Tuple[float, int, str]]:  # (mtime, size, path) of every entry, oldest first
+        entries = []
+        try:
+            scanner = os.scandir(self.directory)
+        except OSError:
+            return entries
+        with scanner:
+            for entry in scanner:
+                if entry.name.endswith(CACHE_FILE_EXTENSION):
+                    try:
+                        st = entry.stat()
+                    except OSError:  # Deleted by another instance
+                        continue
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+        entries.sort()
+        return entries
+
+    def evict(self):
+        """Deletes the least recently used entries until the cache fits in 'max_bytes'."""
+        entries = self.get_entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:  # Already deleted, or open in another instance (Windows)
+                continue
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.get_entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
@@ -0,0 +1,1396 @@
+"""
+Author: LilacDogoo
+
+This holds all the capabilities of reading ISM2 files into a 'PreBlender_Model' object.
+Nothing in here depends on Blender. It runs in plain Python (with NumPy), in worker processes and in benchmarks.
+The Blender side of importing lives in 'file_ism2.py' and 'import_to_blender.py'.
+
+CREDIT: Random Talking Brush, howie
+This script was written by me (LilacDogoo) based on a 3ds Max script written by Random Talking Bush.
+The 3ds Max script written by Random Talking Bush is based on the LightWave importer by howfie.
+If you use it, consider giving thanks to Idea Factory, Compile Heart, howfie, Random Talking Bush, and myself.
+
+
+REMEMBER: I did not automate this completely, as of yet.
+    You must do this yourself:
+      • extract 'pac' file collections
+      • extract 'cl3' file collections
+      • convert 'tid' files to 'png' files
+    Blender should do the rest from there. (aside from some face problems)
+    Some links to help you:
+      • Hyperdimension Neptunia Re;Birth 1 & 2  >  https://steamcommunity.com/sharedfiles/filedetails/?id=453717187
+      • Megadimension Neptunia Victory II  >  https://github.com/MysteryDash/Dash.FileFormats
+
+About the face problem:
+    The UV's are there. So; assigning the face texture and transforming the UV's to fit should be easy to do manually.
+"""
+
+import multiprocessing
+import os
+import traceback
+import math
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, BinaryIO, Iterator, Tuple
+
+import numpy as np
+
+import nep_tools
+from nep_tools import model_types
+from nep_tools.utils import binary_file
+from nep_tools.utils.file_index import FileIndex
+from nep_tools.utils.matrix4f import Matrix4f, evaluate_hierarchy
+
+
+def get_vertex_dtype(vertex_size: int, big_endian: bool) -> np.dtype:
+    """
+    Layout of a 'vertex_type 0x1' vertex. 'vertex_size' becomes the stride between vertices.
+    0x00  3 floats       Position
+    0x0C  3 half floats  Normal
+    0x12  1 half float   U
+    0x14  3 half floats  Normal 2 - I don't currently use this or even know what this is used for so it is skipped.
+    0x1A  1 half float   V
+    0x1C  4 bytes        Vertex Color (RGBA)
+    """
+    e = '>' if big_endian else '<'
+    return np.dtype({'names': ['position', 'normal', 'u', 'v', 'rgba'],
+                     'formats': [(e + 'f4', 3), (e + 'f2', 3), e + 'f2', e + 'f2', ('u1', 4)],
+                     'offsets': [0x00, 0x0C, 0x12, 0x1A, 0x1C],
+                     'itemsize': max(vertex_size, 0x20)})
+
+
+# Bone Weight layouts: BONE_WEIGHT_LAYOUTS_BY_VERSION[versionA][vertex_size] = (bone_id_type, weight_type, slot_count, weights_offset)
+# Anything after the weights, up to 'vertex_size', is unused padding.
+BONE_WEIGHT_LAYOUTS_BY_VERSION = {
+    2: {0x20: ('u2', 'f4', 4, 0x08),
+        0x30: ('u2', 'f4', 8, 0x10)},
+    1: {0x20: ('u1', 'f4', 4, 0x04),
+        0x10: ('u1', 'f2', 4, 0x04)},
+}
+
+
+def get_bone_weight_dtype(versionA: int, vertex_size: int, big_endian: bool) -> np.dtype:  # returns None for unknown layouts
+    layout = BONE_WEIGHT_LAYOUTS_BY_VERSION.get(versionA, {}).get(vertex_size)
+    if layout is None:
+        return None
+    bone_id_type, weight_type, slot_count, weights_offset = layout
+    e = '>' if big_endian else '<'
+    return np.dtype({'names': ['bone_ids', 'weights'],
+                     'formats': [(e + bone_id_type, slot_count), (e + weight_type, slot_count)],
+                     'offsets': [0x00, weights_offset],
+                     'itemsize': vertex_size})
+
+
+# Face Loop Types: FACE_INDEX_TYPES[face_loops_type] = vertex index type
+FACE_INDEX_TYPES = {
+    0x05: 'u2',
+    0x07: 'u4',
+}
+
+
+def get_face_index_dtype(face_loops_type: int, big_endian: bool) -> np.dtype:  # returns None for unknown Face Loop Types
+    face_index_type = FACE_INDEX_TYPES.get(face_loops_type)
+    if face_index_type is None:
+        return None
+    return np.dtype(('>' if big_endian else '<') + face_index_type)
+
+
+# File Section Types
+# ------------------
+# ( ) = Not Implemented  - No work has been done
+# (T) = Text output only - Data is exported to a human-readable file
+# (E) = Error Prone      - Functions but buggy
+# (G) = Good             - Functions without guarantee
+# (C) = Complete         - Fully Functional and believed to be bug free
+# ------------------
+# 0x03 003 (G) Armature Data Block (Surfaces are in here for some reason)
+# 0x0B 011 (G) Object-Mesh
+# 0x21 033 (C) Strings
+# 0x2E 046 (C) Textures
+# 0x32 050 ( ) <unknown>
+# 0x34 052 ( ) Armature Animations
+# 0x61 097 (G) Materials
+# 0x62 098 (G) FX Shader Nodes
+# 0x82 130 ( ) <unknown>
+FILE_SECTION_NAMES = {
+    0x03: "Armature",
+    0x0B: "Object-Mesh",
+    0x21: "Strings",
+    0x2E: "Textures",
+    0x32: "<unknown>",
+    0x34: "Armature Animations",
+    0x61: "Materials",
+    0x62: "FX Shader Nodes",
+    0x82: "<unknown>",
+}
+
+# Which File Sections must be decoded before a File Section can be decoded
+#   Textures, Materials, Surfaces and Meshes all look up names in the Strings.
+#   Materials look up Textures. Surfaces (in the Armature) look up Materials. Meshes look up Surfaces.
+FILE_SECTION_DEPENDENCIES = {
+    0x2E: (0x21,),
+    0x61: (0x21, 0x2E),
+    0x03: (0x21, 0x61),
+    0x0B: (0x21, 0x03),
+}
+
+
+def get_texture_directory_candidates(filedirectory: str) -> Tuple[str, str, str]:
+    """Where the textures of an ISM2 file can be, in the order they are checked: (Characters, Maps in VII, Maps in ReBirth 3)"""
+    texture_directory_characters: str = os.path.join(filedirectory, "texture")
+    texture_directory_maps_VII: str = os.path.join(os.path.dirname(os.path.dirname(filedirectory)), "texture")
+    texture_directory_maps_RB3: str = os.path.join(os.path.dirname(filedirectory), "texture")
+    return texture_directory_characters, texture_directory_maps_VII, texture_directory_maps_RB3
+
+
+def find_texture_directories(filedirectory: str, file_index: FileIndex) -> List[model_types.TextureDirectory]:
+    texture_directory_characters, texture_directory_maps_VII, texture_directory_maps_RB3 = get_texture_directory_candidates(filedirectory)
+    if file_index.isdir(texture_directory_characters):  # This should be true for Characters & Accessories
+        # Characters always have variation textures in subdirectories
+        return [model_types.TextureDirectory(sp, os.path.join(texture_directory_characters, sp)) for sp in file_index.list_directories(texture_directory_characters)]
+    elif file_index.isdir(texture_directory_maps_VII):  # This should be true for Maps in VII
+        return [model_types.TextureDirectory(None, texture_directory_maps_VII)]
+    elif file_index.isdir(texture_directory_maps_RB3):  # This should be true for Maps in ReBirth 3
+        return [model_types.TextureDirectory(None, texture_directory_maps_RB3)]
+    return []
+
+
+class ISM2Probe:
+    """What 'probe()' found in an ISM2 file. Nothing past the File Section headers is read."""
+    __slots__ = ('filepath', 'version', 'big_endian', 'file_length', 'sections')
+
+    def __init__(self, filepath: str, version: Tuple[int, int, int, int], big_endian: bool, file_length: int,
+                 sections: List[Tuple[int, int, int]]) -> None:
+        super().__init__()
+        self.filepath: str = filepath
+        self.version: Tuple[int, int, int, int] = version
+        self.big_endian: bool = big_endian
+        self.file_length: int = file_length
+        self.sections: List[Tuple[int, int, int]] = sections  # (file_section_code, file_section_offset, entry_count)
+
+    def __str__(self) -> str:
+        lines = ["ISM2 v%s.%s.%s.%s  %s  Size: %s  < %s >" % (*self.version, "BE" if self.big_endian else "LE", str(self.file_length).rjust(8), self.filepath)]
+        for file_section_code, file_section_offset, entry_count in self.sections:
+            lines.append("  0x%02X %s @ %s  Count %s" % (file_section_code, FILE_SECTION_NAMES.get(file_section_code, "<unknown>").ljust(19),
+                                                       hex(file_section_offset).rjust(10), entry_count))
+        return "\n".join(lines)
+
+
+class ISM2File:
+    """
+    An opened ISM2 file. Use 'open_ism2()' to create one.
+    Only the header and the File Section table are read when it is opened.
+    Each File Section (and the File Sections it depends on) is decoded the first time it is asked for, and only once.
+    So asking for 'strings' or 'materials' never touches the vertex data.
+    Everything that is decoded goes into 'self.model'. 'read_model()' decodes everything that is left.
+    Call 'close()' when done - The file stays mapped until then.
+    """
+
+    def __init__(self, R: binary_file.LD_MappedBinaryReader, filedirectory: str, filename: str,
+                 option_parse_bounding_boxes: bool = False,
+                 transform_to_blender_space: Matrix4f = Matrix4f.create_rotation_x(math.pi * .5),
+                 file_index: FileIndex = None) -> None:
+        super().__init__()
+        self.R: binary_file.LD_MappedBinaryReader = R
+        self.filedirectory: str = filedirectory
+        self.filename: str = filename
+        self.file_index: FileIndex = file_index or FileIndex()  # Where texture files are looked up
+        self.option_parse_bounding_boxes: bool = option_parse_bounding_boxes
+        self.transform_to_blender_space: Matrix4f = transform_to_blender_space
+        self.model = model_types.PreBlender_Model(filename)  # default name in case the real name was not found. (Usually found in one of the Armature Bones)
+
+        # Helper Variables
+        self.bounding_box_count = 0
+        self.texture_directories_mapped = False
+        self.decoded_section_codes = set()
+        # Meshes and Face Loops are collected and joined once all Object-Mesh sections are read
+        self.mesh_sections: List[model_types.MeshSection] = []
+        self.mesh_vertex_count: int = 0  # Vertices in 'mesh_sections'
+        self.face_index_blocks: List[np.ndarray] = []
+        self.face_surface_index_blocks: List[np.ndarray] = []
+
+        # Header
+        R.goto(0x04)
+        self.versionA = R.read_byte_unsigned()
+        self.versionB = R.read_byte_unsigned()
+        self.versionC = R.read_byte_unsigned()
+        self.versionD = R.read_byte_unsigned()
+        R.goto(0x10)  # Skip over unused variables listed above
+        self.file_length = R.read_long_unsigned()
+        file_section_count = R.read_long_unsigned()
+
+        R.goto(0x20)  # Where the File Section pointers are
+        # Read File Section Pointers
+        file_section_table = R.read_longs(file_section_count * 2)
+        self.sections: List[Tuple[int, int]] = list(zip(file_section_table[0::2], file_section_table[1::2]))  # (file_section_code, file_section_offset)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self.R.close()
+
+    def get_version(self) -> Tuple[int, int, int, int]:
+        return self.versionA, self.versionB, self.versionC, self.versionD
+
+    def get_section_counts(self) -> List[Tuple[int, int, int]]:
+        """(file_section_code, file_section_offset, entry_count) for every File Section. Every File Section header is (type, header length, entry count)."""
+        R = self.R
+        sections = []
+        for file_section_code, file_section_offset in self.sections:
+            R.goto(file_section_offset + 0x08)
+            sections.append((file_section_code, file_section_offset, R.read_long_unsigned()))
+        return sections
+
+    @property
+    def strings(self) -> List[str]:
+        self.require_section(0x21)
+        return self.model.strings
+
+    @property
+    def textures(self) -> dict:
+        self.require_section(0x2E)
+        return self.model.textures
+
+    @property
+    def materials(self) -> List[model_types.Material]:
+        self.require_section(0x61)
+        return self.model.materials
+
+    @property
+    def bones(self) -> model_types.Bones:
+        self.require_section(0x03)
+        return self.model.bones
+
+    @property
+    def surfaces(self) -> List[model_types.Surface]:
+        self.require_section(0x03)  # Surfaces are stored in the Armature
+        return self.model.surfaces
+
+    def read_model(self) -> model_types.PreBlender_Model:
+        """Decodes every File Section that has not been decoded yet and returns the finished model."""
+        print("ISM2 v%s.%s.%s.%s  Size: %s  < %s >" % (self.versionA, self.versionB, self.versionC, self.versionD, str(self.file_length).rjust(8),
+                                                     os.path.join(self.filedirectory, self.filename)))
+        self.map_texture_directories()
+        for file_section_code, _ in self.sections:
+            self.require_section(file_section_code)
+        return self.model
+
+    def require_section(self, file_section_code: int):
+        """Decodes all File Sections of this type, unless they were already decoded."""
+        if file_section_code in self.decoded_section_codes:
+            return
+        self.decoded_section_codes.add(file_section_code)
+        for dependency in FILE_SECTION_DEPENDENCIES.get(file_section_code, ()):
+            self.require_section(dependency)
+        for code, offset in self.sections:
+            if code == file_section_code:
+                self.decode_section(code, offset)
+
+        if file_section_code == 0x0B:  # All Object-Meshes are read, now the Meshes and Face Loops can be joined
+            self.model.add_mesh_sections(self.mesh_sections)
+            self.mesh_sections, self.mesh_vertex_count = [], 0
+            if len(self.face_index_blocks):
+                self.model.set_faces(np.concatenate(self.face_index_blocks), np.concatenate(self.face_surface_index_blocks))
+            self.face_index_blocks, self.face_surface_index_blocks = [], []
+            self.model.detect_vertex_coloring()
+
+    def iter_mesh_sections(self) -> Iterator[model_types.MeshSection]:
+        """
+        Yields every Mesh of every Object-Mesh File Section, one at a time, without adding them to 'self.model'.
+        Everything else ('strings', 'materials', 'surfaces', ...) is still decoded into 'self.model' as usual.
+        Memory use depends on the biggest Mesh instead of the whole file.
+        """
+        for dependency in FILE_SECTION_DEPENDENCIES[0x0B]:
+            self.require_section(dependency)
+        base_vertex = 0
+        for file_section_code, file_section_offset in self.sections:
+            if file_section_code == 0x0B:
+                for mesh_section in self.iter_object_mesh(file_section_offset, base_vertex):
+                    yield mesh_section
+                    base_vertex += mesh_section.get_vertex_count()
+
+    def map_texture_directories(self):
+        """Map all material Locations - This is NOT part of the ISM2 file"""
+        if self.texture_directories_mapped:
+            return
+        self.texture_directories_mapped = True
+        self.model.texture_directories.extend(find_texture_directories(self.filedirectory, self.file_index))
+        texture_directory_characters = get_texture_directory_candidates(self.filedirectory)[0]
+        if len(self.model.texture_directories) == 0 and self.file_index.isdir(texture_directory_characters):
+            print("Character textures have not been extracted at this location:\n    %s" % texture_directory_characters)
+
+    def decode_section(self, file_section_code: int, file_section_offset: int):
+        """Decodes a single File Section into 'self.model'. Use 'require_section()' so dependencies are decoded first."""
+        R = self.R
+        model = self.model
+        transform_to_blender_space = self.transform_to_blender_space
+        degTOrad = math.pi / 180
+
+        R.goto(file_section_offset)
+        if file_section_code == 0x21:  # Strings
+            R.seek(0x08)
+            string_count = R.read_long_unsigned()
+            offset_array = R.read_longs(string_count)
+            if string_count > 0:
+                # The strings are packed one after another - Copy them in one piece and decode each one when it is used
+                strings_start = min(offset_array)
+                strings_end = R.find(b'\x00', max(offset_array))
+                if strings_end < 0:  # Unterminated string at the end of the file
+                    raise IndexError("string is not terminated before the end of the file")
+                R.goto(strings_start)
+                model.strings = model_types.StringTable(R.read_bytes(strings_end + 1 - strings_start), [offset - strings_start for offset in offset_array])
+
+        elif file_section_code == 0x2E:  # 46 # Textures
+            R.seek(8)  # Skip over Section Type & Header Length
+            textures_count = R.read_long_unsigned()  # Textures Header 2: Number of Textures in list
+
+            if nep_tools.debug:
+                print("\n  File Section Type %s == %s  Texture List @ %s" % (hex(file_section_code), file_section_code, hex(file_section_offset)))
+
+            texture_offsets = R.read_longs(textures_count)
+            for texture_offset in texture_offsets:
+                R.goto(texture_offset)
+                R.seek(0x04)
+                texture_name = model.strings[R.read_long_unsigned()]
+                R.seek(0x08)
+                texture_filename = model.strings[R.read_long_unsigned()]
+                i = texture_filename.rfind('.')  # Trim file extension if it exists
+                if i > 0: texture_filename = texture_filename[0:i]
+                model.textures[texture_name] = texture_filename
+
+        elif file_section_code == 0x62:  # 98 # FX Shader Nodes
+            pass  # Not Implemented - No usefull information in this section
+
+        elif file_section_code == 0x61:  # 97 # Materials
+            self.map_texture_directories()  # Textures are looked up while reading Materials
+            R.seek(0x08)  # Skip over unused header variables
+            materials_count = R.read_long_unsigned()  # Materials Header 2: Number of Materials in list
+            if nep_tools.debug:
+                print("\n  File Section Type %s == %s  Material List @ %s" % (hex(file_section_code), file_section_code, hex(file_section_offset)))
+
+            material_offsets = R.read_longs(materials_count)
+            for material_index, material_offset in enumerate(material_offsets):
+                R.goto(material_offset)
+
+                # Type 0x0D - # 13 # Material
+                R.seek(0x0C)
+                material = model_types.Material(model.strings[R.read_long_unsigned()])  # Read the material_name_ID
+                model.materials.append(material)
+                R.seek(0x0C)
+                R.goto(R.read_long_unsigned())
+
+                # Type 0x6C = 108 - This is where the split to multiple textures happen (diffuse, normal, ect...)
+                R.seek(0x08)
+                texture_count = R.read_long_unsigned()
+
+                if nep_tools.debug:
+                    print("    Material %s: @ %s   [[ %s ]]" % (
+                        material_index, hex(material_offset), material))
+
+                texture_offsets = R.read_longs(texture_count)
+                for texture_offset in texture_offsets:
+                    R.goto(texture_offset)
+
+                    # Type 0x6A = 106
+                    R.seek(0x14)
+                    R.goto(R.read_long_unsigned())
+
+                    # ** 0X6B ** Description
+                    # 0x6B Header
+                    # Offset      Length      Description
+                    # 0x00        0x04        BlockID  = 0x6A
+                    # 0x04        0x04        BlockLen = 0x18
+                    # 0x08        0x04        EntryCount (Always a list of pointers)
+                    # 0x0C        0x02        EntryType ** View Types Below
+                    # 0x0E        0x02         <Unknown>  (I've only seen values 0x00 and 0x19 so far)
+                    # 0x10        0x04        EntryLength (Examples: {IF entries are integers THEN 1 , IF entries are vectors THEN 3})
+                    # 0x14        0x04        Pointer to 0x6A Block. Only EntryType[0x0E] contains these.
+                    # 0x6B BODY
+                    # The body is always a list of pointers.
+                    # The '1st 0x6B' usually has an entry type of '0x02' OR '0x06'. These contain pointers that point to more '0x6B's.
+                    #
+                    # 0x6B > EntryType Values (The pointers will point to these)
+                    # 0x06    Pointers to more '0x6B' blocks as listed below - This is a 'Texture(Surface)'. *** TARGET ***
+                    #   0x15    'file_name' - 99% of the time. Sometimes it says things like 'rock_c1' when it should say 'rock_c'. *** TARGET ***
+                    #   0x18    'pixel_format' - of DDS file. (I already have to converted to PNG)
+                    # 0x02    Pointers to more '0x6B' blocks as listed below - This is a 'Texture(Surface) Sampler'.
+                    #   0x0E    The name of the '0x6A' block that contains the texture(surface) for this sampler. (This also contains a pointer to the same '0x6A' block in it's header.)
+                    #   0x0F    The name of referenced 'Texture(Surface) Sampler' ???
+                    #   0x10    The name of referenced 'Texture(Surface) Sampler' ???
+                    #   0x12    The file_name of an 'ism2' file ???
+                    #   0x13    The file_name of an 'ism2' file ???
+                    #   0x14    The file_name of an 'ism2' file ???
+
+                    # Type 0x6B = 107 - We can determin here if this will be a texture(0x06) or surface(0x02)
+                    R.seek(0x0C)
+                    # IF the read value is not 0x06 THEN this is not a texture
+                    if 0x06 != R.read_short_unsigned():
+                        continue
+                    R.seek(0x0A)  # From the '1st 0x6B'; the first pointer always points to the '2nd 0x6B' which has the 'file_name'.
+                    R.goto(R.read_long_unsigned())  # read the pointer to the second 0x6B block and goes to it
+
+                    # Type 0x6B = 107 - This '2nd 0x6B' always contains 1 pointer that points to the 'string_index' which contains the 'file_name'.
+                    R.seek(0x18)
+                    R.goto(R.read_long_unsigned())  # read the '2nd 0x6B's pointer and go to it.
+
+                    # TODO Define in Blender how to handle missing textures.
+                    #    • Create a texture node with the corrext filepath even tho it doesn't exist so that when the user does create the PNG Blender will find it.
+                    # TODO  Auto-Extract DDS and TID >> convert to PNG
+
+                    texture_filename: str = model.strings[R.read_long_unsigned()]
+                    texture_filename_mapped: str = model.textures[texture_filename] if texture_filename in model.textures else None
+
+                    if len(model.texture_directories) > 0:  # Test against first directory
+                        texture_directory = model.texture_directories[0]
+                        # The preffered texture is the one we use the Texture dict where key-value pairs are (name, filename).
+                        # IF preffered texture failed THEN try non-mapped texture
+                        if texture_filename_mapped is not None and self.file_index.isfile(os.path.join(texture_directory.path, "%s.png" % texture_filename_mapped)):
+                            texture_filename = texture_filename_mapped  # Preffered texture found
+                        else:
+                            if not self.file_index.isfile(os.path.join(texture_directory.path, "%s.png" % texture_filename)):
+                                # Neither PNG was found
+                                if self.file_index.isfile(os.path.join(texture_directory.path, "%s.tid" % texture_filename)) \
+                                        or self.file_index.isfile(os.path.join(texture_directory.path, "%s.tid" % texture_filename_mapped)):
+                                    print("  Texture['%s']: User did not extract PNG from TID file in directory < %s >" % (texture_filename, texture_directory.path))
+                                else:
+                                    print("  Texture['%s']: Neither PNG or TID file was found in directory < %s >" % (texture_filename, texture_directory.path))
+
+                    # Assign the texture_filename to the correct texture map
+                    _index = texture_filename.rfind("_", -4)
+                    texture_code: str = texture_filename[_index + 1].lower() if _index != -1 else "_"
+                    if texture_code == "c":
+                        material.texture_diffuse_filename = texture_filename
+                    elif texture_code == "s":
+                        material.texture_specular_filename = texture_filename
+                    elif texture_code == "i":
+                        material.texture_emission_filename = texture_filename
+                    elif texture_code == "n":
+                        material.texture_normal_filename = texture_filename
+                    elif texture_code == "m":
+                        material.texture_cyangreen_filename = texture_filename
+                    else:
+                        print("  ERROR: Texture type unknown: < %s >" % texture_filename)
+
+        elif file_section_code == 0x03:  # Armature
+            R.seek(4)  # Skip over unused variables listed above
+            # Armature Header 1: Armature Header Length
+            armature_header_length = R.read_long_unsigned()
+            # Armature Header 2: Bone Count
+            model.bones = model_types.Bones(R.read_long_unsigned())
+
+            if nep_tools.debug:
+                print("\n  File Section Type %s == %s: Armature  @ %s" %
+                      (hex(file_section_code), file_section_code, hex(file_section_offset)))
+
+            R.goto(file_section_offset + armature_header_length)
+
+            # Read each Bone
+            bone_header_offset_array = R.read_longs(len(model.bones))
+            # Bone Table - Row 'i' belongs to the 'i'th bone. The matrices are composed for all bones at once after the loop
+            bone_count = len(bone_header_offset_array)
+            bone_parent_indices = np.full(bone_count, -1, dtype=np.int64)
+            bone_translations = np.zeros((bone_count, 3))
+            bone_rotations = np.zeros((bone_count, 3))  # Euler XYZ in radians (Matrix X/Y/Z)
+            bone_joint_orients = np.zeros((bone_count, 3))  # Euler XYZ in radians (Joint Orient X/Y/Z)
+            for current_bone_position, current_bone_offset in enumerate(bone_header_offset_array):  # BONE DATA BLOCK
+                R.goto(current_bone_offset)
+
+                # Bone Header 0: Type
+                #   I've only seen values 4 & 5 at this location so far - I don't know what they mean though
+                #   Possibly, Type 0x04 == non-deforming && Type 0x05 == deforming
+                #   Possibly, Type 0x04 never has a parent bone
+                bone_type = R.read_long_unsigned()
+
+                # Bone Header 1: The length of this header block (Always 0x40 == 64)
+                bone_header_length = R.read_long_unsigned()
+
+                # Bone Header 2: How many attributes this bone has
+                bone_attribute_count = R.read_long_unsigned()
+
+                # Bone Header 3: String ID
+                bone_name1_string_id = R.read_long_unsigned()
+                # Bone Header 4: String ID
+                # bone_name2_string_id = R.read_long_unsigned()
+
+                # Bone Header 5: Unknown
+                # Bone Header 6: Unknown
+
+                R.goto(current_bone_offset + 0x1C)  # Skip over unused variables listed above
+                # Bone Header 7: Points to the position-in-file of the parent bone
+                bone_parent_offset = R.read_long_signed()
+
+                # Bone Header 8: Unknown - Possibly, how many child bones
+                # Bone Header 9: Unknown
+                # Bone Header 10: Unknown - The last bone had value 2
+                R.goto(current_bone_offset + 0x2C)  # Skip over unused variables listed above
+                # Bone Header 11: Bone ID (-1 means ???  root OR attachment part)
+                bone_id = R.read_long_signed()
+                # Bone Header 12 = Never Used
+                R.seek(4)
+                bone_number = R.read_long_unsigned()  # First Bone in file is assigned 0. Each next bone is assigned ++1
+                # Bone Header 14 = Unknown
+                # Bone Header 15 = Unknown
+
+                current_bone: model_types.Bone = model_types.Bone(model.strings[bone_name1_string_id], bone_id, bone_number)
+                # Assign Parent Bone
+                if bone_parent_offset != 0x0:
+                    R.goto(bone_parent_offset + 0x34)
+                    current_bone.parentid = R.read_long_unsigned()
+                    bone_parent_indices[current_bone_position] = current_bone.parentid
+                R.goto(current_bone_offset + bone_header_length)
+
+                if nep_tools.debug:
+                    _parent = model.bones[current_bone.parentid].name if current_bone.parentid >= 0 else "NONE"
+                    print("    BONE @ %s: ID=%s  Type: %s  @ %s   ParentBone: %s   name= %s" % (
+                        hex(current_bone_offset), str(current_bone.bone_id).rjust(3), bone_type, hex(current_bone_offset),
+                        str(_parent).ljust(15), current_bone.name))
+
+                # Read Bone Attributes
+                bone_attribute_offset_array = R.read_longs(bone_attribute_count)
+                for current_bone_attribute_offset in bone_attribute_offset_array:
+                    R.goto(current_bone_attribute_offset)
+
+                    bone_attribute_type = R.read_long_unsigned()
+                    if bone_attribute_type == 0x5B:  # Type 91 # Bone Attibute: Transforms (Transforms are relative to parent)
+                        bone_transform_length = R.read_long_unsigned()
+                        bone_transform_count = R.read_long_unsigned()
+
+                        if nep_tools.debug: print("      Bone Attribute Type 0x5B == 91 <Transforms>: @ %s" % hex(current_bone_attribute_offset).rjust(6))
+
+                        # TODO Figure out the Matrix stuff so that is can be used with animations
+                        m_trans = (0, 0, 0)
+                        m_scale = (1, 1, 1)
+                        m_rot_euler_a = [0, 0, 0]
+                        m_rot_euler_b = [0, 0, 0]
+
+                        bone_transform_offset_array = R.read_longs(bone_transform_count)
+                        for current_transform_index, current_transform_offset in enumerate(bone_transform_offset_array):
+                            R.goto(current_transform_offset)
+                            bone_transform_type = R.read_long_unsigned()
+                            # bone_transform_header1 = R.read_long_unsigned()  # I don't know what this is but it is always zero
+                            R.seek(4)  # skip bone_transform_header1
+
+                            if bone_transform_type == 0x14:  # 20 # Matrix Translation
+                                m41, m42, m43 = R.read_float(), R.read_float(), R.read_float()
+                                m_trans = (m41, m42, m43)
+                                if nep_tools.debug: print("        Bone Tansform %s: @ %s == %s  Type=%s == %s          Translate(%.4f, %.4f, %.4f)" % (
+                                    current_transform_index, hex(current_transform_offset).rjust(6), str(current_transform_offset).ljust(6), hex(bone_transform_type), bone_transform_type, m41, m42, m43))
+                            # I have not needed the scale section yet. So until I need it, I'm not going to bother processing it
+                            # elif bone_transform_type == 0x15:  # 21 # Scale
+                            #     scalex, scaley, scalez = R.read_float(), R.read_float(), R.read_float()
+                            #     m_scale = (scalex, scaley, scalez)
+                            #     if nep_tools.debug: print("        Bone Tansform %s: @ %s == %s  Type=%s == %s          Scale(%.4f, %.4f, %.4f)" % (
+                            #         current_transform, hex(current_transform_offset).rjust(6), str(current_transform_offset).ljust(6), hex(bone_transform_type), bone_transform_type, scalex, scaley, scalez))
+                            elif bone_transform_type == 0x5D:  # 93 # Matrix X
+                                m15, m16, m17, m18 = R.read_float(), R.read_float(), R.read_float(), R.read_float()
+                                # f.seek(12, 1)  # Skips the Vector
+                                m_rot_euler_b[0] = degTOrad * m18  # R.read_float()
+                                if nep_tools.debug: print("        Bone Tansform %s: @ %s == %s  Type=%s == %s          Matrix.X(%.4f, %.4f, %.4f, %.4f)" % (
+                                    current_transform_index, hex(current_transform_offset).rjust(6), str(current_transform_offset).ljust(6), hex(bone_transform_type), bone_transform_type, m15, m16, m17, m18))
+                            elif bone_transform_type == 0x5E:  # 94 # Matrix Y
+                                m25, m26, m27, m28 = R.read_float(), R.read_float(), R.read_float(), R.read_float()
+                                # f.seek(12, 1)  # Skips the Vector
+                                m_rot_euler_b[1] = degTOrad * m28  # R.read_float()
+                                if nep_tools.debug: print("        Bone Tansform %s: @ %s == %s  Type=%s == %s          Matrix.Y(%.4f, %.4f, %.4f, %.4f)" % (
+                                    current_transform_index, hex(current_transform_offset).rjust(6), str(current_transform_offset).ljust(6), hex(bone_transform_type), bone_transform_type, m25, m26, m27, m28))
+                            elif bone_transform_type == 0x5F:  # 95 # Matrix Z
+                                m35, m36, m37, m38 = R.read_float(), R.read_float(), R.read_float(), R.read_float()
+                                # f.seek(12, 1)  # Skips the Vector
+                                m_rot_euler_b[2] = degTOrad * m38  # R.read_float()
+                                if nep_tools.debug: print("        Bone Tansform %s: @ %s == %s  Type=%s == %s          Matrix.Z(%.4f, %.4f, %.4f,  %.4f)" % (
+                                    current_transform_index, hex(current_transform_offset).rjust(6), str(current_transform_offset).ljust(6), hex(bone_transform_type), bone_transform_type, m35, m36, m37, m38))
+
+                            # These "Joint Orient" blocks contains 4 floats.
+                            # The first three represent a Vector
+                            # The last float is the rotation in degrees around that Vector
+                            # The Vector part seems to be redundant since we already know it base on "bone_transform_type"
+                            elif bone_transform_type == 0x67:  # 103 # Joint Orient X
+                                m11, m12, m13, m14 = R.read_float(), R.read_float(), R.read_float(), R.read_float()
+                                # f.seek(12, 1)  # Skips the Vector
+                                m_rot_euler_a[0] = degTOrad * m14  # R.read_float()
+                                if nep_tools.debug: print("        Bone Tansform %s: @ %s == %s  Type=%s == %s          Joint.X(%.4f, %.4f, %.4f,  %.4f)" % (
+                                    current_transform_index, hex(current_transform_offset).rjust(6), str(current_transform_offset).ljust(6), hex(bone_transform_type), bone_transform_type, m11, m12, m13, m14))
+                            elif bone_transform_type == 0x68:  # 104 # Joint Orient Y
+                                m21, m22, m23, m24 = R.read_float(), R.read_float(), R.read_float(), R.read_float()
+                                # f.seek(12, 1)  # Skips the Vector
+                                m_rot_euler_a[1] = degTOrad * m24  # R.read_float()
+                                if nep_tools.debug: print("        Bone Tansform %s: @ %s == %s  Type=%s == %s          Joint.Y(%.4f, %.4f, %.4f,  %.4f)" % (
+                                    current_transform_index, hex(current_transform_offset).rjust(6), str(current_transform_offset).ljust(6), hex(bone_transform_type), bone_transform_type, m21, m22, m23, m24))
+                            elif bone_transform_type == 0x69:  # 105 # Joint Orient Z
+                                m31, m32, m33, m34 = R.read_float(), R.read_float(), R.read_float(), R.read_float()
+                                # f.seek(12, 1)  # Skips the Vector
+                                m_rot_euler_a[2] = degTOrad * m34  # R.read_float()
+                                if nep_tools.debug: print("        Bone Tansform %s: @ %s == %s  Type=%s == %s          Joint.Z(%.4f, %.4f, %.4f,  %.4f)" % (
+                                    current_transform_index, hex(current_transform_offset).rjust(6), str(current_transform_offset).ljust(6), hex(bone_transform_type), bone_transform_type, m31, m32, m33, m34))
+
+                            #
+                            # This is commented since no assigned variables ever get used after
+                            # Although, I am keeping this, since it was part of the previous script
+                            # Maybe one day someone will decypher the rest of the ISM2 file
+                            #
+                            # elif bone_transform_type == 0x70:  # 112 # Collision Flag
+                            #     v1, v2, v3 = R.read_long_signed(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0x71:  # 113 # Collision Radius
+                            #     v1, v2, v3 = R.read_long_signed(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0x72:  # 114 # Physics Flag
+                            #     v1, v2, v3 = R.read_long_signed(), R.read_long_signed(), R.read_long_signed()
+                            # elif bone_transform_type == 0x73:  # 115 # Physics Radius
+                            #     v1, v2, v3 = R.read_long_signed(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0x74:  # 116 # Physics Cost
+                            #     v1, v2, v3 = R.read_long_signed(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0x75:  # 117 # Physics Mass
+                            #     v1, v2, v3 = R.read_long_signed(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0x76:  # 118 # Physics Expand
+                            #     v1, v2, v3 = R.read_long_signed(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0x77:  # 119 # Physics Shape Memory
+                            #     v1, v2, v3 = R.read_long_signed(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0x7A:  # 122 # Unknown
+                            #     v1, v2, v3 = R.read_long_signed(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0x7B:  # 123 # Unknown
+                            #     v1, v2, v3 = R.read_long_signed(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0x7C:  # 124 # Unknown
+                            #     v1, v2, v3 = R.read_long_signed(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0x7D:  # 125 # Unknown
+                            #     v1, v2, v3 = R.read_long_signed(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0x7E:  # 126 # Unknown
+                            #     v1, v2, v3 = R.read_long_signed(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0x82:  # 130 # Unknown
+                            #     v1, v2, v3, v4 = sr_short(), sr_short(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0x84:  # 132 # Unknown
+                            #     v1, v2, v3, v4 = sr_short(), sr_short(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0x85:  # 133 # Unknown
+                            #     v1, v2, v3, v4 = sr_short(), sr_short(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0x86:  # 134 # Unknown
+                            #     v1, v2, v3, v4 = sr_short(), sr_short(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0x8C:  # 140 # Unknown
+                            #     v1, v2, v3, v4 = sr_short(), sr_short(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0x8D:  # 141 # Unknown
+                            #     v1, v2, v3, v4 = sr_short(), sr_short(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0x8E:  # 142 # Unknown
+                            #     v1, v2, v3, v4 = sr_short(), sr_short(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0x8F:  # 143 # Unknown
+                            #     v1, v2, v3, v4 = sr_short(), sr_short(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0x90:  # 144 # Unknown
+                            #     v1, v2, v3, v4 = sr_short(), sr_short(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0x91:  # 145 # Unknown
+                            #     v1, v2, v3, v4 = sr_short(), sr_short(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0x96:  # 150 # Unknown
+                            #     v1, v2, v3, v4 = sr_short(), sr_short(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0x97:  # 151 # Unknown
+                            #     v1, v2, v3, v4 = sr_short(), sr_short(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0xA0:  # 160 # Unknown
+                            #     v1, v2, v3, v4 = sr_short(), sr_short(), R.read_long_signed(), R.read_long_signed()
+                            # elif bone_transform_type == 0xA1:  # 161 # Unknown
+                            #     v1, v2, v3, v4 = sr_short(), sr_short(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0xA2:  # 162 # Unknown
+                            #     v1, v2, v3, v4 = sr_short(), sr_short(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0xA3:  # 163 # Unknown
+                            #     v1, v2, v3, v4 = sr_short(), sr_short(), R.read_long_signed(), R.read_float()
+                            # elif bone_transform_type == 0xA4:  # 164 # Unknown
+                            #     v1, v2, v3, v4 = sr_short(), sr_short(), R.read_long_signed(), R.read_float()
+
+                        # I have not needed the scale section yet. So until I need it, I'm not going to bother processing it
+                        bone_translations[current_bone_position] = m_trans
+                        bone_rotations[current_bone_position] = m_rot_euler_b
+                        bone_joint_orients[current_bone_position] = m_rot_euler_a
+
+                    elif bone_attribute_type == 0x4C or bone_attribute_type == 0x4D:  # Type 76 or 77 # Bone Attribute: Surfaces  ( WHY are surfaces here? It makes no sense to me )
+                        # This is the only bone that contains surfaces, it also has the name of the model
+                        model.name = current_bone.name
+                        R.seek(4)
+                        bone_attribute_surfaces_count = R.read_long_unsigned()
+                        R.seek(12) if bone_attribute_type == 0x4C else R.seek(8)
+                        if nep_tools.debug: print("      Bone Attribute Type 0x4C == 76 <Surfaces>: @ %s" % hex(current_bone_attribute_offset).rjust(6))
+
+                        # Read each Surface
+                        bone_attribute_surface_offset_array = R.read_longs(bone_attribute_surfaces_count)
+                        for current_surface_index, current_surface_offset in enumerate(bone_attribute_surface_offset_array):
+                            R.goto(current_surface_offset)
+                            R.seek(12)
+                            # The next 2 values from 'R.read_long_unsigned()' are 'Surface_Name_StringID' and 'Material_Name_StringID'
+                            S: model_types.Surface = model_types.Surface(model.strings[R.read_long_unsigned()], model.getMaterialByName(model.strings[R.read_long_unsigned()]))
+                            model.surfaces.append(S)
+                            if nep_tools.debug: print("        Surface %s: @ %s  mat=\"%s\"  tex=\"%s\"" % (current_surface_index, hex(current_surface_offset),
+                                                                                                            S.name, model.materials[S.material_index].name))
+                    elif bone_attribute_type == 0x4D:  # Type 77 # Bone Attribute: Shape Keys
+                        if nep_tools.debug: print("      Bone Attribute Type 0x4D == 77  Shape Keys  @ %s" % hex(current_bone_attribute_offset).rjust(6))
+
+                    elif bone_attribute_type == 0x5C:  # Type 92 # Bone Attribute: Child Bone List
+                        if nep_tools.debug: print("      Bone Attribute Type 0x5C == 92  Child Bone List  @ %s" % hex(current_bone_attribute_offset).rjust(6))
+                    else:
+                        if nep_tools.debug: print("      Bone Attribute Type %s == %s  <not-implemented>  @ %s" % (hex(bone_attribute_type), bone_attribute_type, hex(current_bone_attribute_offset).rjust(6)))
+                model.bones.append(current_bone)
+                if nep_tools.debug: print(current_bone)
+
+            # Local matrix of every bone, composed the same way for all bones at once:
+            #   Translation * Rotation Z * Y * X * Joint Orient Z * Y * X
+            bone_local_matrices = Matrix4f.compose_many(
+                Matrix4f.create_translations(bone_translations),
+                Matrix4f.create_rotations_z(bone_rotations[:, 2]),
+                Matrix4f.create_rotations_y(bone_rotations[:, 1]),
+                Matrix4f.create_rotations_x(bone_rotations[:, 0]),
+                Matrix4f.create_rotations_z(bone_joint_orients[:, 2]),
+                Matrix4f.create_rotations_y(bone_joint_orients[:, 1]),
+                Matrix4f.create_rotations_x(bone_joint_orients[:, 0]))
+            # IF parent exists THEN multiply against parent matrix (One level of the armature at a time)
+            model.bones.matrices = evaluate_hierarchy(bone_parent_indices, bone_local_matrices, transform_to_blender_space.to_array())
+            for current_bone, bone_matrix in zip(model.bones, model.bones.matrices):
+                current_bone.transform = Matrix4f.from_array(bone_matrix)
+            model.bones.compute_skeleton_hash()
+            model.bones.trim()  # After all bones are added, trim this list to cut down on a bit of proccessing
+
+        elif file_section_code == 0x32:  # 50 #
+            R.seek(8)
+            something_count = R.read_long_unsigned()
+            if nep_tools.debug:
+                print("\n  File Section Type %s == %s   @ %s Something[Count:%s]  <not-implemented>" %
+                      (hex(file_section_code), file_section_code,
+                       hex(file_section_offset), something_count))
+
+        elif file_section_code == 0x0B:  # 11 # Object-Mesh
+            for mesh_section in self.iter_object_mesh(file_section_offset, model.get_vertex_count() + self.mesh_vertex_count):
+                self.mesh_sections.append(mesh_section)
+                self.mesh_vertex_count += mesh_section.get_vertex_count()
+                # Back to the vertex numbers of the whole file
+                self.face_index_blocks.append(mesh_section.face_indices + mesh_section.base_vertex)
+                self.face_surface_index_blocks.append(mesh_section.face_surface_indices)
+
+        # TODO Animations
+        # elif current_file_section_type == 0x34:  # 52 # Armature Animations
+        #     # armature_animations_block_type  # Duplicate Data
+        #     # armature_animations_header_length  # Always the same
+        #     R.seek(0x08)  # skip block_type and header_length
+        #     animation_bone_count = R.read_long_unsigned()
+        #     # armature_animations_header03  # * Unknown
+        #     # armature_animations_header04  # * Unknown
+        #     R.seek(0x08)
+        #     animation_duration = R.read_float()  # float Unknown
+        #     # armature_animations_header06  # float Unknown
+        #     # armature_animations_header07  # long Unknown
+        #     R.seek(0x08)
+        #
+        #     mo_ = model_types.Motion(filename, animation_duration)
+        #
+        #     if nep_tools.debug:
+        #         print("\n  File Section Type %s == %s  @ %s  'Animation Bones'  Count %i   Duration: %s" % (hex(current_file_section_type), current_file_section_type, hex(current_file_section_offset), animation_bone_count, animation_duration))
+        #
+        #     armature_animations_offset_array = R.read_longs(animation_bone_count)
+        #
+        #     for current_armature_animation_bone_number, current_armature_animation_bone_offset in enumerate(armature_animations_offset_array):
+        #         R.goto(current_armature_animation_bone_offset)
+        #
+        #         armature_animation_bone = R.read_long_unsigned()
+        #
+        #         if armature_animation_bone == 0x50:  # 80 # Animation Bone
+        #             # armature_animation_attribute_header_length  # always the same
+        #             R.seek(4)  # Skip header length
+        #             armature_animation_bone_count = R.read_long_unsigned()
+        #             armature_animation_bone_name_index = R.read_long_unsigned()
+        #
+        #             mo_bone = model_types.MotionBone(model.strings[armature_animation_bone_name_index])
+        #
+        #             print("    Armature Animation Bone %s  Type 0x50 == 80   @ %s    %s   Bone: %s" % (
+        #                 current_armature_animation_bone_number,
+        #                 hex(current_armature_animation_bone_offset).rjust(7),
+        #                 str(armature_animation_bone_count).rjust(2), model.strings[armature_animation_bone_name_index].rjust(3)))
+        #
+        #             R.goto(current_armature_animation_bone_offset + 0x20)
+        #             armature_animation_bone_offset_array = R.read_longs(armature_animation_bone_count)
+        #             for current_animation_bone_attribute_number, current_animation_bone_attribute_offset in enumerate(armature_animation_bone_offset_array):
+        #                 R.goto(current_animation_bone_attribute_offset)
+        #                 armature_animation_bone_attribute_type = R.read_long_unsigned()
+        #
+        #                 mo_type = model_types.MotionType()
+        #
+        #                 if armature_animation_bone_attribute_type == 0x0F:  # 15 # Dunno yet
+        #                     # header length  # always 0x40
+        #                     # count  # always 1
+        #                     # armature_animation_bone_attribute_header03 = R.read_long_unsigned()  # always 0
+        #                     # armature_animation_bone_attribute_header04 = R.read_long_unsigned()  # always 0
+        #                     # armature_animation_bone_attribute_header05 = R.read_long_unsigned()  # always 0
+        #                     # armature_animation_bone_attribute_header06 = R.read_long_unsigned()  # always 0
+        #                     # armature_animation_bone_attribute_header07 = R.read_long_unsigned()  # always 0
+        #                     # armature_animation_bone_attribute_header08 = R.read_long_unsigned()  # always 73
+        #                     # armature_animation_bone_attribute_header09 = R.read_long_unsigned()  # always 0
+        #                     R.seek(36)
+        #                     armature_animation_bone_attribute_header10 = R.read_long_unsigned()  # name of bone
+        #                     armature_animation_bone_attribute_header11 = R.read_long_unsigned()
+        #                     armature_animation_bone_attribute_header12a = R.read_short_unsigned()
+        #                     # armature_animation_bone_attribute_header12b = R.read_short_unsigned()  # always 6
+        #                     # armature_animation_bone_attribute_header13 = R.read_long_unsigned()  # always 0
+        #                     # armature_animation_bone_attribute_header14 = R.read_long_unsigned()  # always 0
+        #                     # armature_animation_bone_attribute_header15 = R.read_long_unsigned()  # always 0
+        #                     R.seek(14)
+        #
+        #                     if nep_tools.debug:
+        #                         print("      AnimBoneAttrib %s:  %s   %s %s %s" % (
+        #                             current_animation_bone_attribute_number,
+        #                             hex(current_animation_bone_attribute_offset).rjust(10),
+        #                             model.strings[armature_animation_bone_attribute_header10].ljust(20),
+        #                             armature_animation_bone_attribute_header11,
+        #                             armature_animation_bone_attribute_header12a))
+        #
+        #                     armature_animation_bone_type2 = R.read_long_unsigned()
+        #                     if armature_animation_bone_type2 == 0x44:  # 68 # Dunno yet
+        #                         # header length  # always 0x20
+        #                         R.seek(4)  # skip header length
+        #                         armature_animation_bone_4byte_block_length = R.read_long_unsigned()  # Total Length of Block in 4-bytes
+        #                         # armature_animation_bone_type2_header03 = R.read_long_unsigned()  # always 0
+        #                         R.seek(4)
+        #                         armature_animation_bone_type2_header04a = R.read_short_unsigned()
+        #                         # armature_animation_bone_type2_header04b = R.read_short_unsigned()  # always 1
+        #                         R.seek(2)
+        #                         armature_animation_bone_4byte_entry_length = R.read_long_unsigned()  # Length of each entry in 4-bytes
+        #                         # armature_animation_bone_type2_header06 = R.read_long_unsigned()  # always 0
+        #                         # armature_animation_bone_type2_header07 = R.read_long_unsigned()  # always 0
+        #                         R.seek(8)
+        #
+        #                         armature_animation_frame_count = armature_animation_bone_4byte_block_length // armature_animation_bone_4byte_entry_length
+        #
+        #                         if nep_tools.debug:
+        #                             print("        AnimBoneAttrib2:  %s %s %s   Length: %s" % (
+        #                                 str(armature_animation_bone_4byte_block_length).rjust(3), armature_animation_bone_type2_header04a,
+        #                                 str(armature_animation_bone_4byte_entry_length).rjust(2), armature_animation_frame_count))
+        #
+        #                         if armature_animation_bone_type2_header04a == 0x0C:  # 12 # float array (probably vertices or matrices)
+        #                             for _ in range(armature_animation_frame_count):
+        #                                 armature_animation_keyframe_time_stamp = R.read_float()
+        #                                 armature_animation_keyframe_type1 = R.read_short_unsigned()
+        #                                 armature_animation_keyframe_type2 = R.read_short_unsigned()
+        #                                 armature_animation_keyframe_data: List[float] = []
+        #                                 for __ in range(armature_animation_bone_4byte_entry_length - 2):
+        #                                     armature_animation_keyframe_data.append(R.read_float())
+        #
+        #                                 mo_type.motion_data.append(model_types.MotionFrame(armature_animation_keyframe_time_stamp, armature_animation_keyframe_data))
+        #
+        #                                 if nep_tools.debug:
+        #                                     print("        Keyframe %s  Type %s %s" % (armature_animation_keyframe_time_stamp, armature_animation_keyframe_type1, armature_animation_keyframe_type2))
+        #                                     print("          (%s)" % ", ".join([("%.4f" % _s_).rjust(7) for _s_ in armature_animation_keyframe_data]))
+        #                         elif armature_animation_bone_type2_header04a == 0x12:  # 18 # I have no idea what this is yet
+        #                             for _ in range(armature_animation_frame_count):
+        #                                 armature_animation_keyframe_time_stamp = R.read_half_float()
+        #                                 armature_animation_keyframe_type = R.read_short_unsigned()
+        #                                 armature_animation_keyframe_data = []
+        #                                 for __ in range(armature_animation_bone_4byte_entry_length - 2):
+        #                                     armature_animation_keyframe_data.append(R.read_half_float())
+        #
+        #                                 mo_type.motion_data.append(model_types.MotionFrame(armature_animation_keyframe_time_stamp, armature_animation_keyframe_data))
+        #
+        #                                 if nep_tools.debug:
+        #                                     print("        Keyframe????? %s  Type %s" % (("%.3f" % armature_animation_keyframe_time_stamp).rjust(6), armature_animation_keyframe_type))
+        #                                     print("          (%s)" % ", ".join([str(_s_) for _s_ in armature_animation_keyframe_data]))
+        #                         else:
+        #                             if nep_tools.debug:
+        #                                 print("armature_animation_bone_type2_header04a == %s == %s   <not supported>" % (hex(armature_animation_bone_type2_header04a), armature_animation_bone_type2_header04a))
+        #                     else:
+        #                         if nep_tools.debug:
+        #                             print("        AnimBoneAttrib2: Type %s <not implemented>" % armature_animation_bone_type2)
+        #                 else:
+        #                     if nep_tools.debug:
+        #                         print("Armature Animation Type %s == %s <not implemented>" % (hex(current_animation_bone_attribute_offset).rjust(10), current_animation_bone_attribute_offset))
+        #                 mo_bone.motion_types.append(mo_type)
+        #         else:
+        #             if nep_tools.debug:
+        #                 print("    Armature Animation Attribute Type %i == Unknown @ %s" % (armature_animation_bone, hex(current_armature_animation_bone_offset)))
+        #         mo_.motion_bones.append(mo_bone)
+        #     model.motions.append(mo_)
+        else:
+            if nep_tools.debug:
+                print("\n  File Section Type %s == %s   @ %s  <not-implemented>" % (
+                    hex(file_section_code),
+                    file_section_code,
+                    hex(file_section_offset)))
+
+    def iter_object_mesh(self, file_section_offset: int, base_vertex: int = 0) -> Iterator[model_types.MeshSection]:
+        """
+        Decodes one Object-Mesh File Section and yields each Mesh in it as soon as it is read. Only one Mesh is held at a time.
+        'base_vertex' is where the first vertex of the first Mesh goes in the whole model.
+        Needs the Strings and the Armature (for the surfaces) - Use 'iter_mesh_sections()' so they are decoded first.
+        """
+        R = self.R
+        model = self.model
+        transform_to_blender_space = self.transform_to_blender_space
+        file_section_code = 0x0B
+
+        R.goto(file_section_offset)
+        # Object-Mesh Header 0: File Section Type
+        #   Unused because it always equals file_section_type. It is duplicate data.
+        # object_mesh_file_section_type = Never Used
+        # mesh_header_length = R.read_long_unsigned()
+
+        R.seek(8)  # Skip over unused variables listed above
+        object_mesh_attribute_count = R.read_long_unsigned()
+
+        if nep_tools.debug:
+            print("\n  File Section Type %s == %s: Object[Mesh] @ %s  Attributes %s" % (hex(file_section_code), file_section_code, hex(file_section_offset), object_mesh_attribute_count))
+
+        object_mesh_attribute_offset_array = R.read_longs(object_mesh_attribute_count)
+
+        for current_object_mesh_attribute in range(object_mesh_attribute_count):
+            current_object_mesh_attribute_offset = object_mesh_attribute_offset_array[current_object_mesh_attribute]
+            R.goto(current_object_mesh_attribute_offset)
+            object_mesh_attribute_type = R.read_long_unsigned()
+
+            if object_mesh_attribute_type == 0x0A:  # 10 # Mesh
+                R.seek(4)
+                mesh_section_count = R.read_long_unsigned()
+                R.seek(20)
+
+                if nep_tools.debug:
+                    print("    Mesh Surfaces @ %s   Count %i" % (hex(current_object_mesh_attribute_offset), mesh_section_count))
+
+                mesh_section_offset_array = R.read_longs(mesh_section_count)
+                mesh_section = model_types.MeshSection(base_vertex)
+                # Face Loops are collected per surface and joined once the whole Mesh is read
+                mesh_face_index_blocks: List[np.ndarray] = []
+                mesh_face_surface_index_blocks: List[np.ndarray] = []
+
+                for current_mesh_section_index in range(mesh_section_count):
+                    current_mesh_section_offset = mesh_section_offset_array[current_mesh_section_index]
+                    R.goto(current_mesh_section_offset)
+                    mesh_section_type = R.read_long_unsigned()
+
+                    if mesh_section_type == 0x59:  # 89 # Mesh Surface Vertices
+                        # vertex_blocks_header_length = R.read_long_unsigned()
+                        R.seek(4)  # skip header length - it is always the same
+                        vertex_blocks_count = R.read_long_unsigned()
+                        vertex_type = R.read_short_unsigned()
+                        R.seek(2)  # vertex_blocks_header4 = R.read_short_unsigned()   <unknown>
+                        vertex_count = R.read_long_unsigned()
+                        vertex_size = R.read_long_unsigned()
+                        R.seek(4)  # vertex_blocks_header7 = R.read_long_unsigned()    <unknown>
+
+                        if nep_tools.debug:
+                            print("      Mesh Surface: Vertices: Count %s  @ %s" % (vertex_blocks_count, hex(current_mesh_section_offset)))
+
+                        # All of these blocks have the same pointer, so it does not matter which one we use.
+                        R.goto(R.read_long_unsigned() + 20)  # goto last value of first vertex block
+                        vertex_block_offset = R.read_long_unsigned()
+                        R.goto(vertex_block_offset)
+
+                        if vertex_type == 0x1:  # Position, Normal 1 & 2, UV Mapping, Vertex Color
+                            if nep_tools.debug:
+                                print("        Data @ %s" % hex(vertex_block_offset))
+                            # The whole block is decoded in one read. Each vertex is 'vertex_size' bytes apart.
+                            vertex_data = R.read_array(get_vertex_dtype(vertex_size, R.big_endian), vertex_count)
+                            vertex_uvs = np.empty((vertex_count, 2), dtype=np.float32)
+                            vertex_uvs[:, 0] = vertex_data['u']
+                            vertex_uvs[:, 1] = vertex_data['v'].astype(np.float32) * -1 + 1  # Half float math would lose precision
+                            mesh_section.add_vertices(transform_to_blender_space.transform_points(vertex_data['position']),
+                                                      transform_to_blender_space.transform_points(vertex_data['normal']),
+                                                      vertex_uvs,
+                                                      vertex_data['rgba'] / 255.0)
+                        elif vertex_type == 0x3:  # Bone Weights
+                            if nep_tools.debug:
+                                print("        Bone Weights @ %s" % hex(vertex_block_offset))
+                            bone_weight_dtype = get_bone_weight_dtype(self.versionA, vertex_size, R.big_endian)
+                            if bone_weight_dtype is not None:
+                                bone_weight_data = R.read_array(bone_weight_dtype, vertex_count)
+                                # Indexed from the first vertex of this Mesh
+                                mesh_section.skin_weights = model_types.SkinWeights.from_dense(bone_weight_data['bone_ids'], bone_weight_data['weights'])
+                            elif self.versionA in BONE_WEIGHT_LAYOUTS_BY_VERSION:
+                                if nep_tools.debug:
+                                    print("      Vertex Type %s  File Version %s  Vertex Size %s  <not-implemented>" % (vertex_type, self.versionA, vertex_size))
+                            else:
+                                if nep_tools.debug:
+                                    print("      Vertex Type %s  File VersionA %s  <not-implemented>" % (vertex_type, self.versionA))
+
+                        else:
+                            if nep_tools.debug:
+                                print("      Vertex Type %s <not-implemented>" % vertex_type)
+
+                    elif mesh_section_type == 0x46:  # 70 # Mesh Surface Indices
+                        mesh_surface_header_length = R.read_long_unsigned()
+                        mesh_section_surface_count = R.read_long_unsigned()
+                        mesh_surface_name_index = R.read_long_unsigned()
+                        mesh_surface_section_blank = R.read_long_unsigned()
+                        mesh_surface_section_header4 = R.read_short_unsigned()
+                        mesh_surface_section_header5 = R.read_short_unsigned()
+                        # f.seek(8, 1)  # skip unused header values
+                        face_loop_count = R.read_long_unsigned()
+
+                        # gets the name of this surface
+                        mesh_surface_index = 0
+                        mesh_surface_object = model.strings[mesh_surface_name_index]
+                        # converts to material
+                        i = model.getSurfaceByName(mesh_surface_object)
+                        if i >= 0:
+                            mesh_surface_index = i
+                            mesh_surface_object = model.surfaces[i]
+
+                        if nep_tools.debug:
+                            print("      Mesh Surface: Indices @ %s  SectionCount %s  FaceLoopCount %s   Blank: %s   Header4: %s   Header5: %s   Surface: %s" % (
+                                hex(current_mesh_section_offset), mesh_section_surface_count, face_loop_count,
+                                mesh_surface_section_blank, mesh_surface_section_header4, mesh_surface_section_header5, mesh_surface_object.name if hasattr(mesh_surface_object, 'name') else "\'noName\'"))
+
+                        mesh_section_surface_offset_array = R.read_longs(mesh_section_surface_count)
+
+                        for mesh_section_surface_current_index in range(mesh_section_surface_count):
+                            mesh_surface_section_current_offset = mesh_section_surface_offset_array[mesh_section_surface_current_index]
+                            R.goto(mesh_surface_section_current_offset)
+                            mesh_surface_section_type = R.read_long_unsigned()
+
+                            if mesh_surface_section_type == 0x45:  # 69 # Mesh Surface: Face Loops
+                                # face_loops_block_length = R.read_long_unsigned()  # consistant
+                                R.seek(4)  # skip block length
+                                face_loops_count = R.read_long_unsigned()
+                                face_loops_type = R.read_short_unsigned()
+                                face_loops_type2 = R.read_short_unsigned()
+                                face_loops_blank = R.read_long_unsigned()
+                                # f.seek(4, 1)  # skip blank
+
+                                if nep_tools.debug:
+                                    print("        Face Loops (Triangles) @ %s   Type1 %s  Type2 %s  Blank=%s " % (
+                                        hex(mesh_surface_section_current_offset), face_loops_type, face_loops_type2, face_loops_blank))
+
+                                # Determine Face Loop Type
+                                face_vertex_count: int = 3  # default
+                                face_index_dtype = get_face_index_dtype(face_loops_type, R.big_endian)
+                                if face_index_dtype is None:  # IF the 'face_loop_type' is unknown THEN use this as a default AND report the situation with the print function
+                                    face_index_dtype = get_face_index_dtype(0x07, R.big_endian)
+                                    print("        Face Loop Type: <not implemented>  @ %s" % mesh_surface_section_current_offset)
+
+                                # Read all verticies of this surface in one go, based on the Face Loop Type
+                                face_count = face_loops_count // face_vertex_count
+                                face_indices = R.read_array(face_index_dtype, face_count * face_vertex_count)
+                                face_indices = face_indices.astype(np.int32).reshape(face_count, face_vertex_count)
+                                mesh_face_index_blocks.append(face_indices)
+                                mesh_face_surface_index_blocks.append(np.full(face_count, mesh_surface_index, dtype=np.int32))
+
+                            elif mesh_surface_section_type == 0x6E:  # 110 # Mesh Surface Bounding Box
+                                if self.option_parse_bounding_boxes:
+                                    R.seek(0x0C)
+                                    min_x, min_y, min_z = transform_to_blender_space.transform(R.read_float(), R.read_float(), R.read_float())
+                                    R.seek(0x04)
+                                    max_x, max_y, max_z = transform_to_blender_space.transform(R.read_float(), R.read_float(), R.read_float())
+                                    mesh_surface_object.bounding_box = model_types.BoundingBox(min_x, min_y, min_z, max_x, max_y, max_z)
+                                    if nep_tools.debug:
+                                        R.seek(0x0C)
+                                        print("        Bounding Box %s %s %s\n                     %s %s %s" % (
+                                            ("%.4f" % min_x).rjust(10),
+                                            ("%.4f" % min_y).rjust(10),
+                                            ("%.4f" % min_z).rjust(10),
+                                            ("%.4f" % max_x).rjust(10),
+                                            ("%.4f" % max_y).rjust(10),
+                                            ("%.4f" % max_z).rjust(10)))
+                            else:
+                                if nep_tools.debug:
+                                    print("        Mesh Surface Section %s <not-implemented>  @ %s" % (mesh_surface_section_type, hex(mesh_surface_section_current_offset)))
+
+                    elif mesh_section_type == 0x6E:  # 110 # Mesh Bounding Box
+                        if self.option_parse_bounding_boxes:
+                            R.seek(0x0C)
+                            min_x, min_y, min_z = transform_to_blender_space.transform(R.read_float(), R.read_float(), R.read_float())
+                            R.seek(0x04)
+                            max_x, max_y, max_z = transform_to_blender_space.transform(R.read_float(), R.read_float(), R.read_float())
+                            mesh_section.bounding_box = model.bounding_box = model_types.BoundingBox(min_x, min_y, min_z, max_x, max_y, max_z)
+                            self.bounding_box_count += 1
+                            if nep_tools.debug:
+                                R.seek(0x0C)
+                                print("      Mesh: Bounding Box %s %s %s\n                         %s %s %s" % (
+                                    ("%.4f" % min_x).rjust(10),
+                                    ("%.4f" % min_y).rjust(10),
+                                    ("%.4f" % min_z).rjust(10),
+                                    ("%.4f" % max_x).rjust(10),
+                                    ("%.4f" % max_y).rjust(10),
+                                    ("%.4f" % max_z).rjust(10)))
+
+                if len(mesh_face_index_blocks):
+                    # Face Loops index the vertices of the whole file - Make them index the vertices of this Mesh
+                    mesh_section.set_faces(np.concatenate(mesh_face_index_blocks) - base_vertex, np.concatenate(mesh_face_surface_index_blocks))
+                yield mesh_section
+                base_vertex += mesh_section.get_vertex_count()
+
+
+def open_ism2(filedirectory: str, filename: str,
+              option_parse_bounding_boxes: bool = False,
+              transform_to_blender_space: Matrix4f = Matrix4f.create_rotation_x(math.pi * .5),
+              file_index: FileIndex = None) -> ISM2File:  # returns None if the signature did not match
+    # Blender adds a '\' to the end of the filepath. This is annoying since upon the first use of 'os.path.dirname()' does not work as intended. Only the last '\' gets removed.
+    # To counter this effect I will ensure that there is no '\' at the end of the file
+    while filedirectory[-1] == '\\':
+        filedirectory = filedirectory[0:-1]
+
+    # Begin Parsing File
+    f: BinaryIO = open(os.path.join(filedirectory, filename), 'rb')
+
+    # Reads the first 4 bytes of the files and checks for the signature
+    if f.read(4) != b"ISM2":
+        print("ERROR: File signature did not match \"ISM2\"" + filedirectory)
+        f.close()
+        return None
+
+    # Check Endian -- This is the section count, which will obviously always have a low positive integer
+    # Stream Reader Functions :: Some reader functions are based on endian
+    f.seek(0x14)
+    R: binary_file.LD_MappedBinaryReader = binary_file.LD_MappedBinaryReader(f, not (0 < binary_file.struct_ULongL.unpack_from(f.read(4))[0] < 0x10000))
+    return ISM2File(R, filedirectory, filename, option_parse_bounding_boxes, transform_to_blender_space, file_index)
+
+
+def probe(filepath: str) -> ISM2Probe:  # returns None if the signature did not match
+    """Quickly reads the version, endian and File Section list of an ISM2 file. No File Section is decoded."""
+    ism2 = open_ism2(*os.path.split(filepath))
+    if ism2 is None:
+        return None
+    with ism2:
+        return ISM2Probe(filepath, ism2.get_version(), ism2.R.big_endian, ism2.file_length, ism2.get_section_counts())
+
+
+def iter_mesh_sections(filepath: str,
+                       option_parse_bounding_boxes: bool = False,
+                       transform_to_blender_space: Matrix4f = Matrix4f.create_rotation_x(math.pi * .5),
+                       file_index: FileIndex = None) -> Iterator[model_types.MeshSection]:
+    """
+    Streams the Meshes of an ISM2 file one at a time. Each one can be built, written out or thrown away before the next one is read.
+    Use 'open_ism2()' and 'ISM2File.iter_mesh_sections()' instead to also get at the materials and surfaces the faces refer to.
+    """
+    ism2 = open_ism2(*os.path.split(filepath), option_parse_bounding_boxes, transform_to_blender_space, file_index)
+    if ism2 is None:
+        return
+    with ism2:
+        yield from ism2.iter_mesh_sections()
+
+
+def read_ism2(filedirectory: str, filename: str,
+              option_parse_bounding_boxes: bool = False,
+              option_parse_face_anm: bool = False,
+              option_parse_motion: bool = False,
+              transform_to_blender_space: Matrix4f = Matrix4f.create_rotation_x(math.pi * .5),
+              file_index: FileIndex = None) -> model_types.PreBlender_Model:
+    ism2 = open_ism2(filedirectory, filename, option_parse_bounding_boxes, transform_to_blender_space, file_index)
+    if ism2 is None:
+        return None
+    with ism2:
+        model = ism2.read_model()
+
+    # Stored is a seperate file called face.anm (in the same directory)
+    if option_parse_face_anm:
+        model.face_anm = parse_face_anm(os.path.join(ism2.filedirectory, "face.anm"))
+
+    # Stored as a list of files inside the "motion" directory
+    if option_parse_motion:
+        parse_motion(os.path.join(ism2.filedirectory, "motion\\"))
+
+    return model
+
+
+def read_ism2_files(filedirectory: str, filenames: List[str], parallel: bool = True, max_workers: int = None, cache=None,
+                    file_index: FileIndex = None, **read_ism2_options) -> List[model_types.PreBlender_Model]:
+    """
+    Runs 'read_ism2()' on every file. The models come back in the same order as 'filenames'.
+    Files that fail are reported to the console and come back as None.
+    With 'parallel' the files are split across a pool of worker processes. The models are plain arrays, so they pickle back quickly.
+    IF the worker processes cannot be started THEN the remaining files are read one after another here.
+    With a 'cache' ('parse_cache.ParseCache') files that were read before are loaded from it instead, and newly read files are added to it.
+    One 'file_index' is shared by all files. The texture directories are listed here first, so worker processes get a copy that is already filled.
+    Each worker sends its copy back, and anything it listed (and its 'fs_calls') is merged into 'file_index'.
+    Workers are always started with 'spawn' - Forking Blender is not safe, and it is the only method Windows has.
+    They only import the parsing core, which does not need Blender.
+    """
+    if file_index is None:
+        file_index = FileIndex()
+    models: List[model_types.PreBlender_Model] = [None] * len(filenames)
+    cache_keys: List[str] = [None] * len(filenames)
+    if cache is not None:
+        for i, filename in enumerate(filenames):
+            cache_keys[i] = cache.get_key(filedirectory, filename, **read_ism2_options)
+            models[i] = cache.load(cache_keys[i])
+    pending = [i for i in range(len(filenames)) if models[i] is None]  # Files that need parsing
+    remaining = list(pending)
+    if len(pending):
+        for texture_directory in find_texture_directories(filedirectory.rstrip('\\'), file_index):
+            file_index.get_listing(texture_directory.path)
+
+    if parallel and len(remaining) > 1:
+        max_workers = min(len(remaining), max_workers or os.cpu_count() or 1)
+        try:
+            with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=_init_parse_worker, initargs=(nep_tools.debug,)) as executor:
+                futures = [(i, executor.submit(_read_ism2_in_worker, filedirectory, filenames[i], file_index, **read_ism2_options)) for i in pending]
+                for i, future in futures:
+                    try:
+                        models[i], worker_file_index = future.result()
+                        file_index.merge(worker_file_index)
+                    except BrokenProcessPool:
+                        raise
+                    except:
+                        print("ERROR: Failed to read ► %s" % filenames[i])
+                        traceback.print_exc()
+                    remaining.remove(i)
+        except (BrokenProcessPool, OSError, ImportError):
+            print("Parallel parsing is not available, reading %i file(s) one at a time" % len(remaining))
+            if nep_tools.debug:
+                traceback.print_exc()
+
+    for i in remaining:
+        try:
+            models[i] = read_ism2(filedirectory, filenames[i], file_index=file_index, **read_ism2_options)
+        except:
+            print("ERROR: Failed to read ► %s" % filenames[i])
+            traceback.print_exc()
+
+    if cache is not None:
+        for i in pending:
+            if models[i] is not None:
+                cache.store(cache_keys[i], models[i])
+        cache.evict()
+    return models
+
+
+def _init_parse_worker(debug: bool):
+    nep_tools.debug = debug
+
+
+def _read_ism2_in_worker(filedirectory: str, filename: str, file_index: FileIndex, **read_ism2_options):
+    """'file_index' is this worker's own copy. It is returned with only the filesystem calls made here counted in 'fs_calls'."""
+    fs_calls = file_index.fs_calls
+    model = read_ism2(filedirectory, filename, file_index=file_index, **read_ism2_options)
+    file_index.fs_calls -= fs_calls
+    return model, file_index
+
+
+def parse_motion(filepath: str):
+    pass
+
+
+EXPRESSION_TYPES = ("Base", "R.Pupil", "L.Pupil", "R.Eyelid", "L.Eyelid", "R.Eyebrow", "L.Eyebrow", "Mouth")
+
+
+def parse_face_anm(filepath: str) -> model_types.FaceAnm:  # returns None if parsing fails
+    if not os.path.isfile(filepath):
+        print("File path does not exist - %s" % filepath)
+        return None
+    if not os.path.isfile(filepath):
+        print("File path is not a file - %s" % filepath)
+        return None  # Path exists but is not a file.
+
+    f = open(filepath, 'rb')
+    # Check Endian -- This is a count which will always have a low positive integer
+    # Stream Reader Functions :: Some are created based on endian
+    f.seek(4)
+    R: binary_file.LD_MappedBinaryReader = binary_file.LD_MappedBinaryReader(f, not (0 < binary_file.struct_ULongL.unpack_from(f.read(4))[0] < 0x10000))
+
+    lines = []
+    R.goto(0x0)
+    line = "Face Anims Version: %.1f  File: \"%s\"" % (R.read_float(), filepath)
+    print(line)
+    lines.append(line)
+
+    something_count = R.read_long_unsigned()
+    line = "Something Count: %s" % something_count
+    if nep_tools.debug:
+        print(line)
+    lines.append(line)
+    for i in range(something_count):
+        header00 = R.read_long_signed()
+        header01 = R.read_long_signed()
+        header02 = R.read_long_signed()
+        header03 = R.read_long_signed()
+        header04 = R.read_long_signed()
+        header05 = R.read_long_signed()
+        header06 = R.read_long_signed()
+        header07 = R.read_long_signed()
+        header08 = R.read_long_signed()
+        header09 = R.read_long_signed()
+        header10 = R.read_long_signed()
+        header11 = R.read_long_signed()
+        header12 = R.read_long_signed()
+        header13 = R.read_long_signed()
+        header14 = R.read_long_signed()
+        header15 = R.read_long_signed()
+        header16 = R.read_long_signed()
+        header17 = R.read_long_signed()
+        header18 = R.read_long_signed()
+        header19 = R.read_long_signed()
+        header20 = R.read_long_signed()
+        header21 = R.read_long_signed()
+        header22 = R.read_float()
+        header23 = R.read_float()
+        line = "%s %s %s %s %s %s %s %s %s %s %s %s %s %s %s %s %s %s %s %s %s %s %s %s" % (
+            str(header00).rjust(2), str(header01).rjust(2), str(header02).rjust(2), str(header03).rjust(2),
+            str(header04).rjust(2), str(header05).rjust(2), str(header06).rjust(2), str(header07).rjust(2),
+            str(header08).rjust(2), str(header09).rjust(2), str(header10).rjust(2), str(header11).rjust(2),
+            str(header12).rjust(2), str(header13).rjust(2), str(header14).rjust(2), str(header15).rjust(2),
+            str(header16).rjust(2), str(header17).rjust(2), str(header18).rjust(2), str(header19).rjust(2),
+            str(header20).rjust(2), str(header21).rjust(2), str("%.1f" % header22).rjust(6), str("%.1f" % header23).rjust(6))
+        if nep_tools.debug:
+            print(line)
+        lines.append(line)
+
+    # f.seek(0x60 * something_count, 1)
+    face_parts_count = R.read_long_unsigned()
+    f_location = 12 + 0x60 * face_parts_count
+    line = "Face Parts Count: %i" % face_parts_count
+    if nep_tools.debug:
+        print(line)
+    lines.append(line)
+    for i in range(face_parts_count):
+        texnum = R.read_long_unsigned()
+        expression_type = EXPRESSION_TYPES[R.read_long_unsigned()]
+        header3 = R.read_long_unsigned()
+        header4 = R.read_long_unsigned()
+        chunk = R.read_long_unsigned()
+        tex_center_x = R.read_float()
+        tex_center_y = R.read_float()
+        tex_size_x = R.read_float()
+        tex_size_y = R.read_float()
+        header13 = R.read_float()
+        header14 = R.read_float()
+        header15 = R.read_float()
+        header16 = R.read_float()
+        header17 = R.read_float()
+        header18 = R.read_byte_unsigned()
+
+        line = "@%s  ID: %s  Tex #%s  ExpressionType: %s  H3:%s  H4:%s  Chunk:%s  TexCenter: (%s, %s), TexSize: (%s, %s)  H13:%s  H14:%s  H15:%s  H16:%s  H17:%s  H18:%s" % (
+            str(hex(f_location)).rjust(6), str(i).rjust(2), texnum, str(expression_type).ljust(10), str(header3).rjust(2), str(header4).rjust(2), str(chunk).rjust(3),
+            str(tex_center_x).rjust(6), str(tex_center_y).rjust(6), str(tex_size_x).rjust(6), str(tex_size_y).rjust(6),
+            ("%.3f" % header13).rjust(7), ("%.3f" % header14).rjust(7), ("%.3f" % header15).rjust(7), ("%.3f" % header16).rjust(7), ("%.3f" % header17).rjust(7), ("%i" % header18).rjust(2))
+        if nep_tools.debug:
+            print(line)
+        lines.append(line)
+        f_location += 53
+
+    extra_count = R.read_long_unsigned()
+    R.seek(extra_count * 0x20)
+    extra_count = R.read_long_unsigned()
+    f_location += 8 + 0x20
+    line = "Extra Count: %i" % extra_count
+    if nep_tools.debug:
+        print(line)
+    lines.append(line)
+    for i in range(extra_count):
+        texnum = R.read_long_unsigned()
+        expression_type = EXPRESSION_TYPES[R.read_long_unsigned()]
+        header3 = R.read_long_unsigned()
+        header4 = R.read_long_unsigned()
+        chunk_start = R.read_long_unsigned()
+        chunk_end = R.read_long_unsigned()
+        header7 = R.read_float()
+        header8 = R.read_byte_unsigned()
+        tex_center_x = R.read_float()
+        tex_center_y = R.read_float()
+        tex_size_x = R.read_float()
+        tex_size_y = R.read_float()
+        header13 = R.read_float()
+        header14 = R.read_float()
+        header15 = R.read_byte_unsigned()
+        header16 = R.read_byte_unsigned()
+        line = "@%s  ID: %s  Tex #%s  ExpressionType:%s  H3:%s  H4:%s  Chunk Range: (%s, %s) H7:%s H8:%s  TexCenter: (%s, %s), TexSize: (%s, %s)  H13:%s  H14:%s  H15:%s  H16:%s" % (
+            str(hex(f_location)).rjust(6), str(i).rjust(2), texnum, str(expression_type).rjust(10), str(header3).rjust(2), str(header4).rjust(2), str(chunk_start).rjust(3), str(chunk_end).rjust(3),
+            str(header7).rjust(5), str(header8).rjust(2), ("%.3f" % tex_center_x).rjust(8), ("%.3f" % tex_center_y).rjust(8), ("%.3f" % tex_size_x).rjust(8), ("%.3f" % tex_size_y).rjust(8),
+            header13, header14, header15, header16)
+        if nep_tools.debug:
+            print(line)
+        lines.append(line)
+        f_location += 55
+    R.close()
+    return model_types.FaceAnm("\n".join(lines))
+
+
+if __name__ == "__main__":
+    nep_tools.debug = True
+    read_ism2("C:\\Program Files (x86)\\Steam\\steamapps\\common\\Superdimension Neptune VS Sega Hard Girls\\data\\GAME200000\\model\\chara\\101", "002.ism2")
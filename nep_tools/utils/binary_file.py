@@ -1,8 +1,14 @@
-from io import BufferedReader
+import io
+import mmap
+import sys
+from array import array
+from functools import lru_cache
 from struct import Struct
 
 # DEFINE STRUCTURES
-from typing import BinaryIO
+from typing import BinaryIO, List, Tuple
+
+import numpy as np
 
 struct_ULongL = Struct('<L')  # Unsigned Long - Little Endian
 struct_ULongB = Struct('>L')  # Unsigned Long - Big Endian
@@ -77,11 +83,45 @@ def read_half_float_big_endian(stream: BinaryIO):
     return struct_halfFloatB.unpack_from(stream.read(2))[0]
 
 
+# ARRAY READERS :: Decode 'count' values in a single call instead of one call per value
+# 'array' typecodes 'I', 'H' and 'f' are 4, 2 and 4 bytes wide on every platform Blender runs on
+native_big_endian: bool = sys.byteorder == 'big'
+
+
+@lru_cache(maxsize=None)
+def get_struct(fmt: str) -> Struct:
+    """Precompiled 'Struct' for the format. The format should already include its endian character."""
+    return Struct(fmt)
+
+
+def array_from_bytes(typecode: str, data: bytes, big_endian: bool) -> array:
+    a = array(typecode)
+    a.frombytes(data)
+    if big_endian != native_big_endian:
+        a.byteswap()
+    return a
+
+
+def half_floats_from_bytes(data: bytes, big_endian: bool) -> array:
+    # 'array' has no half float typecode, so these are widened to 32-bit floats
+    return array('f', get_struct('%s%ie' % ('>' if big_endian else '<', len(data) >> 1)).unpack(data))
+
+
+def struct_array_from_bytes(fmt: str, data: bytes, big_endian: bool) -> List[Tuple]:
+    return list(get_struct(('>' if big_endian else '<') + fmt).iter_unpack(data))
+
+
+def numpy_array_from_bytes(dtype: np.dtype, data: bytes, count: int) -> np.ndarray:
+    # The endian is part of the 'dtype'. The array is a read-only view of 'data', NOT of the file buffer.
+    return np.frombuffer(data, dtype=dtype, count=count)
+
+
 class LD_BinaryReader:
     def __init__(self, stream: BinaryIO, big_endian: bool) -> None:
         super().__init__()
 
         self.stream = stream
+        self.big_endian = big_endian
         self.read_byte_unsigned = lambda: read_byte_unsigned(self.stream)
         self.read_byte_signed = lambda: read_byte_signed(self.stream)
         self.read_byte_as_float = lambda: read_byte_as_float(self.stream)
@@ -100,6 +140,32 @@ class LD_BinaryReader:
             self.read_float = lambda: read_float_little_endian(self.stream)
             self.read_half_float = lambda: read_half_float_little_endian(self.stream)
 
+    def read_bytes(self, length: int) -> bytes:
+        return self.stream.read(length)
+
+    def read_longs(self, count: int) -> array:
+        return array_from_bytes('I', self.stream.read(count << 2), self.big_endian)
+
+    def read_shorts(self, count: int) -> array:
+        return array_from_bytes('H', self.stream.read(count << 1), self.big_endian)
+
+    def read_floats(self, count: int) -> array:
+        return array_from_bytes('f', self.stream.read(count << 2), self.big_endian)
+
+    def read_halves(self, count: int) -> array:
+        return half_floats_from_bytes(self.stream.read(count << 1), self.big_endian)
+
+    def read_struct_array(self, fmt: str, count: int) -> List[Tuple]:
+        """'fmt' is a 'struct' format without an endian character. Returns a list of 'count' tuples."""
+        return struct_array_from_bytes(fmt, self.stream.read(get_struct('<' + fmt).size * count), self.big_endian)
+
+    def read_array(self, dtype: np.dtype, count: int) -> np.ndarray:
+        """Reads 'count' items of a NumPy 'dtype' (structured types included). 'dtype.itemsize' is the stride."""
+        return numpy_array_from_bytes(dtype, self.stream.read(dtype.itemsize * count), count)
+
+    def tell(self) -> int:
+        return self.stream.tell()
+
     def seek(self, amount: int):
         self.stream.seek(amount, 1)
 
@@ -108,3 +174,131 @@ class LD_BinaryReader:
 
     def close(self):
         self.stream.close()
+
+
+class LD_MappedBinaryReader:
+    """
+    Same interface as 'LD_BinaryReader' but the whole file is mapped into memory once.
+    Values are decoded with 'unpack_from(buffer, offset)' on a plain integer cursor,
+    so 'goto()' and 'seek()' are only an assignment instead of a stream seek that throws away the read-ahead.
+    """
+
+    def __init__(self, stream: BinaryIO, big_endian: bool) -> None:
+        super().__init__()
+
+        self.stream = stream
+        try:
+            self.buffer = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+            # Not a real file (or an empty one, which can not be mapped) - A single read does the same job
+            location = stream.tell()
+            stream.seek(0)
+            self.buffer = stream.read()
+            stream.seek(location)
+        # The cursor starts where the stream currently is, just like 'LD_BinaryReader' would
+        self.offset: int = stream.tell()
+        self.big_endian = big_endian
+
+        # The bound 'unpack_from' functions are kept so each read is a single attribute lookup
+        if big_endian:
+            self._unpack_long_unsigned = struct_ULongB.unpack_from
+            self._unpack_long_signed = struct_SLongB.unpack_from
+            self._unpack_short_unsigned = struct_UShortB.unpack_from
+            self._unpack_float = struct_floatB.unpack_from
+            self._unpack_half_float = struct_halfFloatB.unpack_from
+        else:
+            self._unpack_long_unsigned = struct_ULongL.unpack_from
+            self._unpack_long_signed = struct_SLongL.unpack_from
+            self._unpack_short_unsigned = struct_UShortL.unpack_from
+            self._unpack_float = struct_floatL.unpack_from
+            self._unpack_half_float = struct_halfFloatL.unpack_from
+
+    def read_byte_unsigned(self) -> int:
+        o = self.offset
+        self.offset = o + 1
+        return self.buffer[o]
+
+    def read_byte_signed(self) -> int:
+        o = self.offset
+        self.offset = o + 1
+        return self.buffer[o]
+
+    def read_byte_as_float(self) -> float:
+        o = self.offset
+        self.offset = o + 1
+        return self.buffer[o] / 255.0
+
+    def read_string(self) -> str:
+        end = self.buffer.find(b'\x00', self.offset)
+        if end < 0:  # Unterminated string at the end of the file
+            raise IndexError("string is not terminated before the end of the file")
+        s = self.buffer[self.offset:end].decode('utf8', 'replace')
+        self.offset = end + 1
+        return s
+
+    def find(self, sub: bytes, start: int) -> int:
+        """Location of the first 'sub' at or after 'start'. -1 if there is none. Does not move the cursor."""
+        return self.buffer.find(sub, start)
+
+    def read_long_unsigned(self) -> int:
+        o = self.offset
+        self.offset = o + 4
+        return self._unpack_long_unsigned(self.buffer, o)[0]
+
+    def read_long_signed(self) -> int:
+        o = self.offset
+        self.offset = o + 4
+        return self._unpack_long_signed(self.buffer, o)[0]
+
+    def read_short_unsigned(self) -> int:
+        o = self.offset
+        self.offset = o + 2
+        return self._unpack_short_unsigned(self.buffer, o)[0]
+
+    def read_float(self) -> float:
+        o = self.offset
+        self.offset = o + 4
+        return self._unpack_float(self.buffer, o)[0]
+
+    def read_half_float(self) -> float:
+        o = self.offset
+        self.offset = o + 2
+        return self._unpack_half_float(self.buffer, o)[0]
+
+    def read_bytes(self, length: int) -> bytes:
+        self.offset += length
+        return self.buffer[self.offset - length:self.offset]
+
+    def read_longs(self, count: int) -> array:
+        return array_from_bytes('I', self.read_bytes(count << 2), self.big_endian)
+
+    def read_shorts(self, count: int) -> array:
+        return array_from_bytes('H', self.read_bytes(count << 1), self.big_endian)
+
+    def read_floats(self, count: int) -> array:
+        return array_from_bytes('f', self.read_bytes(count << 2), self.big_endian)
+
+    def read_halves(self, count: int) -> array:
+        return half_floats_from_bytes(self.read_bytes(count << 1), self.big_endian)
+
+    def read_struct_array(self, fmt: str, count: int) -> List[Tuple]:
+        """'fmt' is a 'struct' format without an endian character. Returns a list of 'count' tuples."""
+        return struct_array_from_bytes(fmt, self.read_bytes(get_struct('<' + fmt).size * count), self.big_endian)
+
+    def read_array(self, dtype: np.dtype, count: int) -> np.ndarray:
+        """Reads 'count' items of a NumPy 'dtype' (structured types included). 'dtype.itemsize' is the stride."""
+        return numpy_array_from_bytes(dtype, self.read_bytes(dtype.itemsize * count), count)
+
+    def tell(self) -> int:
+        return self.offset
+
+    def seek(self, amount: int):
+        self.offset += amount
+
+    def goto(self, location: int):
+        self.offset = location
+
+    def close(self):
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+        self.stream.close()
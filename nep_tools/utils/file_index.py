@@ -0,0 +1,89 @@
+"""
+Answers 'does this file exist' questions from memory.
+Each directory is listed once with 'os.scandir()'. Every question after that is a set lookup.
+Extracted game folders are often on slow or network drives, where each 'os.path.exists()' is a round trip.
+
+Names are compared with 'os.path.normcase()', so lookups are case-insensitive on Windows just like 'os.path.exists()'.
+The index does not notice files that are added after a directory was listed - Use a new index for each import.
+"""
+
+import os
+from typing import Dict, FrozenSet, Tuple
+
+
+class DirectoryListing:
+    __slots__ = ('files', 'directories', 'directory_names')
+
+    def __init__(self, files: FrozenSet[str], directories: FrozenSet[str], directory_names: Tuple[str, ...]) -> None:
+        super().__init__()
+        self.files: FrozenSet[str] = files  # normcase names
+        self.directories: FrozenSet[str] = directories  # normcase names
+        self.directory_names: Tuple[str, ...] = directory_names  # Original names, in the order the OS listed them
+
+
+class FileIndex:
+    def __init__(self) -> None:
+        super().__init__()
+        self.listings: Dict[str, DirectoryListing] = {}
+        self.sizes: Dict[str, int] = {}  # normcase absolute path -> file size (-1 if it could not be read)
+        self.fs_calls: int = 0  # How many times the filesystem was actually asked something
+
+    def merge(self, other):
+        """Adds the listings of another index (a copy used by a worker process) and its 'fs_calls'."""
+        for key, listing in other.listings.items():
+            self.listings.setdefault(key, listing)
+        for key, size in other.sizes.items():
+            self.sizes.setdefault(key, size)
+        self.fs_calls += other.fs_calls
+
+    def get_listing(self, directory: str) -> DirectoryListing:
+        key = os.path.normcase(os.path.abspath(directory))
+        listing = self.listings.get(key)
+        if listing is None:
+            files, directories, directory_names = set(), set(), []
+            self.fs_calls += 1
+            try:
+                with os.scandir(directory) as scanner:
+                    for entry in scanner:
+                        try:  # Both use the data from the listing itself - No extra calls on Windows and most Linux filesystems
+                            if entry.is_dir():
+                                directories.add(os.path.normcase(entry.name))
+                                directory_names.append(entry.name)
+                            elif entry.is_file():
+                                files.add(os.path.normcase(entry.name))
+                        except OSError:
+                            continue
+            except OSError:  # Does not exist, or is not a directory
+                pass
+            listing = self.listings[key] = DirectoryListing(frozenset(files), frozenset(directories), tuple(directory_names))
+        return listing
+
+    def isfile(self, path: str) -> bool:
+        directory, name = os.path.split(path)
+        return os.path.normcase(name) in self.get_listing(directory).files
+
+    def isdir(self, path: str) -> bool:
+        directory, name = os.path.split(os.path.normpath(path))
+        return os.path.normcase(name) in self.get_listing(directory).directories
+
+    def exists(self, path: str) -> bool:
+        return self.isfile(path) or self.isdir(path)
+
+    def getsize(self, path: str) -> int:  # returns -1 if the file does not exist or cannot be read
+        """Like 'os.path.getsize()', but each file is only asked once."""
+        key = os.path.normcase(os.path.abspath(path))
+        size = self.sizes.get(key)
+        if size is None:
+            size = -1
+            if self.isfile(path):
+                self.fs_calls += 1
+                try:
+                    size = os.path.getsize(path)
+                except OSError:
+                    pass
+            self.sizes[key] = size
+        return size
+
+    def list_directories(self, directory: str) -> Tuple[str, ...]:
+        """Names of the subdirectories, like 'next(os.walk(directory))[1]'."""
+        return self.get_listing(directory).directory_names
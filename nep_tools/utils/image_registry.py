@@ -0,0 +1,77 @@
+"""
+Decides which texture files of an import are really the same image.
+Every path is resolved to an absolute path, and files with the same content are resolved to the first one seen.
+Character texture sets ('texture directories') often ship identical copies of a texture, which then become one Blender Image.
+
+Only files of the same size are hashed, so most files are never read. Nothing here needs Blender.
+Like 'FileIndex', the registry does not notice files that change after they were seen - Use a new registry for each import.
+"""
+
+import hashlib
+import os
+import struct
+from typing import Dict, List, Tuple
+
+from nep_tools.utils.file_index import FileIndex
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def get_png_size(path: str) -> Tuple[int, int]:  # returns (0, 0) if the file is not a PNG
+    """Width and height from the 'IHDR' chunk - The pixels are not read."""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(24)
+    except OSError:
+        return 0, 0
+    if len(header) < 24 or not header.startswith(PNG_SIGNATURE) or header[12:16] != b'IHDR':
+        return 0, 0
+    return struct.unpack('>II', header[16:24])
+
+
+class ImageRegistry:
+    def __init__(self, file_index: FileIndex = None) -> None:
+        super().__init__()
+        self.file_index: FileIndex = file_index if file_index is not None else FileIndex()
+        self.resolved_paths: Dict[str, str] = {}  # normcase absolute path -> path of the first file with the same content (None if missing)
+        self.paths_by_size: Dict[int, List[str]] = {}  # File size -> paths of distinct files with that size
+        self.digests: Dict[str, bytes] = {}  # Path -> content hash (Only for files that had to be compared)
+        self.duplicate_count: int = 0  # Files that turned out to be a copy of an earlier file
+        self.duplicate_pixel_bytes: int = 0  # Pixel memory those copies would have used once loaded (8 bit RGBA)
+
+    def get_digest(self, path: str) -> bytes:
+        digest = self.digests.get(path)
+        if digest is None:
+            h = hashlib.blake2b(digest_size=20)
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    h.update(chunk)
+            digest = self.digests[path] = h.digest()
+        return digest
+
+    def resolve(self, path: str) -> str:  # returns None if the file does not exist
+        key = os.path.normcase(os.path.abspath(path))
+        if key in self.resolved_paths:
+            return self.resolved_paths[key]
+
+        path = os.path.abspath(path)
+        resolved_path = None
+        if self.file_index.isfile(path):
+            try:
+                size = self.file_index.getsize(path)  # Counted in 'fs_calls' with the other texture lookups
+                if size < 0:
+                    raise OSError("Could not read the size of < %s >" % path)
+                candidates = self.paths_by_size.setdefault(size, [])
+                # IF another file has the same size THEN compare contents
+                resolved_path = next((candidate for candidate in candidates if self.get_digest(candidate) == self.get_digest(path)), None)
+                if resolved_path is None:
+                    candidates.append(path)
+                    resolved_path = path
+                else:
+                    self.duplicate_count += 1
+                    width, height = get_png_size(path)
+                    self.duplicate_pixel_bytes += width * height * 4
+            except OSError:  # Could not be read - Used as it is
+                resolved_path = path
+        self.resolved_paths[key] = resolved_path
+        return resolved_path
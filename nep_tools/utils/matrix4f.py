@@ -4,8 +4,10 @@ This matrix is row-major. This fact will effect whether you multiply right or le
 """
 
 import math
+from functools import reduce
+from typing import Tuple
 
-import mathutils
+import numpy as np
 
 
 class Matrix4f:
@@ -93,10 +95,174 @@ class Matrix4f:
                 v[0] * self.m10 + v[1] * self.m11 + v[2] * self.m12 + self.m13,
                 v[0] * self.m20 + v[1] * self.m21 + v[2] * self.m22 + self.m23)
 
+    def to_array(self) -> np.ndarray:
+        return np.array(self.getDataAsFloatArray(), dtype=np.float64).reshape(4, 4)
+
+    def transform_points(self, points: np.ndarray) -> np.ndarray:
+        """Batched version of 'transform()'. 'points' is an (N, 3) array. Returns a new (N, 3) array."""
+        m = self.to_array()
+        return np.asarray(points, dtype=np.float64) @ m[:3, :3].T + m[:3, 3]
+
+    @staticmethod
+    def from_array(a: np.ndarray):
+        """Opposite of 'to_array()'. 'a' is a (4, 4) array."""
+        m = Matrix4f()
+        (m.m00, m.m01, m.m02, m.m03,
+         m.m10, m.m11, m.m12, m.m13,
+         m.m20, m.m21, m.m22, m.m23,
+         m.m30, m.m31, m.m32, m.m33) = np.asarray(a, dtype=np.float64).ravel().tolist()
+        return m
+
+    # Batched versions of the 'create_*' functions. Each one returns an (N, 4, 4) array with one matrix per row of the input.
+
+    @staticmethod
+    def create_translations(xyz: np.ndarray) -> np.ndarray:
+        xyz = np.asarray(xyz, dtype=np.float64)
+        m = np.broadcast_to(np.eye(4), (len(xyz), 4, 4)).copy()
+        m[:, :3, 3] = xyz
+        return m
+
+    @staticmethod
+    def create_scales(xyz: np.ndarray) -> np.ndarray:
+        xyz = np.asarray(xyz, dtype=np.float64)
+        m = np.broadcast_to(np.eye(4), (len(xyz), 4, 4)).copy()
+        m[:, 0, 0], m[:, 1, 1], m[:, 2, 2] = xyz[:, 0], xyz[:, 1], xyz[:, 2]
+        return m
+
+    @staticmethod
+    def _create_rotations(radians: np.ndarray, a: int, b: int) -> np.ndarray:  # Rotation in the plane of axes 'a' and 'b'
+        radians = np.asarray(radians, dtype=np.float64)
+        m = np.broadcast_to(np.eye(4), (len(radians), 4, 4)).copy()
+        c, s = np.cos(radians), np.sin(radians)
+        m[:, a, a], m[:, a, b], m[:, b, a], m[:, b, b] = c, -s, s, c
+        return m
+
+    @staticmethod
+    def create_rotations_x(radians: np.ndarray) -> np.ndarray:
+        return Matrix4f._create_rotations(radians, 1, 2)
+
+    @staticmethod
+    def create_rotations_y(radians: np.ndarray) -> np.ndarray:
+        return Matrix4f._create_rotations(radians, 2, 0)
+
+    @staticmethod
+    def create_rotations_z(radians: np.ndarray) -> np.ndarray:
+        return Matrix4f._create_rotations(radians, 0, 1)
+
+    @staticmethod
+    def compose_many(*matrices: np.ndarray) -> np.ndarray:
+        """
+        Batched 'multiply()'. Multiplies left to right, so 'compose_many(a, b, c)[i] == a[i] * b[i] * c[i]'.
+        Each argument is an (N, 4, 4) array, or a single (4, 4) matrix that is used for every row.
+        """
+        return reduce(np.matmul, (np.asarray(m, dtype=np.float64) for m in matrices))
+
     def toBlenderMatrix(self):
+        import mathutils  # Only available inside Blender - Everything else in here works without it
         return mathutils.Matrix((
             (self.m00, self.m01, self.m02, self.m03),
             (self.m10, self.m11, self.m12, self.m13),
             (self.m20, self.m21, self.m22, self.m23),
             (self.m30, self.m31, self.m32, self.m33)
         ))
+
+
+def evaluate_hierarchy(parent_indices: np.ndarray, local_matrices: np.ndarray, root_matrix: np.ndarray = None) -> np.ndarray:
+    """
+    World matrices of a hierarchy (an armature) from the matrices relative to each parent.
+    'parent_indices[i]' is the row of the parent of 'i', or -1 for a root. Roots are relative to 'root_matrix' (identity if None).
+    Evaluated one level of the hierarchy at a time, so the number of NumPy calls depends on the depth and not on the count.
+    """
+    parent_indices = np.asarray(parent_indices, dtype=np.int64)
+    local_matrices = np.asarray(local_matrices, dtype=np.float64)
+    world_matrices = local_matrices.copy()
+    if len(parent_indices) == 0:
+        return world_matrices
+
+    has_parent = (parent_indices >= 0) & (parent_indices < len(parent_indices))
+    done = ~has_parent
+    if root_matrix is not None:
+        world_matrices[done] = np.asarray(root_matrix, dtype=np.float64) @ local_matrices[done]
+    while True:
+        level = has_parent & ~done
+        level[level] = done[parent_indices[level]]  # Only the children whose parent is already done
+        if not level.any():
+            break
+        world_matrices[level] = world_matrices[parent_indices[level]] @ local_matrices[level]
+        done |= level
+    # IF a parent chain loops back on itself THEN those matrices are left relative to their parent
+    return world_matrices
+
+
+# Blender's limits for a bone pointing (almost) straight down -Y (See 'vec_roll_to_mat3_normalized()' in Blender's 'armature.c')
+_BONE_SAFE_THRESHOLD = 6.1e-3
+_BONE_CRITICAL_THRESHOLD = 2.5e-4
+_FLT_EPSILON = 1.1920929e-07  # Blender does this math in 32 bit floats
+
+
+def vec_roll_to_mat3(vectors: np.ndarray, rolls: np.ndarray) -> np.ndarray:
+    """
+    NumPy port of Blender's 'vec_roll_to_mat3()' for many bones at once.
+    The (N, 3, 3) orientation of bones pointing along 'vectors' (Y axis) and rotated by 'rolls' (radians) around it.
+    """
+    vectors = np.asarray(vectors, dtype=np.float64)
+    vectors = vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+    x, y, z = vectors[:, 0], vectors[:, 1], vectors[:, 2]
+    theta = 1 + y
+    theta_alt = x * x + z * z
+    regular = (theta > _BONE_SAFE_THRESHOLD) | (theta_alt > _BONE_CRITICAL_THRESHOLD * _BONE_CRITICAL_THRESHOLD)
+    theta = np.where(theta > _BONE_SAFE_THRESHOLD, theta, theta_alt * .5 + theta_alt * theta_alt * .125)
+    theta[~regular] = 1  # Not used - Avoids dividing by zero
+
+    # Columns are the X, Y and Z axes of the bone
+    b = np.empty((len(vectors), 3, 3))
+    b[:, :, 0] = np.stack((1 - x * x / theta, -x, -x * z / theta), axis=-1)
+    b[:, :, 1] = vectors
+    b[:, :, 2] = np.stack((-x * z / theta, -z, 1 - z * z / theta), axis=-1)
+    b[~regular] = np.diag((-1., -1., 1.))  # Pointing down -Y - Mirrored around Z
+
+    # Roll around the bone (Rodrigues' rotation formula)
+    rolls = np.asarray(rolls, dtype=np.float64)
+    cos, sin = np.cos(rolls)[:, None, None], np.sin(rolls)[:, None, None]
+    cross = np.zeros((len(vectors), 3, 3))
+    cross[:, 0, 1], cross[:, 0, 2], cross[:, 1, 2] = -z, y, -x
+    cross[:, 1, 0], cross[:, 2, 0], cross[:, 2, 1] = z, -y, x
+    r = cos * np.eye(3) + sin * cross + (1 - cos) * vectors[:, :, None] * vectors[:, None, :]
+    return r @ b
+
+
+def vec_align_to_rolls(vectors: np.ndarray, align_axes: np.ndarray) -> np.ndarray:
+    """
+    NumPy port of Blender's 'ED_armature_ebone_roll_to_vector()' (What 'EditBone.align_roll()' calls) for many bones at once.
+    The rolls (radians) that turn the Z axes of bones pointing along 'vectors' towards 'align_axes'.
+    Like Blender, 'align_axes' is not normalized - A long axis counts as parallel to the bone sooner and gets roll 0.
+    """
+    vectors = np.asarray(vectors, dtype=np.float64)
+    align_axes = np.asarray(align_axes, dtype=np.float64)
+    lengths = np.linalg.norm(vectors, axis=-1)
+    normals = vectors / np.where(lengths > 0, lengths, 1)[:, None]
+    align_dot_normals = np.einsum('ij,ij->i', align_axes, normals)
+    # IF the bone has no length OR is (nearly) parallel to the axis THEN there is no roll
+    parallel = (lengths <= _FLT_EPSILON) | (np.abs(align_dot_normals) >= 1 - _FLT_EPSILON)
+
+    z_axes = vec_roll_to_mat3(np.where(parallel[:, None], (0., 1., 0.), normals), np.zeros(len(vectors)))[:, :, 2]
+    projections = align_axes - align_dot_normals[:, None] * normals  # 'align_axes' flattened onto the plane the bone rolls in
+    cos = np.einsum('ij,ij->i', z_axes, projections)
+    sin = np.linalg.norm(np.cross(z_axes, projections), axis=-1)
+    rolls = np.arctan2(sin, cos)
+    rolls = np.where(np.einsum('ij,ij->i', np.cross(z_axes, projections), normals) < 0, -rolls, rolls)
+    rolls[parallel] = 0
+    return rolls
+
+
+def bone_matrices_to_heads_tails_rolls(matrices: np.ndarray, length: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Edit Bone heads, tails and rolls for (N, 4, 4) world matrices - Bones are 'length' long along the Y axis of their matrix.
+    Matches creating a bone from (0, 0, 0) to (0, length, 0) and calling 'EditBone.transform()' with the matrix.
+    That aligns the roll to 'matrix @ (0, 0, 1)', which includes the translation - So the roll is not always the one of the rotation.
+    """
+    matrices = np.asarray(matrices, dtype=np.float64)
+    heads = matrices[:, :3, 3]
+    tails = heads + matrices[:, :3, 1] * length
+    rolls = vec_align_to_rolls(tails - heads, matrices[:, :3, 2] + heads)
+    return heads, tails, rolls
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The add-on is not installed - Import 'nep_tools' from the repository root. Blender is not needed for these tests.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,130 @@
+import io
+import mmap
+import struct
+
+import pytest
+
+from nep_tools.utils import binary_file
+
+
+def build_data(big_endian: bool) -> bytes:
+    e = '>' if big_endian else '<'
+    return (struct.pack(e + 'LlH', 0xDEADBEEF, -5, 0xBEEF) + bytes((7, 200, 51)) + struct.pack(e + 'fe', 1.5, -0.25)
+            + b"hair\x00" + "ネプ".encode('utf8') + b"\x00")
+
+
+def read_all(R):
+    values = [R.read_long_unsigned(), R.read_long_signed(), R.read_short_unsigned(),
+              R.read_byte_unsigned(), R.read_byte_signed(), R.read_byte_as_float(),
+              R.read_float(), R.read_half_float(), R.read_string(), R.read_string()]
+    return values, R.tell()
+
+
+@pytest.mark.parametrize('big_endian', [False, True])
+def test_mapped_reader_matches_stream_reader(tmp_path, big_endian):
+    path = tmp_path / "data.bin"
+    path.write_bytes(build_data(big_endian))
+    with open(path, 'rb') as f:
+        expected = read_all(binary_file.LD_BinaryReader(f, big_endian))
+    with open(path, 'rb') as f:
+        R = binary_file.LD_MappedBinaryReader(f, big_endian)
+        assert isinstance(R.buffer, mmap.mmap)
+        assert read_all(R) == expected
+        R.close()
+    assert expected[0] == [0xDEADBEEF, -5, 0xBEEF, 7, 200, 51 / 255.0, 1.5, -0.25, "hair", "ネプ"]
+
+
+@pytest.mark.parametrize('big_endian', [False, True])
+def test_mapped_reader_without_a_file(big_endian):
+    # 'BytesIO' has no file number, so nothing can be mapped - The whole stream is read once instead
+    data = build_data(big_endian)
+    R = binary_file.LD_MappedBinaryReader(io.BytesIO(data), big_endian)
+    assert isinstance(R.buffer, bytes)
+    assert read_all(R) == read_all(binary_file.LD_BinaryReader(io.BytesIO(data), big_endian))
+
+
+def test_mapped_reader_empty_file(tmp_path):
+    path = tmp_path / "empty.bin"
+    path.write_bytes(b"")
+    with open(path, 'rb') as f:  # An empty file can not be mapped
+        R = binary_file.LD_MappedBinaryReader(f, False)
+        assert R.buffer == b""
+        assert R.read_bytes(4) == b""
+
+
+def test_mapped_reader_starts_at_stream_position():
+    stream = io.BytesIO(struct.pack('<LL', 1, 2))
+    stream.seek(4)
+    R = binary_file.LD_MappedBinaryReader(stream, False)
+    assert R.tell() == 4
+    assert R.read_long_unsigned() == 2
+    assert stream.tell() == 4  # Reading the whole stream does not move it
+
+
+def test_mapped_reader_cursor():
+    R = binary_file.LD_MappedBinaryReader(io.BytesIO(struct.pack('<4L', 10, 11, 12, 13)), False)
+    R.goto(8)
+    assert R.read_long_unsigned() == 12
+    R.seek(-8)
+    assert R.read_long_unsigned() == 11
+    assert R.read_bytes(8) == struct.pack('<2L', 12, 13)
+    assert R.tell() == 16
+
+
+def test_mapped_reader_unterminated_string():
+    R = binary_file.LD_MappedBinaryReader(io.BytesIO(b"abc"), False)
+    with pytest.raises(IndexError):
+        R.read_string()
+
+
+@pytest.mark.parametrize('mapped', [False, True])
+def test_mapped_reader_find(tmp_path, mapped):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"root\x00hair\x00face\x00")
+    with open(path, 'rb') as f:
+        R = binary_file.LD_MappedBinaryReader(f if mapped else io.BytesIO(path.read_bytes()), False)
+        R.goto(2)
+        assert R.find(b'\x00', R.tell()) == 4
+        assert R.find(b'\x00', 5) == 9
+        assert R.find(b'face', 0) == 10
+        assert R.find(b'eyes', 0) == -1
+        assert R.tell() == 2  # The cursor does not move
+        R.goto(5)
+        assert R.read_string() == "hair"
+        assert R.tell() == 10
+
+def test_mapped_reader_close(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"\x00" * 8)
+    f = open(path, 'rb')
+    R = binary_file.LD_MappedBinaryReader(f, False)
+    R.close()
+    assert f.closed
+    assert R.buffer.closed
+
+
+# ARRAY READERS
+
+@pytest.mark.parametrize('mapped', [False, True])
+@pytest.mark.parametrize('big_endian', [False, True])
+def test_array_readers_match_single_reads(mapped, big_endian):
+    e = '>' if big_endian else '<'
+    data = (struct.pack(e + '3L', 1, 0x10000, 0xFFFFFFFF) + struct.pack(e + '2H', 2, 0xFFFF) + struct.pack(e + '2f', 1.5, -3.25)
+            + struct.pack(e + '3e', .5, -2, 65504) + struct.pack(e + 'HfH', 3, 2.5, 4) * 2)
+    reader_type = binary_file.LD_MappedBinaryReader if mapped else binary_file.LD_BinaryReader
+    R_single, R = reader_type(io.BytesIO(data), big_endian), reader_type(io.BytesIO(data), big_endian)
+    assert R.read_longs(3).tolist() == [R_single.read_long_unsigned() for _ in range(3)] == [1, 0x10000, 0xFFFFFFFF]
+    assert R.read_shorts(2).tolist() == [R_single.read_short_unsigned() for _ in range(2)]
+    assert R.read_floats(2).tolist() == [R_single.read_float() for _ in range(2)]
+    assert R.read_halves(3).tolist() == [R_single.read_half_float() for _ in range(3)] == [.5, -2, 65504]
+    R_single.read_bytes(16)
+    assert R.read_struct_array('HfH', 2) == [(3, 2.5, 4)] * 2
+    assert R.tell() == R_single.tell() == len(data)
+
+
+def test_array_readers_empty():
+    R = binary_file.LD_MappedBinaryReader(io.BytesIO(b"\x01\x00\x00\x00"), False)
+    assert R.read_longs(0).tolist() == []
+    assert R.read_halves(0).tolist() == []
+    assert R.read_struct_array('HH', 0) == []
+    assert R.tell() == 0
@@ -0,0 +1,81 @@
+import os
+
+import pytest
+
+from nep_tools.utils.file_index import FileIndex
+
+
+@pytest.fixture
+def texture_directory(tmp_path):
+    (tmp_path / "varA").mkdir()
+    (tmp_path / "varB").mkdir()
+    (tmp_path / "body.png").write_bytes(b"png")
+    (tmp_path / "hair.png").write_bytes(b"png")
+    return tmp_path
+
+
+def test_answers_match_os_path(texture_directory):
+    file_index = FileIndex()
+    for name in ("body.png", "hair.png", "eyes.png", "varA", "varB", "varC"):
+        path = os.path.join(str(texture_directory), name)
+        assert file_index.isfile(path) == os.path.isfile(path), name
+        assert file_index.isdir(path) == os.path.isdir(path), name
+        assert file_index.exists(path) == os.path.exists(path), name
+    assert file_index.isdir(os.path.join(str(texture_directory), "varA") + os.sep)
+    assert sorted(file_index.list_directories(str(texture_directory))) == sorted(next(os.walk(str(texture_directory)))[1])
+
+
+def test_each_directory_is_listed_once(texture_directory):
+    file_index = FileIndex()
+    for _ in range(3):
+        file_index.isfile(os.path.join(str(texture_directory), "body.png"))
+        file_index.isdir(os.path.join(str(texture_directory), "varA"))
+        file_index.list_directories(str(texture_directory))
+    assert file_index.fs_calls == 1
+    file_index.isfile(os.path.join(str(texture_directory), "varA", "body.png"))
+    assert file_index.fs_calls == 2
+
+
+def test_missing_directory(tmp_path):
+    file_index = FileIndex()
+    missing = os.path.join(str(tmp_path), "missing")
+    assert not file_index.isfile(os.path.join(missing, "body.png"))
+    assert not file_index.isdir(os.path.join(missing, "varA"))
+    assert file_index.list_directories(missing) == ()
+    assert file_index.fs_calls == 1  # A missing directory is remembered too
+
+
+def test_files_added_later_are_not_seen(texture_directory):
+    file_index = FileIndex()
+    assert not file_index.isfile(os.path.join(str(texture_directory), "new.png"))
+    (texture_directory / "new.png").write_bytes(b"png")
+    assert not file_index.isfile(os.path.join(str(texture_directory), "new.png"))
+    assert FileIndex().isfile(os.path.join(str(texture_directory), "new.png"))
+
+
+def test_merge(texture_directory):
+    worker_file_index = FileIndex()  # Like the copy a worker process gets
+    worker_file_index.isfile(os.path.join(str(texture_directory), "body.png"))
+    worker_file_index.isfile(os.path.join(str(texture_directory), "varA", "body.png"))
+    worker_file_index.getsize(os.path.join(str(texture_directory), "hair.png"))
+    file_index = FileIndex()
+    file_index.isdir(os.path.join(str(texture_directory), "varB"))
+    listing = file_index.get_listing(str(texture_directory))
+
+    file_index.merge(worker_file_index)
+    assert file_index.fs_calls == 1 + 3
+    assert file_index.get_listing(str(texture_directory)) is listing  # Already listed - The own listing is kept
+    assert not file_index.isfile(os.path.join(str(texture_directory), "varA", "hair.png"))
+    assert file_index.getsize(os.path.join(str(texture_directory), "hair.png")) == 3
+    assert file_index.fs_calls == 4  # Listed and measured by the worker - Not asked again
+
+
+def test_getsize(texture_directory):
+    file_index = FileIndex()
+    path = os.path.join(str(texture_directory), "body.png")
+    assert file_index.getsize(path) == os.path.getsize(path) == 3
+    assert file_index.getsize(path) == 3
+    assert file_index.fs_calls == 2  # The listing and one size
+    assert file_index.getsize(os.path.join(str(texture_directory), "eyes.png")) == -1
+    assert file_index.getsize(os.path.join(str(texture_directory), "varA")) == -1  # Not a file
+    assert file_index.fs_calls == 2  # The listing already says they are not files
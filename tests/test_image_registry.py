@@ -0,0 +1,70 @@
+import os
+import struct
+
+from nep_tools.utils.image_registry import ImageRegistry, get_png_size
+
+
+def png_bytes(width: int, height: int, payload: bytes) -> bytes:
+    """Just a signature and an 'IHDR' chunk, then 'payload' - Enough for 'get_png_size()', not a real image."""
+    return b'\x89PNG\r\n\x1a\n' + struct.pack('>I', 13) + b'IHDR' + struct.pack('>II', width, height) + payload
+
+
+def write(directory, name: str, data: bytes) -> str:
+    path = directory / name
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_get_png_size(tmp_path):
+    assert get_png_size(write(tmp_path, "a.png", png_bytes(64, 32, b""))) == (64, 32)
+    assert get_png_size(write(tmp_path, "b.png", b"not a png at all, but long enough")) == (0, 0)
+    assert get_png_size(write(tmp_path, "c.png", b"\x89PNG")) == (0, 0)
+    assert get_png_size(os.path.join(str(tmp_path), "missing.png")) == (0, 0)
+
+
+def test_identical_files_resolve_to_the_first(tmp_path):
+    (tmp_path / "varA").mkdir()
+    (tmp_path / "varB").mkdir()
+    first = write(tmp_path / "varA", "body.png", png_bytes(16, 8, b"same"))
+    copy = write(tmp_path / "varB", "body.png", png_bytes(16, 8, b"same"))
+    registry = ImageRegistry()
+    assert registry.resolve(first) == first
+    assert registry.resolve(copy) == first
+    assert registry.resolve(copy) == first  # Remembered
+    assert registry.file_index.fs_calls == 2 + 2  # The listings of 'varA' and 'varB', then both sizes
+    assert registry.duplicate_count == 1
+    assert registry.duplicate_pixel_bytes == 16 * 8 * 4
+
+
+def test_same_size_different_content_stays_apart(tmp_path):
+    a = write(tmp_path, "a.png", png_bytes(16, 8, b"AAAA"))
+    b = write(tmp_path, "b.png", png_bytes(16, 8, b"BBBB"))
+    registry = ImageRegistry()
+    assert registry.resolve(a) == a
+    assert registry.resolve(b) == b
+    assert registry.duplicate_count == 0
+    assert set(registry.digests) == {a, b}  # Same size, so both had to be hashed
+
+
+def test_different_sizes_are_never_read(tmp_path):
+    a = write(tmp_path, "a.png", png_bytes(16, 8, b"A"))
+    b = write(tmp_path, "b.png", png_bytes(16, 8, b"BB"))
+    registry = ImageRegistry()
+    assert registry.resolve(a) == a
+    assert registry.resolve(b) == b
+    assert registry.digests == {}
+
+
+def test_missing_file(tmp_path):
+    registry = ImageRegistry()
+    assert registry.resolve(os.path.join(str(tmp_path), "missing.png")) is None
+    assert registry.duplicate_count == 0
+
+
+def test_relative_and_absolute_paths_are_the_same_file(tmp_path, monkeypatch):
+    path = write(tmp_path, "a.png", png_bytes(1, 1, b""))
+    monkeypatch.chdir(tmp_path)
+    registry = ImageRegistry()
+    assert registry.resolve("a.png") == path
+    assert registry.resolve(path) == path
+    assert registry.duplicate_count == 0
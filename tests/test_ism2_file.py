@@ -0,0 +1,209 @@
+import struct
+
+import numpy as np
+import pytest
+
+from nep_tools import parse_ism2
+
+STRINGS = ["model_name", "root", "material", "surface", "body_c", "body_file_c.dds"]
+
+
+class ISM2Writer:
+    """Lays out blocks one after another. Each block is 16 byte aligned, like in the real files."""
+
+    def __init__(self, big_endian: bool) -> None:
+        self.endian = '>' if big_endian else '<'
+        self.data = bytearray()
+
+    def alloc(self, size: int) -> int:
+        self.data.extend(bytes(-len(self.data) % 16))
+        offset = len(self.data)
+        self.data.extend(bytes(size))
+        return offset
+
+    def put(self, offset: int, fmt: str, *values):
+        struct.pack_into(self.endian + fmt, self.data, offset, *values)
+
+    def add_list(self, code: int, header_length: int, offsets) -> int:
+        """A block that is (type, header length, count) followed by a list of offsets."""
+        block = self.alloc(header_length + 4 * len(offsets))
+        self.put(block, 'LLL', code, header_length, len(offsets))
+        self.put(block + header_length, 'L' * len(offsets), *offsets)
+        return block
+
+
+def build_ism2(big_endian: bool = False, object_mesh_count: int = 1) -> bytes:
+    """
+    The smallest file that has every decoded File Section:
+    Strings, Textures, Materials, an Armature with one bone that holds the surface, and Object-Meshes with one triangle each.
+    """
+    W = ISM2Writer(big_endian)
+    W.alloc(0x20)
+    section_codes = [0x21, 0x2E, 0x61, 0x62, 0x03] + [0x0B] * object_mesh_count
+    table = W.alloc(8 * len(section_codes))
+    string_index = {s: i for i, s in enumerate(STRINGS)}
+
+    string_offsets = []
+    for s in STRINGS:
+        string_offsets.append(len(W.data))
+        W.data.extend(s.encode() + b'\0')
+    sections = [W.add_list(0x21, 12, string_offsets)]
+
+    texture = W.alloc(20)
+    W.put(texture + 4, 'L', string_index["body_c"])
+    W.put(texture + 16, 'L', string_index["body_file_c.dds"])
+    sections.append(W.add_list(0x2E, 12, [texture]))
+
+    material = W.alloc(32)
+    W.put(material + 12, 'L', string_index["material"])
+    W.put(material + 28, 'L', W.add_list(0x6C, 12, []))
+    sections.append(W.add_list(0x61, 12, [material]))
+
+    sections.append(W.add_list(0x62, 12, []))
+
+    surface = W.alloc(20)
+    W.put(surface + 12, 'LL', string_index["surface"], string_index["material"])
+    surfaces = W.add_list(0x4C, 24, [surface])
+    bone = W.alloc(0x44)
+    W.put(bone, 'LLLL', 5, 0x40, 1, string_index["root"])
+    W.put(bone + 0x2C, 'l', 0)  # Bone ID
+    W.put(bone + 0x34, 'L', 0)  # Bone Index
+    W.put(bone + 0x40, 'L', surfaces)
+    sections.append(W.add_list(0x03, 0x20, [bone]))
+
+    for i in range(object_mesh_count):
+        vertex_data = W.alloc(3 * 0x20)
+        for v in range(3):
+            W.put(vertex_data + 0x20 * v, 'fff', i, v, 0)
+            W.put(vertex_data + 0x20 * v + 0x1C, 'BBBB', 255, 255, 255, 255)
+        vertex_block = W.alloc(24)
+        W.put(vertex_block + 20, 'L', vertex_data)
+        vertices = W.alloc(32)
+        W.put(vertices, 'LLLHHLLLL', 0x59, 32, 1, 0x1, 0, 3, 0x20, 0, vertex_block)
+
+        face_loops = W.alloc(20 + 6)
+        W.put(face_loops, 'LLLHHL', 0x45, 20, 3, 0x05, 0, 0)
+        W.put(face_loops + 20, 'HHH', 3 * i, 3 * i + 1, 3 * i + 2)  # Face Loops index the vertices of the whole file
+        mesh_surface = W.alloc(28 + 4)
+        W.put(mesh_surface, 'LLLLLHHLL', 0x46, 28, 1, string_index["surface"], 0, 0, 0, 3, face_loops)
+
+        mesh = W.alloc(32 + 8)
+        W.put(mesh, 'LLL', 0x0A, 0, 2)
+        W.put(mesh + 32, 'LL', vertices, mesh_surface)
+        sections.append(W.add_list(0x0B, 12, [mesh]))
+
+    W.data[0:8] = b'ISM2' + bytes((2, 1, 0, 0))
+    W.put(0x10, 'LL', len(W.data), len(section_codes))
+    for i, (code, offset) in enumerate(zip(section_codes, sections)):
+        W.put(table + 8 * i, 'LL', code, offset)
+    return bytes(W.data)
+
+
+@pytest.fixture(params=[False, True], ids=["LE", "BE"])
+def ism2_path(request, tmp_path):
+    path = tmp_path / "model.ism2"
+    path.write_bytes(build_ism2(request.param, object_mesh_count=2))
+    return path
+
+
+@pytest.fixture
+def decoded(monkeypatch):
+    """Every File Section code passed to 'ISM2File.decode_section()', in order."""
+    codes = []
+    decode_section = parse_ism2.ISM2File.decode_section
+
+    def recording_decode_section(self, file_section_code, file_section_offset):
+        codes.append(file_section_code)
+        decode_section(self, file_section_code, file_section_offset)
+
+    monkeypatch.setattr(parse_ism2.ISM2File, "decode_section", recording_decode_section)
+    return codes
+
+
+def open_ism2(path) -> parse_ism2.ISM2File:
+    return parse_ism2.open_ism2(str(path.parent), path.name)
+
+
+def test_probe(ism2_path, monkeypatch):
+    def fail(*args):
+        raise AssertionError("probe() decoded a File Section")
+
+    monkeypatch.setattr(parse_ism2.ISM2File, "decode_section", fail)
+    monkeypatch.setattr(parse_ism2.ISM2File, "iter_object_mesh", fail)
+    info = parse_ism2.probe(str(ism2_path))
+    assert info.version == (2, 1, 0, 0)
+    assert info.big_endian == (ism2_path.read_bytes()[0x14] == 0)
+    assert info.file_length == ism2_path.stat().st_size
+    assert [(code, count) for code, _, count in info.sections] == [(0x21, len(STRINGS)), (0x2E, 1), (0x61, 1), (0x62, 0), (0x03, 1), (0x0B, 1), (0x0B, 1)]
+    assert "Object-Mesh" in str(info)
+
+
+def test_probe_wrong_signature(tmp_path):
+    path = tmp_path / "model.ism2"
+    path.write_bytes(b"ISM3" + bytes(60))
+    assert parse_ism2.probe(str(path)) is None
+
+
+def test_open_decodes_nothing(ism2_path, decoded):
+    with open_ism2(ism2_path) as ism2:
+        assert ism2.get_version() == (2, 1, 0, 0)
+        assert [code for code, _ in ism2.sections] == [0x21, 0x2E, 0x61, 0x62, 0x03, 0x0B, 0x0B]
+    assert decoded == []
+
+
+def test_sections_are_decoded_on_first_use(ism2_path, decoded):
+    with open_ism2(ism2_path) as ism2:
+        assert list(ism2.strings) == STRINGS
+        assert decoded == [0x21]
+        assert ism2.textures == {"body_c": "body_file_c"}
+        assert decoded == [0x21, 0x2E]
+        assert [M.name for M in ism2.materials] == ["material"]
+        assert decoded == [0x21, 0x2E, 0x61]
+        assert ism2.model.get_vertex_count() == 0  # Nothing so far needed the Object-Meshes
+
+
+def test_sections_are_decoded_once(ism2_path, decoded):
+    with open_ism2(ism2_path) as ism2:
+        for _ in range(2):
+            ism2.strings
+            ism2.materials
+            ism2.surfaces
+            ism2.bones
+            model = ism2.read_model()
+    assert decoded == [0x21, 0x2E, 0x61, 0x03, 0x62, 0x0B, 0x0B]
+    assert model.get_vertex_count() == 6
+
+
+def test_dependencies_are_decoded_first(ism2_path, decoded):
+    with open_ism2(ism2_path) as ism2:
+        assert [S.name for S in ism2.surfaces] == ["surface"]
+        assert decoded == [0x21, 0x2E, 0x61, 0x03]
+        assert ism2.model.getMaterialByName("material") == ism2.surfaces[0].material_index == 0
+
+    decoded.clear()
+    with open_ism2(ism2_path) as ism2:
+        ism2.require_section(0x0B)
+        assert decoded == [0x21, 0x2E, 0x61, 0x03, 0x0B, 0x0B]
+        # Every dependency comes before the File Section that needs it
+        for code, dependencies in parse_ism2.FILE_SECTION_DEPENDENCIES.items():
+            for dependency in dependencies:
+                assert decoded.index(dependency) < decoded.index(code)
+
+
+def test_read_model(ism2_path):
+    with open_ism2(ism2_path) as ism2:
+        model = ism2.read_model()
+    assert model.name == "root"  # The bone that holds the surfaces names the model
+    assert len(model.bones) == 1
+    assert [S.name for S in model.surfaces] == ["surface"]
+    # Both Object-Meshes are joined - The second one's vertices come after the first one's
+    np.testing.assert_allclose(model.positions[:, 0], [0, 0, 0, 1, 1, 1])
+    np.testing.assert_array_equal(model.face_indices, [[0, 1, 2], [3, 4, 5]])
+    np.testing.assert_array_equal(model.face_surface_indices, [0, 0])
+
+
+def test_iter_mesh_sections(ism2_path):
+    mesh_sections = list(parse_ism2.iter_mesh_sections(str(ism2_path)))
+    assert [M.base_vertex for M in mesh_sections] == [0, 3]
+    for mesh_section in mesh_sections:
+        np.testing.assert_array_equal(mesh_section.face_indices, [[0, 1, 2]])  # Indexed from the first vertex of the Mesh
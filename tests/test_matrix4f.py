@@ -0,0 +1,165 @@
+import math
+
+import numpy as np
+
+from nep_tools.utils.matrix4f import Matrix4f, bone_matrices_to_heads_tails_rolls, evaluate_hierarchy, vec_roll_to_mat3
+
+
+def random_matrices(rng: np.random.Generator, count: int) -> np.ndarray:
+    return Matrix4f.compose_many(Matrix4f.create_translations(rng.uniform(-1, 1, (count, 3))),
+                                 Matrix4f.create_rotations_z(rng.uniform(-np.pi, np.pi, count)),
+                                 Matrix4f.create_rotations_y(rng.uniform(-np.pi, np.pi, count)),
+                                 Matrix4f.create_rotations_x(rng.uniform(-np.pi, np.pi, count)),
+                                 Matrix4f.create_scales(rng.uniform(.5, 2, (count, 3))))
+
+
+# BATCHED CREATION
+
+def test_batched_create_matches_scalar_create():
+    rng = np.random.default_rng(0)
+    xyz = rng.uniform(-5, 5, (10, 3))
+    radians = rng.uniform(-np.pi, np.pi, 10)
+    for i in range(10):
+        np.testing.assert_array_equal(Matrix4f.create_translations(xyz)[i], Matrix4f.createTranslation(tuple(xyz[i])).to_array())
+        np.testing.assert_array_equal(Matrix4f.create_scales(xyz)[i], Matrix4f.create_scale(tuple(xyz[i])).to_array())
+        np.testing.assert_allclose(Matrix4f.create_rotations_x(radians)[i], Matrix4f.create_rotation_x(radians[i]).to_array(), atol=1e-15)
+        np.testing.assert_allclose(Matrix4f.create_rotations_y(radians)[i], Matrix4f.create_rotation_y(radians[i]).to_array(), atol=1e-15)
+        np.testing.assert_allclose(Matrix4f.create_rotations_z(radians)[i], Matrix4f.create_rotation_z(radians[i]).to_array(), atol=1e-15)
+
+
+def test_compose_many_matches_multiply():
+    rng = np.random.default_rng(1)
+    a, b, c = (random_matrices(rng, 8) for _ in range(3))
+    single = random_matrices(rng, 1)[0]
+    composed = Matrix4f.compose_many(a, single, b, c)
+    for i in range(8):
+        m = Matrix4f.from_array(a[i]).multiply_right(Matrix4f.from_array(single))
+        m = m.multiply_right(Matrix4f.from_array(b[i])).multiply_right(Matrix4f.from_array(c[i]))
+        np.testing.assert_allclose(composed[i], m.to_array(), atol=1e-12)
+
+
+def test_transform_points_matches_transform():
+    m = Matrix4f.from_array(random_matrices(np.random.default_rng(2), 1)[0])
+    points = np.random.default_rng(3).uniform(-1, 1, (20, 3))
+    np.testing.assert_allclose(m.transform_points(points), [m.transform(*p) for p in points], atol=1e-12)
+
+
+# HIERARCHY
+
+def evaluate_hierarchy_scalar(parent_indices, local_matrices, root_matrix=None):
+    """One bone at a time, walking up to the root - Parents can come after their children."""
+    def world(i):
+        parent = parent_indices[i]
+        if 0 <= parent < len(parent_indices):
+            return world(parent) @ local_matrices[i]
+        return local_matrices[i] if root_matrix is None else root_matrix @ local_matrices[i]
+    return np.array([world(i) for i in range(len(parent_indices))])
+
+
+def test_evaluate_hierarchy_matches_scalar_walk():
+    rng = np.random.default_rng(4)
+    parent_indices = np.array([-1, 0, 1, 1, 5, 0, -1, 6, 7, 99])  # Bone 4's parent comes after it. 99 is not a bone, so 9 is a root.
+    local_matrices = random_matrices(rng, len(parent_indices))
+    np.testing.assert_allclose(evaluate_hierarchy(parent_indices, local_matrices),
+                               evaluate_hierarchy_scalar(parent_indices, local_matrices), atol=1e-12)
+    root_matrix = random_matrices(rng, 1)[0]
+    np.testing.assert_allclose(evaluate_hierarchy(parent_indices, local_matrices, root_matrix),
+                               evaluate_hierarchy_scalar(parent_indices, local_matrices, root_matrix), atol=1e-12)
+
+
+def test_evaluate_hierarchy_leaves_cycles_relative_to_parent():
+    local_matrices = random_matrices(np.random.default_rng(5), 3)
+    world_matrices = evaluate_hierarchy([-1, 2, 1], local_matrices)
+    np.testing.assert_array_equal(world_matrices, local_matrices)
+
+
+def test_evaluate_hierarchy_empty():
+    assert evaluate_hierarchy(np.empty(0, dtype=np.int32), np.empty((0, 4, 4))).shape == (0, 4, 4)
+
+
+# BONES
+
+def bone_from_matrix_scalar(m, length):
+    """
+    The old import: a bone from (0, 0, 0) to (0, length, 0), then 'EditBone.transform(m)'.
+    A pure Python port of 'EditBone.transform()' (bpy_types.py) and 'ED_armature_ebone_roll_to_vector()' (armature_edit.c).
+    """
+    def mul_point(v):  # 'Matrix @ Vector' with a 3D vector uses w = 1
+        return [m[r][0] * v[0] + m[r][1] * v[1] + m[r][2] * v[2] + m[r][3] for r in range(3)]
+
+    def dot(a, b):
+        return sum(x * y for x, y in zip(a, b))
+
+    def cross(a, b):
+        return [a[1] * b[2] - a[2] * b[1], a[2] * b[0] - a[0] * b[2], a[0] * b[1] - a[1] * b[0]]
+
+    def normalized(v):
+        n = math.sqrt(dot(v, v))
+        return [x / n for x in v]
+
+    def angle(a, b):  # 'angle_v3v3()'
+        a, b = normalized(a), normalized(b)
+        if dot(a, b) >= 0:
+            return 2 * math.asin(math.dist(a, b) / 2)
+        return math.pi - 2 * math.asin(math.dist([-x for x in a], b) / 2)
+
+    z_vec = [0., 0., 1.]  # 'self.matrix.to_3x3() @ Vector((0, 0, 1))' - The new bone has no rotation
+    head, tail = mul_point([0., 0., 0.]), mul_point([0., length, 0.])
+    align_axis = mul_point(z_vec)
+
+    nor = [t - h for t, h in zip(tail, head)]
+    n = math.sqrt(dot(nor, nor))
+    if n <= 1.1920929e-07:
+        return head, tail, 0.
+    nor = [x / n for x in nor]
+    if abs(dot(align_axis, nor)) >= 1 - 1.1920929e-07:
+        return head, tail, 0.
+    x, y, z = nor
+    theta, theta_alt = 1 + y, x * x + z * z
+    if theta > 6.1e-3 or theta_alt > 2.5e-4 * 2.5e-4:
+        if theta <= 6.1e-3:
+            theta = theta_alt * .5 + theta_alt * theta_alt * .125
+        mat_z = [-x * z / theta, -z, 1 - z * z / theta]
+    else:
+        mat_z = [0., 0., 1.]
+    d = dot(align_axis, nor)
+    align_axis_proj = [a - d * b for a, b in zip(align_axis, nor)]
+    roll = angle(mat_z, align_axis_proj)
+    if dot(cross(mat_z, align_axis_proj), nor) < 0:
+        roll = -roll
+    return head, tail, roll
+
+
+def test_bone_matrices_to_heads_tails_rolls_matches_edit_bone_transform():
+    rng = np.random.default_rng(6)
+    matrices = random_matrices(rng, 200)
+    matrices[:100, :3, 3] *= .2  # Near the origin, where the translation barely moves the roll
+    matrices[150, :3, :3] = np.diag((1., -1., -1.))  # Pointing down -Y
+    matrices[151, :3, 3] = matrices[151, :3, 1] * 3  # The axis it aligns to is (almost) parallel to the bone - Roll 0
+    heads, tails, rolls = bone_matrices_to_heads_tails_rolls(matrices, .02)
+    for i, m in enumerate(matrices.tolist()):
+        head, tail, roll = bone_from_matrix_scalar(m, .02)
+        np.testing.assert_allclose(heads[i], head, atol=1e-12)
+        np.testing.assert_allclose(tails[i], tail, atol=1e-12)
+        assert abs(rolls[i] - roll) < 1e-9, i
+    assert rolls[151] == 0
+
+
+def test_vec_roll_to_mat3_is_a_rotation():
+    rng = np.random.default_rng(7)
+    vectors = rng.normal(size=(100, 3))
+    vectors[0] = (0, -1, 0)  # Blender's special case
+    vectors[1] = (1e-3, -1, 0)  # Close to it, where Blender approximates
+    vectors[2] = (0, 1, 0)
+    rolls = rng.uniform(-np.pi, np.pi, 100)
+    matrices = vec_roll_to_mat3(vectors, rolls)
+    np.testing.assert_allclose(matrices @ np.swapaxes(matrices, -1, -2), np.broadcast_to(np.eye(3), (100, 3, 3)), atol=1e-9)
+    np.testing.assert_allclose(np.linalg.det(matrices), 1, atol=1e-9)
+    np.testing.assert_allclose(matrices[:, :, 1], vectors / np.linalg.norm(vectors, axis=1, keepdims=True), atol=1e-12)
+
+
+def test_vec_roll_to_mat3_no_roll():
+    matrices = vec_roll_to_mat3([(0, 1, 0), (0, -1, 0), (1, 0, 0)], np.zeros(3))
+    np.testing.assert_allclose(matrices[0], np.eye(3), atol=1e-15)
+    np.testing.assert_allclose(matrices[1], np.diag((-1, -1, 1)), atol=1e-15)
+    np.testing.assert_allclose(matrices[2], [[0, 1, 0], [-1, 0, 0], [0, 0, 1]], atol=1e-15)
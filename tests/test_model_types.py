@@ -0,0 +1,69 @@
+from nep_tools.model_types import Material, NameIndex, PreBlender_Model, StringTable, Surface
+
+
+# STRING TABLE
+
+def test_string_table_decodes_from_offsets():
+    strings = StringTable(b"root\x00hair\x00\x00face", [0, 5, 10, 11])
+    assert len(strings) == 4
+    assert strings[1] == "hair"
+    assert strings[2] == ""
+    assert strings[3] == "face"  # The last string has no terminator
+    assert list(strings) == ["root", "hair", "", "face"]
+    assert strings[-1] == "face"
+
+
+def test_string_table_decodes_each_string_once():
+    strings = StringTable(b"root\x00", [0])
+    assert strings.decoded == [None]
+    first = strings[0]
+    assert strings.decoded == ["root"]
+    assert strings[0] is first
+
+
+def test_string_table_invalid_utf8_is_replaced():
+    assert StringTable(b"a\xffb\x00", [0])[0] == "a�b"
+
+
+def test_string_table_append():
+    strings = StringTable(b"root\x00", [0])
+    strings.append("hair")
+    strings.append("")
+    assert list(strings) == ["root", "hair", ""]
+    assert strings.data == b"root\x00hair\x00\x00"
+    assert StringTable(strings.data, strings.offsets)[1] == "hair"
+
+
+# NAME INDEX
+
+def test_name_index_first_name_wins():
+    materials = [Material("skin"), Material("hair"), Material("skin")]
+    materials_by_name = NameIndex(materials)
+    assert materials_by_name.get("skin") == 0
+    assert materials_by_name.get("hair") == 1
+    assert materials_by_name.get("eyes") == -1
+    assert materials_by_name.get("eyes", None) is None
+
+
+def test_name_index_sees_appended_items():
+    surfaces = []
+    surfaces_by_name = NameIndex(surfaces)
+    assert surfaces_by_name.get("body") == -1
+    surfaces.append(Surface("body", 0))
+    assert surfaces_by_name.get("body") == 0
+    surfaces.append(Surface("body", 1))
+    surfaces.append(Surface("face", 2))
+    assert surfaces_by_name.get("body") == 0
+    assert surfaces_by_name.get("face") == 2
+
+
+def test_model_lookups_match_a_linear_search():
+    model = PreBlender_Model("model")
+    names = ["body", "hair", "body", "eyes", "face"]
+    for i, name in enumerate(names):
+        model.surfaces.append(Surface(name, i))
+        model.materials.append(Material(name))
+    for name in names + ["missing"]:
+        expected = next((i for i, surface in enumerate(model.surfaces) if surface.name == name), -1)
+        assert model.getSurfaceByName(name) == expected
+        assert model.getMaterialByName(name) == expected
@@ -0,0 +1,246 @@
+import os
+import zipfile
+
+import numpy as np
+import pytest
+
+from nep_tools import model_types, parse_cache
+from nep_tools.parse_cache import ParseCache
+from nep_tools.utils.matrix4f import Matrix4f
+
+
+def build_model() -> model_types.PreBlender_Model:
+    """A small model that uses every part of an entry: arrays, skin weights, strings, bones and the JSON metadata."""
+    rng = np.random.default_rng(3)
+    model = model_types.PreBlender_Model("model_name")
+    for s in ("model_name", "root", "arm", "body_c"):
+        model.strings.append(s)
+    model.texture_directories.append(model_types.TextureDirectory("varA", "/textures/varA"))
+    model.textures["body_c"] = "body_file_c"
+    material = model_types.Material("material")
+    material.enable_vertex_coloring = True
+    material.texture_diffuse_filename = "body_file_c"
+    model.materials.append(material)
+    surface = model_types.Surface("surface", 0)
+    surface.bounding_box = model_types.BoundingBox(-1, -2, -3, 1, 2, 3)
+    model.surfaces.append(surface)
+    model.bounding_box = model_types.BoundingBox(-4, -5, -6, 4, 5, 6)
+
+    model.add_vertices(rng.random((6, 3)), rng.random((6, 3)), rng.random((6, 2)), rng.random((6, 4)))
+    model.set_skin_weights(0, model_types.SkinWeights.from_dense(rng.integers(0, 2, (6, 4)), rng.random((6, 4)).astype(np.float32)))
+    model.set_faces([[0, 1, 2], [3, 4, 5]], [0, 0])
+
+    model.bones = model_types.Bones(2)
+    root = model_types.Bone("root", 0, 0)
+    arm = model_types.Bone("arm", 1, 1)
+    arm.parentid = 0
+    model.bones.append(root)
+    model.bones.append(arm)
+    model.bones.matrices = np.stack([Matrix4f.create_rotation_x(.5).to_array(), Matrix4f.createTranslation((1, 2, 3)).to_array()])
+    model.bones.compute_skeleton_hash()
+    model.bones.trim()
+    model.face_anm = model_types.FaceAnm("face.anm contents")
+    return model
+
+
+@pytest.fixture
+def ism2_file(tmp_path):
+    directory = tmp_path / "model"
+    directory.mkdir()
+    (directory / "model.ism2").write_bytes(b"ISM2" + bytes(60))
+    return directory
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ParseCache(str(tmp_path / "cache"))
+
+
+def get_key(cache: ParseCache, directory, **read_ism2_options) -> str:
+    return cache.get_key(str(directory), "model.ism2", **read_ism2_options)
+
+
+def test_store_load_round_trip(cache, ism2_file):
+    model = build_model()
+    key = get_key(cache, ism2_file)
+    assert cache.load(key) is None
+    cache.store(key, model)
+    loaded = cache.load(key)
+
+    assert loaded.name == model.name
+    assert list(loaded.strings) == list(model.strings)
+    for name in parse_cache.MODEL_ARRAY_NAMES:
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(model, name))
+        assert getattr(loaded, name).dtype == getattr(model, name).dtype
+    for name in parse_cache.SKIN_WEIGHT_ARRAY_NAMES:
+        np.testing.assert_array_equal(getattr(loaded.skin_weights, name), getattr(model.skin_weights, name))
+    assert [(D.name, D.path) for D in loaded.texture_directories] == [("varA", "/textures/varA")]
+    assert loaded.textures == model.textures
+    assert loaded.materials[0].name == "material"
+    assert loaded.materials[0].enable_vertex_coloring
+    assert loaded.materials[0].texture_diffuse_filename == "body_file_c"
+    assert loaded.getMaterialByName("material") == 0
+    assert loaded.getSurfaceByName("surface") == 0
+    assert loaded.surfaces[0].bounding_box.max_z == 3
+    assert loaded.bounding_box.min_x == -4
+    assert loaded.face_anm.face_anm == "face.anm contents"
+    assert [(B.name, B.bone_id, B.bone_index, B.parentid) for B in loaded.bones] == [("root", 0, 0, -1), ("arm", 1, 1, 0)]
+    assert loaded.bones.bones_by_id == model.bones.bones_by_id
+    assert loaded.bones.skeleton_hash == model.bones.skeleton_hash
+    np.testing.assert_array_equal(loaded.bones.matrices, model.bones.matrices)
+    np.testing.assert_allclose(loaded.bones[1].transform.to_array(), model.bones.matrices[1])
+
+
+def test_store_without_compression(tmp_path, ism2_file):
+    cache = ParseCache(str(tmp_path / "cache"), compress=False)
+    key = get_key(cache, ism2_file)
+    cache.store(key, build_model())
+    with zipfile.ZipFile(cache.get_entry_path(key)) as archive:
+        assert {info.compress_type for info in archive.infolist()} == {zipfile.ZIP_STORED}
+    assert cache.load(key).get_vertex_count() == 6
+
+
+def test_store_leaves_no_temporary_files(cache, ism2_file):
+    key = get_key(cache, ism2_file)
+    cache.store(key, build_model())
+    cache.store(key, build_model())  # Replaces the entry
+    assert os.listdir(cache.directory) == [key + parse_cache.CACHE_FILE_EXTENSION]
+
+
+def test_key_of_missing_file(cache, tmp_path):
+    assert cache.get_key(str(tmp_path), "missing.ism2") is None
+    assert cache.load(None) is None
+    cache.store(None, build_model())
+    assert not os.path.exists(cache.directory)
+
+
+def test_key_is_stable(cache, ism2_file):
+    assert get_key(cache, ism2_file) == get_key(cache, ism2_file)
+    assert get_key(cache, ism2_file) == cache.get_key(str(ism2_file) + "\\", "model.ism2")  # Blender adds a '\' to the directory
+
+
+def test_key_changes_with_modification_time(cache, ism2_file):
+    key = get_key(cache, ism2_file)
+    st = os.stat(ism2_file / "model.ism2")
+    os.utime(ism2_file / "model.ism2", ns=(st.st_atime_ns, st.st_mtime_ns + 1000))
+    assert get_key(cache, ism2_file) != key
+
+
+def test_key_changes_with_size(cache, ism2_file):
+    key = get_key(cache, ism2_file)
+    st = os.stat(ism2_file / "model.ism2")
+    (ism2_file / "model.ism2").write_bytes(b"ISM2" + bytes(61))
+    os.utime(ism2_file / "model.ism2", ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert get_key(cache, ism2_file) != key
+
+
+def test_key_changes_with_options(cache, ism2_file):
+    key = get_key(cache, ism2_file, option_parse_bounding_boxes=False)
+    assert get_key(cache, ism2_file, option_parse_bounding_boxes=True) != key
+    assert get_key(cache, ism2_file, option_parse_bounding_boxes=False) == key
+    # Matrices are compared by value
+    assert get_key(cache, ism2_file, transform_to_blender_space=Matrix4f.create_rotation_x(.5)) == \
+        get_key(cache, ism2_file, transform_to_blender_space=Matrix4f.create_rotation_x(.5))
+    assert get_key(cache, ism2_file, transform_to_blender_space=Matrix4f.create_rotation_x(.5)) != \
+        get_key(cache, ism2_file, transform_to_blender_space=Matrix4f.create_rotation_x(.25))
+
+
+def test_key_changes_with_texture_directories(cache, ism2_file):
+    key = get_key(cache, ism2_file)
+    (ism2_file / "texture").mkdir()
+    key_texture = get_key(cache, ism2_file)
+    assert key_texture != key
+    (ism2_file / "texture" / "varA").mkdir()
+    assert get_key(cache, ism2_file) != key_texture
+
+
+def test_key_changes_with_face_anm(cache, ism2_file):
+    key = get_key(cache, ism2_file)
+    key_face_anm = get_key(cache, ism2_file, option_parse_face_anm=True)
+    (ism2_file / "face.anm").write_text("face")
+    assert get_key(cache, ism2_file) == key  # Not looked at unless it is parsed
+    assert get_key(cache, ism2_file, option_parse_face_anm=True) != key_face_anm
+
+
+def test_key_changes_with_content_hash(tmp_path, ism2_file):
+    cache = ParseCache(str(tmp_path / "cache"), use_content_hash=True)
+    key = get_key(cache, ism2_file)
+    st = os.stat(ism2_file / "model.ism2")
+    (ism2_file / "model.ism2").write_bytes(b"ISM2" + bytes(59) + b"\x01")  # Same size and time, different contents
+    os.utime(ism2_file / "model.ism2", ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert get_key(cache, ism2_file) != key
+    assert ParseCache(str(tmp_path / "cache")).get_key(str(ism2_file), "model.ism2") != get_key(cache, ism2_file)
+
+
+def test_key_changes_with_format_version(cache, ism2_file, monkeypatch):
+    key = get_key(cache, ism2_file)
+    monkeypatch.setattr(parse_cache, "CACHE_FORMAT_VERSION", parse_cache.CACHE_FORMAT_VERSION + 1)
+    assert get_key(cache, ism2_file) != key
+
+
+@pytest.mark.parametrize("damage", ["truncated", "garbage", "empty", "missing metadata"])
+def test_unreadable_entry_is_a_miss(cache, ism2_file, damage):
+    key = get_key(cache, ism2_file)
+    cache.store(key, build_model())
+    path = cache.get_entry_path(key)
+    with open(path, 'rb') as f:
+        data = f.read()
+    if damage == "truncated":
+        data = data[:len(data) // 2]
+    elif damage == "garbage":
+        data = bytes(len(data))
+    elif damage == "empty":
+        data = b""
+    if damage == "missing metadata":
+        with zipfile.ZipFile(path) as archive:
+            members = {name: archive.read(name) for name in archive.namelist() if name != "metadata.npy"}
+        with zipfile.ZipFile(path, 'w') as archive:
+            for name, member in members.items():
+                archive.writestr(name, member)
+    else:
+        with open(path, 'wb') as f:
+            f.write(data)
+    assert cache.load(key) is None
+
+
+def store_entries(cache: ParseCache, count: int):
+    """Entries 'key0', 'key1', ... with 'key0' being the least recently used."""
+    model = build_model()
+    for i in range(count):
+        cache.store("key%i" % i, model)
+        os.utime(cache.get_entry_path("key%i" % i), ns=(0, (i + 1) * 10 ** 9))
+
+
+def get_entry_keys(cache: ParseCache):
+    return [os.path.basename(path)[:-len(parse_cache.CACHE_FILE_EXTENSION)] for _, _, path in cache.get_entries()]
+
+
+def test_evict_removes_least_recently_used_first(cache):
+    store_entries(cache, 4)
+    entry_size = cache.get_entries()[0][1]
+    cache.max_bytes = entry_size * 2
+    cache.evict()
+    assert get_entry_keys(cache) == ["key2", "key3"]
+
+
+def test_load_marks_entry_as_recently_used(cache):
+    store_entries(cache, 4)
+    assert cache.load("key0") is not None
+    cache.max_bytes = cache.get_entries()[0][1] * 2
+    cache.evict()
+    assert get_entry_keys(cache) == ["key3", "key0"]
+
+
+def test_evict_under_limit_keeps_everything(cache):
+    store_entries(cache, 3)
+    cache.evict()
+    assert get_entry_keys(cache) == ["key0", "key1", "key2"]
+
+
+def test_clear(cache, tmp_path):
+    assert cache.get_entries() == []  # The directory does not exist yet
+    store_entries(cache, 3)
+    (tmp_path / "cache" / "other.txt").write_text("not an entry")
+    cache.clear()
+    assert cache.get_entries() == []
+    assert os.listdir(cache.directory) == ["other.txt"]
@@ -0,0 +1,179 @@
+"""
+The NumPy decoders in 'parse_ism2' checked against the scalar loops they replaced.
+Each 'read_*_scalar' function is the original per-value decode, reading through 'LD_BinaryReader' one value at a time.
+"""
+
+import io
+import struct
+
+import numpy as np
+import pytest
+
+from nep_tools import parse_ism2
+from nep_tools.model_types import SkinWeights
+from nep_tools.utils import binary_file
+
+VERTEX_COUNT = 50
+
+
+def endian(big_endian: bool) -> str:
+    return '>' if big_endian else '<'
+
+
+def new_readers(data: bytes, big_endian: bool):
+    return binary_file.LD_BinaryReader(io.BytesIO(data), big_endian), binary_file.LD_MappedBinaryReader(io.BytesIO(data), big_endian)
+
+
+# VERTICES ('vertex_type 0x1')
+
+def build_vertices(rng: np.random.Generator, big_endian: bool) -> bytes:
+    e = endian(big_endian)
+    data = bytearray()
+    for _ in range(VERTEX_COUNT):
+        data += struct.pack(e + '3f', *rng.uniform(-10, 10, 3))
+        data += struct.pack(e + '7e', *rng.uniform(-1, 1, 7).astype(np.float16))  # Normal, U, Normal 2
+        data += struct.pack(e + 'e', *rng.uniform(0, 1, 1).astype(np.float16))  # V
+        data += bytes(rng.integers(0, 256, 4, dtype=np.uint8))
+    return bytes(data)
+
+
+def read_vertices_scalar(R: binary_file.LD_BinaryReader):
+    vertices = []
+    for current_vertex_index in range(VERTEX_COUNT):
+        x, y, z = R.read_float(), R.read_float(), R.read_float()
+        nx, ny, nz = R.read_half_float(), R.read_half_float(), R.read_half_float()
+        u = R.read_half_float()
+        R.seek(6)
+        v = R.read_half_float() * -1 + 1
+        r, g, b, a = R.read_byte_as_float(), R.read_byte_as_float(), R.read_byte_as_float(), R.read_byte_as_float()
+        vertices.append((x, y, z, nx, ny, nz, u, v, r, g, b, a))
+    return np.array(vertices)
+
+
+@pytest.mark.parametrize('big_endian', [False, True])
+def test_vertex_dtype_matches_scalar_decode(big_endian):
+    data = build_vertices(np.random.default_rng(1), big_endian)
+    R_scalar, R = new_readers(data, big_endian)
+    expected = read_vertices_scalar(R_scalar)
+
+    vertex_data = R.read_array(parse_ism2.get_vertex_dtype(0x20, big_endian), VERTEX_COUNT)
+    np.testing.assert_array_equal(vertex_data['position'], expected[:, 0:3].astype(np.float32))
+    np.testing.assert_array_equal(vertex_data['normal'], expected[:, 3:6].astype(np.float16))
+    np.testing.assert_array_equal(vertex_data['u'], expected[:, 6].astype(np.float16))
+    np.testing.assert_allclose(vertex_data['v'].astype(np.float32) * -1 + 1, expected[:, 7], rtol=0, atol=1e-6)
+    np.testing.assert_allclose(vertex_data['rgba'] / 255.0, expected[:, 8:12])
+    assert R.tell() == len(data)
+
+
+def test_vertex_dtype_stride():
+    assert parse_ism2.get_vertex_dtype(0x20, False).itemsize == 0x20
+    assert parse_ism2.get_vertex_dtype(0x28, False).itemsize == 0x28
+    assert parse_ism2.get_vertex_dtype(0x10, False).itemsize == 0x20  # Never smaller than the fields it holds
+
+
+# BONE WEIGHTS ('vertex_type 0x3')
+
+def build_bone_weights(rng: np.random.Generator, versionA: int, vertex_size: int, big_endian: bool) -> bytes:
+    e = endian(big_endian)
+    bone_id_type, weight_type, slot_count, weights_offset = parse_ism2.BONE_WEIGHT_LAYOUTS_BY_VERSION[versionA][vertex_size]
+    bone_id_format = {'u1': 'B', 'u2': 'H'}[bone_id_type]
+    weight_format = {'f2': 'e', 'f4': 'f'}[weight_type]
+    data = bytearray()
+    for i in range(VERTEX_COUNT):
+        weights = rng.uniform(0.1, 1, slot_count)
+        weights[i % (slot_count + 1):] = 0  # 0 to 'slot_count' influences
+        if i % 7 == 3:
+            weights[slot_count - 1] = 0.5  # A weight after a zero weight is ignored
+        vertex = struct.pack(e + str(slot_count) + bone_id_format, *rng.integers(0, 200, slot_count))
+        vertex += bytes(weights_offset - len(vertex))
+        vertex += struct.pack(e + str(slot_count) + weight_format, *weights)
+        data += vertex + bytes(vertex_size - len(vertex))
+    return bytes(data)
+
+
+def read_bone_weights_scalar(R: binary_file.LD_BinaryReader, versionA: int, vertex_size: int):
+    def create_bone_weight_list(ids, weights):
+        w = []
+        for i in range(len(ids)):
+            if weights[i] <= 0:
+                # If a zero weight is found then the rest will also be zero, I don't care about zero weights so we can leave this function.
+                break
+            w.append((ids[i], weights[i]))
+        return w
+
+    bone_weights = []
+    for current_vertex_index in range(VERTEX_COUNT):
+        if versionA == 2 and vertex_size == 0x20:
+            bone_weights.append(create_bone_weight_list(
+                (R.read_short_unsigned(), R.read_short_unsigned(), R.read_short_unsigned(), R.read_short_unsigned()),
+                (R.read_float(), R.read_float(), R.read_float(), R.read_float())
+            ))
+            R.seek(8)
+        elif versionA == 2 and vertex_size == 0x30:
+            bone_weights.append(create_bone_weight_list(
+                tuple(R.read_short_unsigned() for _ in range(8)),
+                tuple(R.read_float() for _ in range(8))
+            ))
+        elif versionA == 1 and vertex_size == 0x20:
+            bone_weights.append(create_bone_weight_list(
+                (R.read_byte_signed(), R.read_byte_signed(), R.read_byte_signed(), R.read_byte_signed()),
+                (R.read_float(), R.read_float(), R.read_float(), R.read_float())
+            ))
+            R.seek(12)
+        elif versionA == 1 and vertex_size == 0x10:
+            bone_weights.append(create_bone_weight_list(
+                (R.read_byte_signed(), R.read_byte_signed(), R.read_byte_signed(), R.read_byte_signed()),
+                (R.read_half_float(), R.read_half_float(), R.read_half_float(), R.read_half_float())
+            ))
+            R.seek(4)
+    return bone_weights
+
+
+@pytest.mark.parametrize('big_endian', [False, True])
+@pytest.mark.parametrize('versionA, vertex_size', [(2, 0x20), (2, 0x30), (1, 0x20), (1, 0x10)])
+def test_bone_weight_dtype_matches_scalar_decode(versionA, vertex_size, big_endian):
+    data = build_bone_weights(np.random.default_rng(versionA * vertex_size), versionA, vertex_size, big_endian)
+    R_scalar, R = new_readers(data, big_endian)
+    expected = read_bone_weights_scalar(R_scalar, versionA, vertex_size)
+
+    bone_weight_data = R.read_array(parse_ism2.get_bone_weight_dtype(versionA, vertex_size, big_endian), VERTEX_COUNT)
+    skin_weights = SkinWeights.from_dense(bone_weight_data['bone_ids'], bone_weight_data['weights'])
+    assert len(skin_weights) == VERTEX_COUNT
+    for vertex_index, influences in enumerate(expected):
+        bone_ids, weights = skin_weights[vertex_index]
+        assert bone_ids.tolist() == [bone_id for bone_id, weight in influences]
+        np.testing.assert_array_equal(weights, np.array([weight for bone_id, weight in influences], dtype=np.float32))
+    assert R.tell() == R_scalar.tell() == len(data)
+
+
+def test_bone_weight_dtype_unknown_layout():
+    assert parse_ism2.get_bone_weight_dtype(2, 0x10, False) is None
+    assert parse_ism2.get_bone_weight_dtype(3, 0x20, False) is None
+
+
+# FACES ('Mesh Surface: Face Loops')
+
+@pytest.mark.parametrize('big_endian', [False, True])
+@pytest.mark.parametrize('face_loops_type', [0x05, 0x07])
+def test_face_index_dtype_matches_scalar_decode(face_loops_type, big_endian):
+    face_count = 40
+    indices = np.random.default_rng(face_loops_type).integers(0, 0xFFFF, face_count * 3)
+    data = struct.pack(endian(big_endian) + str(len(indices)) + {0x05: 'H', 0x07: 'L'}[face_loops_type], *indices)
+    R_scalar, R = new_readers(data, big_endian)
+
+    if face_loops_type == 0x05:
+        def readVerticies() -> (int,):
+            return R_scalar.read_short_unsigned(), R_scalar.read_short_unsigned(), R_scalar.read_short_unsigned()
+    else:
+        def readVerticies() -> (int,):
+            return R_scalar.read_long_unsigned(), R_scalar.read_long_unsigned(), R_scalar.read_long_unsigned()
+    expected = [readVerticies() for _ in range(face_count)]
+
+    face_indices = R.read_array(parse_ism2.get_face_index_dtype(face_loops_type, big_endian), face_count * 3)
+    face_indices = face_indices.astype(np.int32).reshape(face_count, 3)
+    assert face_indices.tolist() == [list(face) for face in expected]
+    assert R.tell() == R_scalar.tell() == len(data)
+
+
+def test_face_index_dtype_unknown_type():
+    assert parse_ism2.get_face_index_dtype(0x06, False) is None
@@ -0,0 +1,185 @@
+import numpy as np
+
+from nep_tools.model_types import MeshSection, PreBlender_Model, SkinWeights
+
+
+def build_model(positions, face_indices, normals=None, bone_ids=None, weights=None) -> PreBlender_Model:
+    model = PreBlender_Model("model")
+    positions = np.asarray(positions, dtype=np.float32)
+    if normals is None:
+        normals = np.tile([0., 0., 1.], (len(positions), 1))
+    uvs = positions[:, :2] * .5
+    colors = np.ones((len(positions), 4))
+    model.add_vertices(positions, normals, uvs, colors)
+    if bone_ids is not None:
+        model.set_skin_weights(0, SkinWeights.from_dense(np.asarray(bone_ids), np.asarray(weights, dtype=np.float32)))
+    model.set_faces(face_indices, np.zeros(len(face_indices), dtype=np.int32))
+    return model
+
+
+def corners(model: PreBlender_Model):
+    """Every attribute of every face corner - What the mesh looks like, no matter how the vertices are shared."""
+    f = model.face_indices.ravel()
+    result = [model.positions[f], model.normals[f], model.uvs[f], model.colors[f]]
+    if model.skin_weights is not None:
+        bone_ids, weights = model.skin_weights.to_dense(model.get_vertex_count())
+        result += [bone_ids[f], weights[f]]
+    return result
+
+
+def assert_same_corners(a, b):
+    assert len(a) == len(b)
+    for x, y in zip(a, b):
+        np.testing.assert_array_equal(x, y)
+
+
+def assert_no_problem_faces(model: PreBlender_Model):
+    f = model.face_indices
+    assert not ((f[:, 0] == f[:, 1]) | (f[:, 1] == f[:, 2]) | (f[:, 2] == f[:, 0])).any()
+    assert len({tuple(sorted(face)) for face in f.tolist()}) == len(f)
+
+
+# MESH SECTIONS
+
+def build_mesh_sections(rng: np.random.Generator):
+    """Meshes with and without bone weights - One has weights for only some of its vertices."""
+    mesh_sections = []
+    base_vertex = 0
+    for vertex_count, weighted_count in ((5, 5), (3, None), (4, 2), (0, None), (6, 6)):
+        mesh_section = MeshSection(base_vertex)
+        mesh_section.add_vertices(rng.uniform(-1, 1, (vertex_count, 3)), rng.uniform(-1, 1, (vertex_count, 3)),
+                                  rng.uniform(0, 1, (vertex_count, 2)), rng.uniform(0, 1, (vertex_count, 4)))
+        if weighted_count is not None:
+            weights = np.where(rng.random((weighted_count, 4)) < .6, rng.uniform(.1, 1, (weighted_count, 4)), 0)
+            mesh_section.skin_weights = SkinWeights.from_dense(rng.integers(0, 30, (weighted_count, 4)), weights)
+        mesh_sections.append(mesh_section)
+        base_vertex += vertex_count
+    return mesh_sections
+
+
+def test_add_mesh_sections_matches_one_block():
+    mesh_sections = build_mesh_sections(np.random.default_rng(8))
+    model = PreBlender_Model("model")
+    model.add_mesh_sections(mesh_sections)
+
+    # The same vertices as one block, with the bone weights spliced in one Mesh at a time
+    block = PreBlender_Model("block")
+    block.add_vertices(*(np.concatenate([getattr(m, name) for m in mesh_sections]) for name in ('positions', 'normals', 'uvs', 'colors')))
+    block.skin_weights = SkinWeights.empty(block.get_vertex_count())
+    for m in mesh_sections:
+        if m.skin_weights is not None:
+            block.skin_weights = block.skin_weights.splice(m.base_vertex, m.skin_weights)
+
+    for name in ('positions', 'normals', 'uvs', 'colors'):
+        np.testing.assert_array_equal(getattr(model, name), getattr(block, name))
+        assert getattr(model, name).dtype == np.float32
+    assert len(model.skin_weights) == model.get_vertex_count() == 18
+    for a, b in zip(model.skin_weights.to_dense(), block.skin_weights.to_dense()):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_add_mesh_sections_one_at_a_time():
+    mesh_sections = build_mesh_sections(np.random.default_rng(9))
+    model = PreBlender_Model("model")
+    model.add_mesh_sections(mesh_sections)
+    one_at_a_time = PreBlender_Model("one_at_a_time")
+    one_at_a_time.add_mesh_sections(mesh_sections[:1])
+    for mesh_section in mesh_sections[1:]:
+        one_at_a_time.add_mesh_section_vertices(mesh_section)
+    np.testing.assert_array_equal(model.positions, one_at_a_time.positions)
+    assert model.skin_weights.offsets.tolist() == one_at_a_time.skin_weights.offsets.tolist()
+    assert model.skin_weights.bone_ids.tolist() == one_at_a_time.skin_weights.bone_ids.tolist()
+
+
+def test_add_mesh_sections_without_weights():
+    mesh_sections = build_mesh_sections(np.random.default_rng(10))
+    for mesh_section in mesh_sections:
+        mesh_section.skin_weights = None
+    model = PreBlender_Model("model")
+    model.add_mesh_sections(mesh_sections)
+    model.add_mesh_sections([])
+    assert model.get_vertex_count() == 18
+    assert model.skin_weights is None
+
+
+# MERGE VERTICES
+
+def test_merge_vertices_welds_disconnected_triangles():
+    # A quad as 2 disconnected triangles
+    model = build_model([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 0, 0), (1, 1, 0), (0, 1, 0)], [(0, 1, 2), (3, 4, 5)])
+    before = corners(model)
+    assert model.merge_vertices() == 2
+    assert model.get_vertex_count() == 4
+    assert model.face_indices.tolist() == [[0, 1, 2], [0, 2, 3]]  # In the order the vertices were first used
+    assert_same_corners(corners(model), before)
+
+
+def test_merge_vertices_keeps_vertices_that_differ():
+    normals = [(0, 0, 1), (0, 0, 1), (0, 0, 1), (0, 0, -1), (0, 0, 1), (0, 0, 1)]
+    bone_ids = [(0, 0), (0, 0), (0, 0), (0, 0), (1, 0), (0, 0)]
+    weights = [(1, 0), (1, 0), (1, 0), (1, 0), (1, 0), (1, 0)]
+    model = build_model([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 0, 0), (1, 1, 0), (0, 1, 0)], [(0, 1, 2), (3, 4, 5)],
+                        normals=normals, bone_ids=bone_ids, weights=weights)
+    before = corners(model)
+    assert model.merge_vertices() == 0  # Vertex 3 has another normal, vertex 4 another bone
+    assert_same_corners(corners(model), before)
+
+
+def test_merge_vertices_negative_zero():
+    model = build_model([(0, 0, 0), (1, 0, 0), (1, 1, 0), (-0., 0, 0), (1, 1, 0), (0, 1, 0)], [(0, 1, 2), (3, 4, 5)])
+    assert model.merge_vertices() == 2
+
+
+def test_merge_vertices_keeps_double_sided_geometry():
+    # The same triangle twice - Welding would make both faces use the same 3 vertices
+    model = build_model([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 0, 0), (1, 1, 0), (1, 0, 0)], [(0, 1, 2), (3, 4, 5)])
+    before = corners(model)
+    model.merge_vertices()
+    assert model.get_face_count() == 2
+    assert_no_problem_faces(model)
+    assert_same_corners(corners(model), before)
+
+
+def test_merge_vertices_with_skin_weights_matches_corners():
+    rng = np.random.default_rng(0)
+    positions = rng.integers(0, 3, (300, 3))  # Few distinct values, so many vertices are identical
+    bone_ids = rng.integers(0, 2, (300, 2))
+    weights = np.where(rng.random((300, 2)) < .5, 1., .5)
+    model = build_model(positions, np.arange(300).reshape(-1, 3), bone_ids=bone_ids, weights=weights)
+    before = corners(model)
+    removed = model.merge_vertices()
+    assert removed > 0
+    assert len(model.skin_weights) == model.get_vertex_count()
+    assert_same_corners(corners(model), before)
+
+
+def test_merge_vertices_empty():
+    model = PreBlender_Model("model")
+    assert model.merge_vertices() == 0
+
+
+# SEPARATE PROBLEM FACES
+
+def test_separate_problem_faces():
+    positions = [(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)]
+    face_indices = [(0, 1, 2),
+                    (0, 2, 3),
+                    (2, 1, 0),  # Same vertices as face 0 - Double sided
+                    (3, 3, 1),  # Degenerate
+                    (1, 2, 0)]  # Same vertices as face 0 again
+    model = build_model(positions, face_indices, bone_ids=[(0,), (1,), (0,), (1,)], weights=[(1,), (1,), (.5,), (.5,)])
+    before = corners(model)
+    assert model.separate_problem_faces() == 3
+    assert model.get_face_count() == 5
+    assert model.get_vertex_count() == 4 + 3 * 3
+    assert model.face_indices[:2].tolist() == [[0, 1, 2], [0, 2, 3]]  # The first of each is left alone
+    assert_no_problem_faces(model)
+    assert_same_corners(corners(model), before)
+    assert model.face_surface_indices.tolist() == [0] * 5
+
+
+def test_separate_problem_faces_nothing_to_do():
+    model = build_model([(0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)], [(0, 1, 2), (0, 2, 3)])
+    assert model.separate_problem_faces() == 0
+    assert model.get_vertex_count() == 4
+    assert PreBlender_Model("model").separate_problem_faces() == 0
@@ -0,0 +1,103 @@
+import numpy as np
+
+from nep_tools.model_types import SkinWeights
+
+
+def rows(skin_weights: SkinWeights):
+    """Every vertex as a list of (bone_id, weight) - The shape the weights had before 'SkinWeights'."""
+    return [list(zip(bone_ids.tolist(), weights.tolist())) for bone_ids, weights in (skin_weights[i] for i in range(len(skin_weights)))]
+
+
+def build(vertices) -> SkinWeights:
+    counts = [len(influences) for influences in vertices]
+    offsets = np.zeros(len(vertices) + 1, dtype=np.int32)
+    np.cumsum(counts, out=offsets[1:])
+    return SkinWeights(offsets,
+                       np.array([bone_id for influences in vertices for bone_id, weight in influences], dtype=np.int32),
+                       np.array([weight for influences in vertices for bone_id, weight in influences], dtype=np.float32))
+
+
+def test_from_dense_stops_at_first_zero_weight():
+    bone_ids = np.array([[1, 2, 3, 4],
+                         [5, 6, 7, 8],
+                         [9, 10, 11, 12],
+                         [13, 14, 15, 16]], dtype=np.uint16)
+    weights = np.array([[.5, .25, .25, 0],
+                        [0, .5, .5, 0],  # Nothing after the zero counts
+                        [1, 0, .5, 0],
+                        [.25, .25, .25, .25]], dtype=np.float32)
+    skin_weights = SkinWeights.from_dense(bone_ids, weights)
+    assert rows(skin_weights) == [[(1, .5), (2, .25), (3, .25)],
+                                  [],
+                                  [(9, 1.)],
+                                  [(13, .25), (14, .25), (15, .25), (16, .25)]]
+    assert skin_weights.bone_ids.dtype == np.int32
+    assert skin_weights.weights.dtype == np.float32
+
+
+def test_from_dense_empty():
+    skin_weights = SkinWeights.from_dense(np.zeros((0, 4), dtype=np.uint8), np.zeros((0, 4), dtype=np.float32))
+    assert len(skin_weights) == 0
+    assert skin_weights.offsets.tolist() == [0]
+
+
+def test_splice_replaces_vertices_from_start():
+    a = build([[(0, 1.)], [(1, .5), (2, .5)], [(3, 1.)], [(4, 1.)]])
+    b = build([[(7, .25)], [(8, .75), (9, .25)]])
+    assert rows(a.splice(1, b)) == [[(0, 1.)], [(7, .25)], [(8, .75), (9, .25)], [(4, 1.)]]
+    assert rows(a.splice(3, b)) == [[(0, 1.)], [(1, .5), (2, .5)], [(3, 1.)], [(7, .25)], [(8, .75), (9, .25)]]
+    assert rows(a.splice(0, SkinWeights.empty(2))) == [[], [], [(3, 1.)], [(4, 1.)]]
+
+
+def test_splice_past_the_end_leaves_vertices_without_weights():
+    a = build([[(0, 1.)]])
+    b = build([[(5, 1.)]])
+    assert rows(a.splice(3, b)) == [[(0, 1.)], [], [], [(5, 1.)]]
+    assert rows(SkinWeights.empty().splice(0, b)) == [[(5, 1.)]]
+
+
+def test_get_weight_groups_matches_assigning_one_by_one():
+    skin_weights = build([[(3, .5), (1, .5)],
+                          [(1, .5)],
+                          [(3, .25), (2, .75)],
+                          [(1, .25), (1, .5)],  # The same bone twice - The last weight wins
+                          [(2, .75)]])
+    expected = {}
+    for vertex_index in range(len(skin_weights)):
+        for bone_id, weight in zip(*(a.tolist() for a in skin_weights[vertex_index])):
+            expected[(bone_id, vertex_index)] = weight
+    groups = list(skin_weights.get_weight_groups())
+    assert [(bone_id, weight) for bone_id, weight, _ in groups] == sorted((bone_id, weight) for bone_id, weight, _ in groups)
+    assigned = {(bone_id, vertex_index): weight for bone_id, weight, vertex_indices in groups for vertex_index in vertex_indices.tolist()}
+    assert assigned == expected
+    assert len(groups) == len({(bone_id, weight) for (bone_id, _), weight in expected.items()})  # One group per (bone_id, weight)
+
+
+def test_get_weight_groups_vertex_count():
+    skin_weights = build([[(0, 1.)], [(1, 1.)], [(0, 1.)]])
+    assert [(bone_id, weight, vertex_indices.tolist()) for bone_id, weight, vertex_indices in skin_weights.get_weight_groups(2)] == [(0, 1., [0]), (1, 1., [1])]
+    assert list(SkinWeights.empty(3).get_weight_groups()) == []
+
+
+def test_to_dense_round_trip():
+    skin_weights = build([[(1, .5), (2, .5)], [], [(3, 1.)]])
+    bone_ids, weights = skin_weights.to_dense()
+    assert bone_ids.tolist() == [[1, 2], [-1, -1], [3, -1]]
+    assert weights.tolist() == [[.5, .5], [0, 0], [1, 0]]
+    assert rows(SkinWeights.from_dense(bone_ids, weights)) == rows(skin_weights)
+
+
+def test_to_dense_vertex_count():
+    skin_weights = build([[(1, .5), (2, .5)], [(3, 1.)]])
+    bone_ids, weights = skin_weights.to_dense(3)  # Past the end - No influences
+    assert bone_ids.tolist() == [[1, 2], [3, -1], [-1, -1]]
+    bone_ids, weights = skin_weights.to_dense(1)
+    assert bone_ids.tolist() == [[1, 2]]
+    assert skin_weights.to_dense(0)[0].shape == (0, 0)
+
+
+def test_take():
+    skin_weights = build([[(0, 1.)], [(1, .5), (2, .5)], [], [(3, 1.)]])
+    assert rows(skin_weights.take([3, 1, 1, 0, 2])) == [[(3, 1.)], [(1, .5), (2, .5)], [(1, .5), (2, .5)], [(0, 1.)], []]
+    assert rows(skin_weights.take([5, 0])) == [[], [(0, 1.)]]  # Past the end - No influences
+    assert rows(skin_weights.take([])) == []